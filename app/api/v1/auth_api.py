@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response, status
 from dependency_injector.wiring import inject, Provide
 from app.core.di.container import Container
+from app.core.security.jwt import JWTManager
+from app.core.security.jwt_keys import get_key_set
 
 
-from app.schema.auth_schema import LoginRequisicao, LoginResposta
+from app.schema.auth_schema import LoginRequisicao, LoginResposta, LogoutRequisicao
 from app.services.auth_service import AuthService
 
 router = APIRouter(
@@ -16,9 +19,31 @@ router = APIRouter(
 @inject
 def login(
     user_info: LoginRequisicao,
+    request: Request,
     service: AuthService = Depends(Provide[Container.auth_service]),
 ):
-    return service.login(user_info)
+    ip = request.client.host if request.client else None
+    return service.login(user_info, ip)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+@inject
+def logout(
+    request: Request,
+    dados: Optional[LogoutRequisicao] = None,
+    service: AuthService = Depends(Provide[Container.auth_service]),
+):
+    """Revoga o token de acesso atual e, se informado, o token de refresh"""
+    payload = JWTManager.get_token_payload(request)
+    service.logout(payload, dados.refresh_token if dados else None)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/jwks")
+def jwks(response: Response):
+    """Chaves públicas de assinatura dos tokens (JWKS), para validação local"""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_set().jwks()
 
 
 # @router.get("/me", response_model=User)
@@ -1,16 +1,26 @@
 from datetime import datetime, date
-from typing import List
-from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from uuid import UUID
+import gzip
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from app.services.relatorio_service import RelatorioService
+from app.services.ocupacao_cubo_service import OcupacaoCuboService
+from app.services.relatorio_job_service import RelatorioJobService
 from app.schema.relatorio_schema import (
     ReservasPorSalaResponse,
     ReservasPorUsuarioResponse,
     ReservasPorPeriodoResponse,
     OcupacaoPorSalaResponse,
     DashboardStatsResponse,
+    OcupacaoCuboFiltros,
+    OcupacaoCuboResponse,
+    RelatorioJobCreate,
+    RelatorioJobResponse,
 )
+from app.model.relatorio_job_model import FormatoRelatorio
+from app.util.single_flight import SingleFlight
 from app.core.security.auth_dependencies import AuthDependencies
-from app.model.usuario_model import Usuario
+from app.schema.auth_schema import UsuarioPrincipal
 from app.core.di.container import Container
 from dependency_injector.wiring import inject, Provide
 
@@ -22,33 +32,51 @@ router = APIRouter(
 @router.get("/dashboard/stats", response_model=DashboardStatsResponse)
 @inject
 async def get_dashboard_stats(
-    current_user: Usuario = Depends(AuthDependencies.get_current_user),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     relatorio_service: RelatorioService = Depends(Provide[Container.relatorio_service]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
 ):
     """Retorna estatísticas gerais para o dashboard"""
-    return relatorio_service.get_dashboard_stats()
+    return await single_flight.do(
+        ("dashboard_stats",),
+        lambda: relatorio_service.em_sessao_propria(
+            RelatorioService.get_dashboard_stats
+        ),
+    )
 
 @router.get("/reservas/por-sala", response_model=List[ReservasPorSalaResponse])
 @inject
 async def get_reservas_por_sala(
     data_inicio: date = Query(..., description="Data inicial do período"),
     data_fim: date = Query(..., description="Data final do período"),
-    current_user: Usuario = Depends(AuthDependencies.get_current_user),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     relatorio_service: RelatorioService = Depends(Provide[Container.relatorio_service]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
 ):
     """Retorna quantidade de reservas por sala em um período"""
-    return relatorio_service.get_reservas_por_sala(data_inicio, data_fim)
+    return await single_flight.do(
+        ("reservas_por_sala", data_inicio, data_fim),
+        lambda: relatorio_service.em_sessao_propria(
+            RelatorioService.get_reservas_por_sala, data_inicio, data_fim
+        ),
+    )
 
 @router.get("/reservas/por-usuario", response_model=List[ReservasPorUsuarioResponse])
 @inject
 async def get_reservas_por_usuario(
     data_inicio: date = Query(..., description="Data inicial do período"),
     data_fim: date = Query(..., description="Data final do período"),
-    current_user: Usuario = Depends(AuthDependencies.get_current_user),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     relatorio_service: RelatorioService = Depends(Provide[Container.relatorio_service]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
 ):
     """Retorna quantidade de reservas por usuário em um período"""
-    return relatorio_service.get_reservas_por_usuario(data_inicio, data_fim)
+    return await single_flight.do(
+        ("reservas_por_usuario", data_inicio, data_fim),
+        lambda: relatorio_service.em_sessao_propria(
+            RelatorioService.get_reservas_por_usuario, data_inicio, data_fim
+        ),
+    )
 
 @router.get("/reservas/por-periodo", response_model=List[ReservasPorPeriodoResponse])
 @inject
@@ -56,29 +84,42 @@ async def get_reservas_por_periodo(
     sala_id: str = Query(..., description="ID da sala"),
     data_inicio: date = Query(..., description="Data inicial do período"),
     data_fim: date = Query(..., description="Data final do período"),
-    current_user: Usuario = Depends(AuthDependencies.get_current_user),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     relatorio_service: RelatorioService = Depends(Provide[Container.relatorio_service]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
 ):
     """Retorna quantidade de reservas por período para uma sala específica"""
-    return relatorio_service.get_reservas_por_periodo(sala_id, data_inicio, data_fim)
+    return await single_flight.do(
+        ("reservas_por_periodo", sala_id, data_inicio, data_fim),
+        lambda: relatorio_service.em_sessao_propria(
+            RelatorioService.get_reservas_por_periodo, sala_id, data_inicio, data_fim
+        ),
+    )
 
 @router.get("/ocupacao/por-sala", response_model=List[OcupacaoPorSalaResponse])
 @inject
 async def get_ocupacao_por_sala(
     data: date = Query(..., description="Data para análise de ocupação"),
-    current_user: Usuario = Depends(AuthDependencies.get_current_user),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     relatorio_service: RelatorioService = Depends(Provide[Container.relatorio_service]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
 ):
     """Retorna taxa de ocupação por sala em uma data específica"""
-    return relatorio_service.get_ocupacao_por_sala(data)
+    return await single_flight.do(
+        ("ocupacao_por_sala", data),
+        lambda: relatorio_service.em_sessao_propria(
+            RelatorioService.get_ocupacao_por_sala, data
+        ),
+    )
 
 @router.get("/uso-salas")
 @inject
 async def gerar_relatorio_uso_salas(
     data_inicio: datetime = Query(..., description="Data inicial do relatório"),
     data_fim: datetime = Query(..., description="Data final do relatório"),
-    current_user: Usuario = Depends(AuthDependencies.get_current_active_superuser),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_active_superuser),
     relatorio_service: RelatorioService = Depends(Provide[Container.relatorio_service]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
 ):
     """
     Gera relatório com estatísticas de uso das salas.
@@ -88,4 +129,103 @@ async def gerar_relatorio_uso_salas(
     - Taxa de ocupação
     Requer privilégios de superusuário.
     """
-    return relatorio_service.gerar_relatorio_uso_salas(data_inicio, data_fim)
+    return await single_flight.do(
+        ("uso_salas", data_inicio, data_fim),
+        lambda: relatorio_service.em_sessao_propria(
+            RelatorioService.gerar_relatorio_uso_salas, data_inicio, data_fim
+        ),
+    )
+
+@router.get("/cubo/ocupacao", response_model=List[OcupacaoCuboResponse])
+@inject
+async def fatiar_cubo_ocupacao(
+    dimensoes: List[str] = Query(
+        [],
+        description="Dimensões do agrupamento: semestre, bloco_id, sala_id, curso, dia_semana, hora",
+    ),
+    semestre: Optional[str] = Query(None, description="Filtra pelo semestre"),
+    bloco_id: Optional[UUID] = Query(None, description="Filtra pelo bloco"),
+    sala_id: Optional[UUID] = Query(None, description="Filtra pela sala"),
+    curso: Optional[str] = Query(None, description="Filtra pelo curso"),
+    dia_semana: Optional[int] = Query(None, ge=0, le=6, description="Filtra pelo dia da semana"),
+    hora: Optional[int] = Query(None, ge=0, le=23, description="Filtra pela faixa horária"),
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
+    ocupacao_cubo_service: OcupacaoCuboService = Depends(
+        Provide[Container.ocupacao_cubo_service]
+    ),
+):
+    """
+    Agrega o cubo de ocupação pelas dimensões informadas.
+    Retorna a quantidade de reservas e os minutos reservados por combinação
+    das dimensões, sem consultar diretamente a tabela de reservas.
+    """
+    filtros = OcupacaoCuboFiltros(
+        semestre=semestre,
+        bloco_id=bloco_id,
+        sala_id=sala_id,
+        curso=curso,
+        dia_semana=dia_semana,
+        hora=hora,
+    )
+    return ocupacao_cubo_service.fatiar(dimensoes, filtros)
+
+@router.post(
+    "/jobs",
+    response_model=RelatorioJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@inject
+def criar_relatorio_job(
+    dados: RelatorioJobCreate,
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
+    relatorio_job_service: RelatorioJobService = Depends(
+        Provide[Container.relatorio_job_service]
+    ),
+):
+    """
+    Enfileira um relatório para processamento em segundo plano.
+    Solicitações idênticas reaproveitam um resultado recente em vez de
+    recalcular o relatório.
+    """
+    return relatorio_job_service.enfileirar(dados, current_user)
+
+@router.get("/jobs/{job_id}", response_model=RelatorioJobResponse)
+@inject
+def obter_relatorio_job(
+    job_id: UUID,
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
+    relatorio_job_service: RelatorioJobService = Depends(
+        Provide[Container.relatorio_job_service]
+    ),
+):
+    """Retorna o status de um relatório em segundo plano solicitado pelo usuário"""
+    return relatorio_job_service.get_by_id(job_id, current_user)
+
+@router.get("/jobs/{job_id}/download")
+@inject
+def baixar_relatorio_job(
+    job_id: UUID,
+    request: Request,
+    current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
+    relatorio_job_service: RelatorioJobService = Depends(
+        Provide[Container.relatorio_job_service]
+    ),
+):
+    """
+    Baixa o resultado de um relatório concluído.
+    O conteúdo é enviado comprimido quando o cliente aceita gzip.
+    """
+    job, conteudo = relatorio_job_service.get_resultado(job_id, current_user)
+    if job.formato == FormatoRelatorio.CSV:
+        media_type, extensao = "text/csv", "csv"
+    else:
+        media_type, extensao = "application/json", "json"
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="relatorio-{job.tipo}-{job.id}.{extensao}"'
+    }
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        conteudo = gzip.decompress(conteudo)
+    return Response(content=conteudo, media_type=media_type, headers=headers)
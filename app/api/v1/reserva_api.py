@@ -19,7 +19,7 @@ from app.schema.reserva_schema import (
 from app.services.reserva_service import ReservaService
 from app.services.reserva_recorrente_service import ReservaRecorrenteService
 from app.core.security.auth_dependencies import AuthDependencies
-from app.model.usuario_model import Usuario
+from app.schema.auth_schema import UsuarioPrincipal
 
 
 router = APIRouter(
@@ -34,7 +34,7 @@ router = APIRouter(
 @inject
 def listar_reservas_recorrentes(
     filtros: ReservaRecorrenteFiltros = Depends(),
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -70,7 +70,7 @@ def listar_reservas_recorrentes(
 @inject
 def obter_reserva_recorrente(
     reserva_id: UUID,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -98,7 +98,7 @@ def obter_reserva_recorrente(
 @inject
 async def criar_reserva_recorrente_regular(
     reserva: ReservaRecorrenteRegularCreate,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -122,7 +122,7 @@ async def criar_reserva_recorrente_regular(
 @inject
 async def criar_reserva_recorrente_semestre(
     reserva: ReservaRecorrenteSemestreCreate,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -146,7 +146,7 @@ async def criar_reserva_recorrente_semestre(
 def atualizar_reserva_recorrente(
     reserva_id: UUID,
     reserva: ReservaRecorrenteUpdate,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -176,7 +176,7 @@ def atualizar_reserva_recorrente(
 @inject
 def remover_reserva_recorrente(
     reserva_id: UUID,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -206,7 +206,7 @@ def remover_reserva_recorrente(
 @inject
 def recriar_reservas_recorrentes(
     reserva_id: UUID,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaRecorrenteService = Depends(
         Provide[Container.reserva_recorrente_service]
     ),
@@ -235,7 +235,7 @@ def recriar_reservas_recorrentes(
 @inject
 def listar_reservas(
     filtros: ReservaFiltros = Depends(),
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaService = Depends(Provide[Container.reserva_service]),
 ):
     """Lista todas as reservas simples com filtros e paginação."""
@@ -256,7 +256,7 @@ def listar_reservas(
 @inject
 def obter_reserva(
     reserva_id: UUID,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaService = Depends(Provide[Container.reserva_service]),
 ):
     """Obtém os detalhes de uma reserva específica."""
@@ -277,7 +277,7 @@ def obter_reserva(
 @inject
 async def criar_reserva(
     reserva: ReservaCreate,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaService = Depends(Provide[Container.reserva_service]),
 ):
     reserva.usuario_id = usuario.id
@@ -290,7 +290,7 @@ async def criar_reserva(
 def atualizar_reserva(
     reserva_id: UUID,
     reserva: ReservaUpdate,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaService = Depends(Provide[Container.reserva_service]),
 ):
     # Validação direta de acesso
@@ -309,7 +309,7 @@ def atualizar_reserva(
 @inject
 def remover_reserva(
     reserva_id: UUID,
-    usuario: Usuario = Depends(AuthDependencies.get_current_user),
+    usuario: UsuarioPrincipal = Depends(AuthDependencies.get_current_user),
     service: ReservaService = Depends(Provide[Container.reserva_service]),
 ):
     # Validação direta de acesso
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, File, UploadFile
 from dependency_injector.wiring import inject, Provide
 from uuid import UUID
+import csv
+import io
 
 from app.core.di.container import Container
 from app.core.commons.responses import RespostaDados, RespostaPaginada
+from app.core.commons.exceptions import BusinessException
 
 from app.schema.usuario_schema import (
     UsuarioFiltros,
     UsuarioResponse,
     UsuarioCreate,
     UsuarioUpdate,
+    RelatorioImportacaoUsuarios,
 )
 from app.services.usuario_service import UsuarioService
 from app.core.security.auth_dependencies import AuthDependencies
@@ -31,6 +36,48 @@ def listar_usuarios(
     return RespostaPaginada(dados=resultado.items, paginacao=resultado.paginacao)
 
 
+@router.post("/importar", response_model=RespostaDados[RelatorioImportacaoUsuarios])
+@inject
+def importar_usuarios(
+    usuarios: List[Dict[str, Any]],
+    service: UsuarioService = Depends(Provide[Container.usuario_service]),
+):
+    """
+    Cadastra usuários em lote a partir de uma lista JSON com os campos de
+    criação de usuário, retornando o resultado de cada item
+    """
+    return RespostaDados(dados=service.importar(usuarios))
+
+
+@router.post("/importar/csv", response_model=RespostaDados[RelatorioImportacaoUsuarios])
+@inject
+def importar_usuarios_csv(
+    arquivo: UploadFile = File(..., description="CSV com cabeçalho (',' ou ';')"),
+    service: UsuarioService = Depends(Provide[Container.usuario_service]),
+):
+    """
+    Cadastra usuários em lote a partir de um CSV cujo cabeçalho tem os campos
+    de criação de usuário (nome, email, matricula, curso, senha e,
+    opcionalmente, ativo e super_user), retornando o resultado de cada linha
+    """
+    try:
+        conteudo = arquivo.file.read().decode("utf-8-sig")
+        dialeto = csv.Sniffer().sniff(conteudo.split("\n", 1)[0], delimiters=",;")
+    except (UnicodeDecodeError, csv.Error):
+        raise BusinessException("Arquivo CSV inválido: use UTF-8 e cabeçalho")
+
+    # Células vazias ficam de fora, para valerem os padrões do cadastro
+    registros = [
+        {
+            campo.strip(): valor.strip()
+            for campo, valor in linha.items()
+            if campo and valor and valor.strip()
+        }
+        for linha in csv.DictReader(io.StringIO(conteudo), dialect=dialeto)
+    ]
+    return RespostaDados(dados=service.importar(registros))
+
+
 @router.get("/{usuario_id}", response_model=RespostaDados[UsuarioResponse])
 @inject
 def obter_usuario(
@@ -1,28 +1,111 @@
-import requests
-from typing import Dict, Any
+import asyncio
+import json
+import logging
+import random
+import socket
+import threading
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+import httpx
+
 from app.core.config.settings import settings
+from app.util.rate_limiter import PriorityTokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Status que indicam falha temporária do Mailgun e podem ser repetidos
+STATUS_REPETIVEIS = {429, 500, 502, 503, 504}
+
+# Falhas antes de a requisição ser enviada; as demais (timeout de leitura,
+# conexão interrompida) podem ocorrer com a mensagem já aceita pelo Mailgun
+ERROS_DE_CONEXAO = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class PrioridadeEmail(IntEnum):
+    """Prioridade de envio; valores menores são enviados antes"""
+
+    TRANSACIONAL = 0
+    LOTE = 1
 
 
 class EmailClient:
-    """Cliente para envio de emails usando Mailgun API"""
+    """
+    Cliente para envio de emails usando Mailgun API.
+
+    Usa um único httpx.AsyncClient com pool de conexões keep-alive, rodando em
+    um event loop próprio em segundo plano. Os métodos assíncronos podem ser
+    usados a partir desse loop; os síncronos (send_email, send_batch_emails)
+    podem ser chamados de qualquer outra thread e aguardam o resultado.
+
+    Os envios passam por um token bucket com a cota do plano do Mailgun
+    (EMAIL_LIMITE_POR_MINUTO): cada destinatário consome um token e, quando
+    a cota se esgota, os envios esperam em fila, com as mensagens
+    transacionais à frente dos lotes.
+    """
 
     def __init__(self):
         self.api_key = settings.MAILGUN_API_KEY
         self.domain = settings.MAILGUN_DOMAIN
-        self.base_url = f"https://api.mailgun.net/v3/{self.domain}/messages"
+        self.base_url = f"{settings.MAILGUN_BASE_URL}/{self.domain}/messages"
 
         if not self.api_key or not self.domain:
             raise ValueError(
                 "MAILGUN_API_KEY e MAILGUN_DOMAIN devem estar configurados nas variáveis de ambiente"
             )
+        if settings.EMAIL_MAX_TENTATIVAS < 1:
+            raise ValueError("EMAIL_MAX_TENTATIVAS deve ser maior ou igual a 1")
 
-    def send_email(
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="email-client", daemon=True
+        )
+        self._thread.start()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._limitador: Optional[PriorityTokenBucket] = None
+        self._executar(self._iniciar())
+
+    async def _iniciar(self) -> None:
+        """Cria o cliente HTTP e o semáforo dentro do loop do cliente"""
+        self._client = httpx.AsyncClient(
+            auth=("api", self.api_key),
+            timeout=httpx.Timeout(
+                settings.EMAIL_TIMEOUT_SEGUNDOS,
+                connect=settings.EMAIL_CONNECT_TIMEOUT_SEGUNDOS,
+            ),
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=settings.EMAIL_MAX_CONCORRENCIA,
+                    max_keepalive_connections=settings.EMAIL_MAX_CONCORRENCIA,
+                ),
+                # Sem Nagle: cabeçalhos e corpo saem juntos nas conexões reaproveitadas
+                socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+            ),
+        )
+        self._semaforo = asyncio.Semaphore(settings.EMAIL_MAX_CONCORRENCIA)
+        self._limitador = PriorityTokenBucket(
+            taxa_por_segundo=settings.EMAIL_LIMITE_POR_MINUTO / 60,
+            capacidade=settings.EMAIL_LIMITE_RAJADA,
+        )
+
+    def close(self) -> None:
+        """Fecha as conexões e encerra o loop do cliente"""
+        if self._loop.is_closed():
+            return
+        self._executar(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def send_email_async(
         self,
         to_email: str,
         subject: str,
         text: str,
         html: str = None,
         template_data: Dict[str, Any] = None,
+        prioridade: PrioridadeEmail = PrioridadeEmail.TRANSACIONAL,
     ) -> Dict[str, Any]:
         """
         Envia um email usando a API do Mailgun.
@@ -33,6 +116,7 @@ class EmailClient:
             text: Conteúdo em texto plano
             html: Conteúdo em HTML (opcional)
             template_data: Dados para substituição no template (opcional)
+            prioridade: Prioridade na fila de envio
 
         Returns:
             Dict com a resposta da API
@@ -46,30 +130,28 @@ class EmailClient:
         }
 
         if template_data:
-            data["h:X-Mailgun-Variables"] = str(template_data)
-
-        response = requests.post(self.base_url, auth=("api", self.api_key), data=data)
-
-        if response.status_code != 200:
-            raise Exception(f"Erro ao enviar email: {response.text}")
+            data["h:X-Mailgun-Variables"] = json.dumps(template_data)
 
-        return response.json()
+        return await self._post(data, "Erro ao enviar email", 1, prioridade)
 
-    def send_batch_emails(
+    async def send_batch_emails_async(
         self,
         recipients: Dict[str, Dict[str, str]],
         subject_template: str,
         text_template: str,
         html_template: str = None,
+        prioridade: PrioridadeEmail = PrioridadeEmail.LOTE,
     ) -> Dict[str, Any]:
         """
         Envia emails em lote usando a API do Mailgun.
+        Cada destinatário recebe uma mensagem individual, com suas variáveis.
 
         Args:
             recipients: Dicionário com emails e dados dos destinatários
             subject_template: Template do assunto com variáveis %recipient.variavel%
             text_template: Template do texto com variáveis %recipient.variavel%
             html_template: Template HTML com variáveis %recipient.variavel% (opcional)
+            prioridade: Prioridade na fila de envio
 
         Returns:
             Dict com a resposta da API
@@ -80,12 +162,108 @@ class EmailClient:
             "subject": subject_template,
             "text": text_template,
             "html": html_template,
-            "recipient-variables": str(recipients),
+            "recipient-variables": json.dumps(recipients),
+        }
+
+        return await self._post(
+            data, "Erro ao enviar emails em lote", len(recipients), prioridade
+        )
+
+    def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        text: str,
+        html: str = None,
+        template_data: Dict[str, Any] = None,
+        prioridade: PrioridadeEmail = PrioridadeEmail.TRANSACIONAL,
+    ) -> Dict[str, Any]:
+        """Versão síncrona de send_email_async"""
+        return self._executar(
+            self.send_email_async(
+                to_email, subject, text, html, template_data, prioridade
+            )
+        )
+
+    def send_batch_emails(
+        self,
+        recipients: Dict[str, Dict[str, str]],
+        subject_template: str,
+        text_template: str,
+        html_template: str = None,
+        prioridade: PrioridadeEmail = PrioridadeEmail.LOTE,
+    ) -> Dict[str, Any]:
+        """Versão síncrona de send_batch_emails_async"""
+        return self._executar(
+            self.send_batch_emails_async(
+                recipients, subject_template, text_template, html_template, prioridade
+            )
+        )
+
+    def metricas(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas da fila de envio: tokens disponíveis e, por
+        prioridade, envios em espera, liberados e tempo médio de espera.
+        """
+        return self._executar(self._metricas())
+
+    async def _metricas(self) -> Dict[str, Any]:
+        metricas = self._limitador.metricas()
+        metricas["prioridades"] = {
+            PrioridadeEmail(prioridade).name.lower(): valores
+            for prioridade, valores in metricas["prioridades"].items()
         }
+        return metricas
+
+    async def _post(
+        self,
+        data: Dict[str, Any],
+        mensagem_erro: str,
+        custo: int,
+        prioridade: PrioridadeEmail,
+    ) -> Dict[str, Any]:
+        """
+        Faz o POST para o Mailgun dentro da cota e com concorrência limitada,
+        repetindo falhas temporárias com backoff exponencial e jitter.
+        Cada tentativa consome `custo` tokens, pois conta na cota do Mailgun.
+
+        O POST não é idempotente: só são repetidas as falhas de conexão e as
+        respostas 429/5xx. Se a requisição já tiver sido enviada, o erro é
+        propagado e a nova tentativa fica a cargo da outbox.
+        """
+        data = {chave: valor for chave, valor in data.items() if valor is not None}
+        tentativas = settings.EMAIL_MAX_TENTATIVAS
 
-        response = requests.post(self.base_url, auth=("api", self.api_key), data=data)
+        for tentativa in range(1, tentativas + 1):
+            await self._limitador.acquire(custo, prioridade)
+            async with self._semaforo:
+                try:
+                    response = await self._client.post(self.base_url, data=data)
+                except ERROS_DE_CONEXAO as e:
+                    if tentativa == tentativas:
+                        raise Exception(f"{mensagem_erro}: {str(e)}")
+                    erro = str(e)
+                except httpx.TransportError as e:
+                    raise Exception(f"{mensagem_erro}: {str(e)}")
+                else:
+                    if response.status_code == 200:
+                        return response.json()
+                    if (
+                        response.status_code not in STATUS_REPETIVEIS
+                        or tentativa == tentativas
+                    ):
+                        raise Exception(f"{mensagem_erro}: {response.text}")
+                    erro = f"HTTP {response.status_code}"
 
-        if response.status_code != 200:
-            raise Exception(f"Erro ao enviar emails em lote: {response.text}")
+            espera = random.uniform(
+                0, settings.EMAIL_BACKOFF_SEGUNDOS * 2 ** (tentativa - 1)
+            )
+            logger.warning(
+                f"Falha temporária no Mailgun ({erro}), "
+                f"tentativa {tentativa}/{tentativas}; nova tentativa em {espera:.2f}s"
+            )
+            await asyncio.sleep(espera)
 
-        return response.json()
+    def _executar(self, coro):
+        """Executa uma corrotina no loop do cliente e aguarda o resultado"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
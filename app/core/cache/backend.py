@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Optional
+import threading
+
+# Marca a ausência de uma entrada, para que None também possa ser guardado
+AUSENTE = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Contadores de uso de um cache"""
+
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fração das leituras atendidas pelo cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheBackend(ABC):
+    """
+    Interface dos backends de cache.
+
+    As chaves são quaisquer valores hashable com `repr` estável (tuplas de
+    strings, números, UUIDs, datas). Uma entrada pode ter TTL próprio e um
+    conjunto de tags: `invalidate_tag` remove de uma vez todas as entradas
+    marcadas com a tag.
+    """
+
+    def __init__(self):
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._contadores_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor da chave, ou `default` se não houver entrada válida"""
+
+    @abstractmethod
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Guarda um valor; sem `ttl`, vale o TTL padrão do backend"""
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Remove a entrada da chave, se existir"""
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str) -> None:
+        """Remove todas as entradas marcadas com a tag"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """Retorna o valor em cache ou calcula, armazena e retorna"""
+        valor = self.get(key, AUSENTE)
+        if valor is not AUSENTE:
+            return valor
+        valor = compute()
+        self.set(key, valor, ttl, tags)
+        return valor
+
+    def estatisticas(self) -> CacheStats:
+        """Contadores de acertos, faltas e remoções por falta de espaço"""
+        with self._contadores_lock:
+            return CacheStats(self._hits, self._misses, self._evictions)
+
+    def _registrar_leitura(self, acerto: bool) -> None:
+        with self._contadores_lock:
+            if acerto:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _registrar_remocoes(self, quantidade: int = 1) -> None:
+        with self._contadores_lock:
+            self._evictions += quantidade
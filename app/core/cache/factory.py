@@ -0,0 +1,28 @@
+from typing import Optional
+
+from app.core.cache.backend import CacheBackend
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.redis_backend import RedisCacheBackend, RespClient
+
+
+def criar_cache_backend(
+    tipo: str,
+    prefixo: str,
+    max_entradas: int,
+    redis_url: Optional[str] = None,
+    redis_timeout_segundos: float = 0.5,
+) -> CacheBackend:
+    """
+    Cria o backend configurado em CACHE_BACKEND: "memoria" (LRU no processo,
+    limitado a `max_entradas`) ou "redis" (compartilhado, sob `prefixo`).
+    """
+    if tipo == "memoria":
+        return MemoryCacheBackend(max_entries=max_entradas)
+    if tipo == "redis":
+        if not redis_url:
+            raise ValueError("CACHE_REDIS_URL é obrigatório com CACHE_BACKEND=redis")
+        return RedisCacheBackend(
+            RespClient.from_url(redis_url, timeout_segundos=redis_timeout_segundos),
+            prefixo=prefixo,
+        )
+    raise ValueError(f"Backend de cache desconhecido: {tipo}")
@@ -0,0 +1,185 @@
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import select
+import threading
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.cache.version_counter import VersionCounter
+
+logger = logging.getLogger(__name__)
+
+# Entidades publicadas no barramento
+SALAS = "salas"
+BLOCOS = "blocos"
+SEMESTRES = "semestres"
+RESERVAS = "reservas"
+TOKENS = "tokens"
+
+Assinante = Callable[[Optional[str]], None]
+
+
+class InvalidationBus:
+    """
+    Barramento de invalidação dos caches em memória entre processos, sobre
+    LISTEN/NOTIFY do Postgres.
+
+    Quem escreve chama `publicar` com a sessão da operação, antes do commit: o
+    NOTIFY faz parte da transação e só é entregue se ela for confirmada. Cada
+    processo mantém uma conexão dedicada escutando o canal e repassa as
+    mensagens de outros processos aos assinantes da entidade; as do próprio
+    processo são ignoradas, pois o serviço já invalidou o cache local após o
+    commit.
+
+    Se a conexão de escuta cair, as mensagens do intervalo se perdem; ao
+    reconectar, todos os assinantes são chamados sem chave, descartando o
+    cache inteiro.
+    """
+
+    def __init__(
+        self, engine: Engine, canal: str, intervalo_reconexao_segundos: float = 5
+    ):
+        self.engine = engine
+        self.canal = canal
+        self.intervalo_reconexao_segundos = intervalo_reconexao_segundos
+        self.origem = uuid.uuid4().hex
+        self._sequencia = VersionCounter("invalidacoes")
+        self._assinantes: Dict[str, List[Assinante]] = {}
+        self._conexao: Optional[Connection] = None
+        self._inicio_lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publicar(
+        self, session: Session, entidade: str, chave: Optional[object] = None
+    ) -> None:
+        """
+        Agenda a notificação de que uma entidade mudou, na transação corrente
+        da sessão. Não faz commit.
+
+        Args:
+            session: Sessão da operação de escrita
+            entidade: Entidade alterada (ex.: SALAS)
+            chave: Identificador do registro alterado, se houver
+        """
+        payload = json.dumps(
+            {
+                "entidade": entidade,
+                "chave": None if chave is None else str(chave),
+                "versao": self._sequencia.bump(),
+                "origem": self.origem,
+            }
+        )
+        session.execute(
+            text("SELECT pg_notify(:canal, :payload)"),
+            {"canal": self.canal, "payload": payload},
+        )
+
+    def assinar(self, entidade: str, assinante: Assinante) -> None:
+        """
+        Registra uma função chamada, na thread de escuta, quando outro processo
+        altera a entidade. Ela recebe a chave do registro, ou None quando todo
+        o cache da entidade deve ser descartado.
+        """
+        self._assinantes.setdefault(entidade, []).append(assinante)
+
+    def iniciar(self) -> None:
+        """Inicia a escuta do canal em segundo plano"""
+        with self._inicio_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._executar, name="invalidation-bus", daemon=True
+            )
+            self._thread.start()
+
+    def parar(self) -> None:
+        """Interrompe a escuta e fecha a conexão"""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.intervalo_reconexao_segundos + 1)
+        self._fechar_conexao()
+
+    def _executar(self) -> None:
+        primeira_conexao = True
+        while not self._parar.is_set():
+            try:
+                self._conectar()
+                if not primeira_conexao:
+                    # Notificações enviadas enquanto a conexão estava fora se perderam
+                    self._despachar_todos()
+                primeira_conexao = False
+                self._escutar()
+            except Exception as e:
+                logger.error(f"Erro na escuta de invalidações: {str(e)}")
+                self._fechar_conexao()
+                self._parar.wait(self.intervalo_reconexao_segundos)
+
+    def _conectar(self) -> None:
+        conexao = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        conexao.exec_driver_sql(f'LISTEN "{self.canal}"')
+        self._conexao = conexao
+        logger.info(f"Escutando invalidações de cache no canal {self.canal}")
+
+    def _escutar(self) -> None:
+        driver = self._conexao.connection.driver_connection
+        while not self._parar.is_set():
+            # O timeout devolve o controle periodicamente para checar `parar`
+            if hasattr(driver, "poll"):
+                # psycopg2: as notificações chegam na lista após o poll
+                prontos, _, _ = select.select(
+                    [driver], [], [], self.intervalo_reconexao_segundos
+                )
+                if not prontos:
+                    continue
+                driver.poll()
+                while driver.notifies:
+                    self._receber(driver.notifies.pop(0).payload)
+            else:
+                # psycopg 3
+                for notificacao in driver.notifies(
+                    timeout=self.intervalo_reconexao_segundos
+                ):
+                    self._receber(notificacao.payload)
+
+    def _receber(self, payload: str) -> None:
+        try:
+            mensagem = json.loads(payload)
+        except ValueError:
+            logger.warning(
+                f"Invalidação de cache ignorada, payload inválido: {payload}"
+            )
+            return
+        if mensagem.get("origem") == self.origem:
+            return
+        logger.debug(
+            f"Invalidação recebida: {mensagem['entidade']} {mensagem.get('chave')} "
+            f"(versão {mensagem.get('versao')})"
+        )
+        self._despachar(mensagem["entidade"], mensagem.get("chave"))
+
+    def _despachar(self, entidade: str, chave: Optional[str]) -> None:
+        for assinante in self._assinantes.get(entidade, ()):
+            try:
+                assinante(chave)
+            except Exception as e:
+                logger.error(f"Erro ao invalidar o cache de {entidade}: {str(e)}")
+
+    def _despachar_todos(self) -> None:
+        for entidade in list(self._assinantes):
+            self._despachar(entidade, None)
+
+    def _fechar_conexao(self) -> None:
+        """Descarta a conexão sem devolvê-la ao pool, encerrando o LISTEN"""
+        if self._conexao is None:
+            return
+        try:
+            self._conexao.invalidate()
+            self._conexao.close()
+        except Exception:
+            pass
+        self._conexao = None
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+import threading
+import time
+
+from app.core.cache.backend import CacheBackend
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Cache LRU na memória do processo, limitado a `max_entries` entradas.
+    Sem dependências externas; cada processo da API tem o seu.
+
+    Entradas expiradas são descartadas na leitura. Quando o limite é
+    atingido, a entrada usada há mais tempo é removida (contada em
+    `evictions`).
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: (
+            "OrderedDict[Hashable, Tuple[Optional[float], Any, Tuple[str, ...]]]"
+        ) = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entrada = self._entries.get(key)
+            acerto = entrada is not None and (
+                entrada[0] is None or entrada[0] > time.monotonic()
+            )
+            if acerto:
+                self._entries.move_to_end(key)
+            elif entrada is not None:
+                self._remover(key)
+        self._registrar_leitura(acerto)
+        return entrada[1] if acerto else default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        expira = time.monotonic() + ttl if ttl is not None else None
+        tags = tuple(tags)
+        removidas = 0
+        with self._lock:
+            if key in self._entries:
+                self._remover(key)
+            self._entries[key] = (expira, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remover(next(iter(self._entries)))
+                removidas += 1
+        if removidas:
+            self._registrar_remocoes(removidas)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remover(key)
+
+    def invalidate_tag(self, tag: str) -> None:
+        with self._lock:
+            for key in self._tags.pop(tag, set()):
+                if key in self._entries:
+                    self._remover(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remover(self, key: Hashable) -> None:
+        """Remove a entrada e a tira do índice de tags. Chamado com o lock"""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            chaves = self._tags.get(tag)
+            if chaves is not None:
+                chaves.discard(key)
+                if not chaves:
+                    del self._tags[tag]
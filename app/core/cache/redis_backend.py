@@ -0,0 +1,218 @@
+from typing import Any, Hashable, Iterable, List, Optional
+from urllib.parse import urlparse
+import hashlib
+import logging
+import pickle
+import socket
+import threading
+
+from app.core.cache.backend import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class RespError(Exception):
+    """Erro devolvido pelo servidor (resposta `-ERR ...`)"""
+
+
+class RespClient:
+    """
+    Cliente mínimo do protocolo do Redis (RESP2), sobre uma única conexão
+    TCP protegida por lock. Reconecta na próxima chamada após uma falha.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout_segundos: float = 0.5,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout_segundos = timeout_segundos
+        self._socket: Optional[socket.socket] = None
+        self._leitor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout_segundos: float = 0.5) -> "RespClient":
+        """Cria o cliente a partir de uma URL redis://[:senha@]host[:porta][/db]"""
+        partes = urlparse(url)
+        return cls(
+            host=partes.hostname or "localhost",
+            port=partes.port or 6379,
+            db=int(partes.path.lstrip("/") or 0),
+            password=partes.password,
+            timeout_segundos=timeout_segundos,
+        )
+
+    def executar(self, *args: Any) -> Any:
+        """Envia um comando e retorna a resposta já decodificada"""
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self._conectar()
+                return self._comando(args)
+            except (OSError, EOFError):
+                self._fechar()
+                raise
+
+    def fechar(self) -> None:
+        """Fecha a conexão"""
+        with self._lock:
+            self._fechar()
+
+    def _conectar(self) -> None:
+        self._socket = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout_segundos
+        )
+        self._leitor = self._socket.makefile("rb")
+        if self.password:
+            self._comando(("AUTH", self.password))
+        if self.db:
+            self._comando(("SELECT", self.db))
+
+    def _comando(self, args: Iterable[Any]) -> Any:
+        self._socket.sendall(self._codificar(args))
+        return self._ler_resposta()
+
+    @staticmethod
+    def _codificar(args: Iterable[Any]) -> bytes:
+        partes = [arg if isinstance(arg, bytes) else str(arg).encode() for arg in args]
+        saida = [b"*%d\r\n" % len(partes)]
+        for parte in partes:
+            saida.append(b"$%d\r\n%s\r\n" % (len(parte), parte))
+        return b"".join(saida)
+
+    def _ler_resposta(self) -> Any:
+        linha = self._leitor.readline()
+        if not linha:
+            raise EOFError("Conexão encerrada pelo servidor")
+        tipo, conteudo = linha[:1], linha[1:-2]
+        if tipo == b"+":
+            return conteudo.decode()
+        if tipo == b"-":
+            raise RespError(conteudo.decode())
+        if tipo == b":":
+            return int(conteudo)
+        if tipo == b"$":
+            tamanho = int(conteudo)
+            if tamanho < 0:
+                return None
+            dados = self._leitor.read(tamanho + 2)
+            return dados[:-2]
+        if tipo == b"*":
+            tamanho = int(conteudo)
+            if tamanho < 0:
+                return None
+            return [self._ler_resposta() for _ in range(tamanho)]
+        raise RespError(f"Resposta inválida do servidor: {linha!r}")
+
+    def _fechar(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+        self._socket = None
+        self._leitor = None
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache compartilhado entre processos e máquinas, em um servidor que fala
+    o protocolo do Redis.
+
+    Os valores são serializados com pickle, então o servidor deve ser de uso
+    exclusivo da aplicação. As chaves ficam sob `prefixo` e cada tag é um set
+    com as chaves marcadas. Falhas de comunicação não interrompem a
+    requisição: a leitura vira uma falta e a escrita é descartada. As
+    remoções por falta de memória acontecem no servidor e não entram em
+    `evictions`.
+    """
+
+    def __init__(
+        self,
+        cliente: RespClient,
+        prefixo: str,
+        default_ttl: Optional[float] = None,
+    ):
+        super().__init__()
+        self.cliente = cliente
+        self.prefixo = prefixo
+        self.default_ttl = default_ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            dados = self.cliente.executar("GET", self._chave(key))
+        except (OSError, EOFError, RespError) as e:
+            logger.warning(f"Erro ao ler do cache {self.prefixo}: {str(e)}")
+            dados = None
+        self._registrar_leitura(dados is not None)
+        return pickle.loads(dados) if dados is not None else default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        chave = self._chave(key)
+        comando: List[Any] = ["SET", chave, pickle.dumps(value)]
+        if ttl is not None:
+            comando += ["PX", int(ttl * 1000)]
+        try:
+            self.cliente.executar(*comando)
+            for tag in tags:
+                self.cliente.executar("SADD", self._chave_tag(tag), chave)
+                if ttl is not None:
+                    self.cliente.executar(
+                        "PEXPIRE", self._chave_tag(tag), int(ttl * 1000)
+                    )
+        except (OSError, EOFError, RespError) as e:
+            logger.warning(f"Erro ao gravar no cache {self.prefixo}: {str(e)}")
+
+    def delete(self, key: Hashable) -> None:
+        self._executar_remocao("DEL", self._chave(key))
+
+    def invalidate_tag(self, tag: str) -> None:
+        try:
+            chaves = self.cliente.executar("SMEMBERS", self._chave_tag(tag)) or []
+            self.cliente.executar("DEL", self._chave_tag(tag), *chaves)
+        except (OSError, EOFError, RespError) as e:
+            logger.warning(f"Erro ao invalidar a tag {tag} do cache: {str(e)}")
+
+    def clear(self) -> None:
+        cursor = "0"
+        try:
+            while True:
+                cursor, chaves = self.cliente.executar(
+                    "SCAN", cursor, "MATCH", f"{self.prefixo}:*", "COUNT", 1000
+                )
+                if chaves:
+                    self.cliente.executar("DEL", *chaves)
+                cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+                if cursor == "0":
+                    break
+        except (OSError, EOFError, RespError) as e:
+            logger.warning(f"Erro ao limpar o cache {self.prefixo}: {str(e)}")
+
+    def _executar_remocao(self, *comando: Any) -> None:
+        try:
+            self.cliente.executar(*comando)
+        except (OSError, EOFError, RespError) as e:
+            logger.warning(f"Erro ao remover do cache {self.prefixo}: {str(e)}")
+
+    def _chave(self, key: Hashable) -> str:
+        # O repr dos tipos usados nas chaves é estável entre processos
+        resumo = hashlib.sha256(repr(key).encode()).hexdigest()
+        return f"{self.prefixo}:{resumo}"
+
+    def _chave_tag(self, tag: str) -> str:
+        return f"{self.prefixo}:tag:{tag}"
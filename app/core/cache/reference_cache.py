@@ -0,0 +1,162 @@
+from datetime import date
+from typing import Any, Callable, Hashable, Optional, Type
+from uuid import UUID
+import logging
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache.backend import AUSENTE, CacheBackend
+from app.core.cache.invalidation_bus import BLOCOS, SALAS, SEMESTRES
+from app.core.cache.shared_snapshot import CalendarioFeriados, SharedReferenceSnapshot
+from app.core.cache.version_counter import VersionCounter
+from app.core.commons.exceptions import NotFoundException
+from app.repository.bloco_repository import BlocoRepository
+from app.repository.referencia_geracao_repository import ReferenciaGeracaoRepository
+from app.repository.sala_repository import SalaRepository
+from app.repository.semestre_repository import SemestreRepository
+from app.schema.referencia_schema import BlocoSnapshot, SalaSnapshot, SemestreSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Entidades cujos snapshots incluem dados de outra: a sala traz o seu bloco
+DEPENDENTES = {BLOCOS: (SALAS,)}
+
+
+class ReferenceDataCache:
+    """
+    Cache de leitura dos dados de referência (salas, blocos e semestres),
+    que mudam poucas vezes por semestre.
+
+    Na falta, o registro é lido com uma sessão própria e guardado como um
+    snapshot imutável (ver referencia_schema), desligado da sessão e seguro
+    para compartilhar entre requisições. Cada entidade tem a sua versão: os
+    serviços de escrita chamam `invalidar` após o commit, que descarta a tag
+    da entidade no backend, e um snapshot lido enquanto a versão mudava não é
+    guardado. Alterações feitas por outros processos chegam pelo barramento
+    de invalidação; o TTL limita o estrago se uma delas se perder.
+
+    Com `snapshot`, a consulta começa pelo snapshot compartilhado entre os
+    workers da máquina; o backend e o banco ficam para o que não estiver
+    nele. Os serviços chamam também `registrar_alteracao` antes do commit,
+    que avança a geração gravada no banco, e `invalidar` deixa de usar o
+    snapshot até que o processo que o reconstrói publique essa geração.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        backend: CacheBackend,
+        ttl_seconds: int,
+        snapshot: Optional[SharedReferenceSnapshot] = None,
+    ):
+        self.session_factory = session_factory
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.snapshot = snapshot
+        self._versoes = {
+            entidade: VersionCounter(entidade)
+            for entidade in (SALAS, BLOCOS, SEMESTRES)
+        }
+
+    def get_sala(self, sala_id: UUID) -> Optional[SalaSnapshot]:
+        """Retorna a sala, com o seu bloco, ou None se não existir"""
+        return self._get(
+            SALAS,
+            sala_id,
+            lambda session: SalaRepository(session).get_by_id(sala_id),
+            SalaSnapshot,
+        )
+
+    def get_bloco(self, bloco_id: UUID) -> Optional[BlocoSnapshot]:
+        """Retorna o bloco, ou None se não existir"""
+        return self._get(
+            BLOCOS,
+            bloco_id,
+            lambda session: BlocoRepository(session).get_by_id(bloco_id),
+            BlocoSnapshot,
+        )
+
+    def get_semestre(self, identificador: str) -> Optional[SemestreSnapshot]:
+        """Retorna o semestre pelo identificador, ou None se não existir"""
+        return self._get(
+            SEMESTRES,
+            identificador,
+            lambda session: SemestreRepository(session).get_by_identificador(
+                identificador
+            ),
+            SemestreSnapshot,
+        )
+
+    def feriados(self) -> CalendarioFeriados:
+        """Calendário dos feriados nacionais"""
+        calendario = self.snapshot.feriados() if self.snapshot is not None else None
+        return calendario if calendario is not None else CalendarioFeriados({}, (1, 0))
+
+    def aquecer(self) -> None:
+        """Carrega o snapshot compartilhado e o calendário de feriados do ano"""
+        if self.snapshot is not None and not self.snapshot.carregar():
+            logger.warning("Snapshot de referência indisponível; lendo do banco")
+        self.feriados().get(date.today())
+
+    def versao(self, entidade: str) -> int:
+        """Versão atual dos dados de uma entidade"""
+        return self._versoes[entidade].current
+
+    def registrar_alteracao(self, session: Session) -> None:
+        """
+        Avança a geração dos dados de referência na transação da escrita.
+        Não faz commit.
+        """
+        ReferenciaGeracaoRepository(session).incrementar()
+
+    def invalidar(self, entidade: str) -> None:
+        """
+        Descarta os snapshots de uma entidade (e das que dependem dela).
+        Deve ser chamado após o commit da alteração.
+        """
+        for alvo in (entidade, *DEPENDENTES.get(entidade, ())):
+            self._versoes[alvo].bump()
+            self.backend.invalidate_tag(alvo)
+        if self.snapshot is not None:
+            self.snapshot.invalidar()
+
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        for entidade in self._versoes:
+            self.backend.invalidate_tag(entidade)
+
+    def _get(
+        self,
+        entidade: str,
+        chave: Hashable,
+        carregar: Callable[[Session], Any],
+        esquema: Type[BaseModel],
+    ) -> Optional[BaseModel]:
+        # A versão é lida antes do banco: se a entidade mudar durante a leitura,
+        # o snapshot já nasce desatualizado e não é guardado
+        versao = self._versoes[entidade].current
+        if self.snapshot is not None:
+            valor = self.snapshot.get(entidade, chave)
+            if valor is not AUSENTE:
+                return valor
+        valor = self.backend.get((entidade, chave), AUSENTE)
+        if valor is not AUSENTE:
+            return valor
+
+        with self.session_factory() as session:
+            try:
+                modelo = carregar(session)
+            except NotFoundException:
+                modelo = None
+            valor = esquema.model_validate(modelo) if modelo is not None else None
+
+        # Ausências não são guardadas: um registro criado depois já é encontrado
+        if valor is not None and self._versoes[entidade].current == versao:
+            self.backend.set(
+                (entidade, chave), valor, self.ttl_seconds, tags=(entidade,)
+            )
+            # A entidade pode ter mudado entre a checagem e a gravação
+            if self._versoes[entidade].current != versao:
+                self.backend.delete((entidade, chave))
+        return valor
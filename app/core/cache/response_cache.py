@@ -0,0 +1,84 @@
+from functools import wraps
+from typing import Any, Callable, Hashable, Tuple
+import threading
+
+from app.core.cache.backend import AUSENTE, CacheBackend
+from app.core.cache.version_counter import VersionCounter
+
+
+def make_key(nome: str, args: tuple, kwargs: dict) -> Tuple[Hashable, ...]:
+    """Monta a chave do cache a partir do nome do método e dos parâmetros"""
+    return (nome, args, tuple(sorted(kwargs.items())))
+
+
+class ResponseCache:
+    """
+    Cache de respostas, com TTL e invalidação por versão, sobre um
+    CacheBackend.
+
+    Quando a versão dos dados muda, as respostas guardadas são descartadas na
+    leitura seguinte (pela tag `namespace`). Uma resposta calculada enquanto
+    a versão mudava não é mantida, pois pode refletir dados anteriores.
+    """
+
+    def __init__(
+        self,
+        version: VersionCounter,
+        backend: CacheBackend,
+        ttl_seconds: int,
+        namespace: str = "respostas",
+    ):
+        self.version = version
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._versao_vista = version.current
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache ou calcula, armazena e retorna"""
+        versao = self._sincronizar()
+        valor = self.backend.get(key, AUSENTE)
+        if valor is not AUSENTE:
+            return valor
+
+        valor = compute()
+
+        if self.version.current == versao:
+            self.backend.set(key, valor, self.ttl_seconds, tags=(self.namespace,))
+            # A versão pode ter mudado entre a checagem e a gravação
+            if self.version.current != versao:
+                self.backend.delete(key)
+        return valor
+
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+        self.backend.invalidate_tag(self.namespace)
+
+    def _sincronizar(self) -> int:
+        """Descarta as respostas de versões anteriores e retorna a versão atual"""
+        versao = self.version.current
+        with self._lock:
+            if versao != self._versao_vista:
+                self.backend.invalidate_tag(self.namespace)
+                self._versao_vista = versao
+        return versao
+
+
+def cached_response(func: Callable) -> Callable:
+    """
+    Decorador para métodos de serviço que possuem o atributo `cache`.
+    Quando o serviço não tem cache configurado, o método é executado normalmente.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, "cache", None)
+        if cache is None:
+            return func(self, *args, **kwargs)
+        return cache.get_or_compute(
+            make_key(func.__qualname__, args, kwargs),
+            lambda: func(self, *args, **kwargs),
+        )
+
+    return wrapper
@@ -0,0 +1,376 @@
+from datetime import date
+from functools import lru_cache
+from typing import IO, Any, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache.backend import AUSENTE
+from app.core.cache.invalidation_bus import BLOCOS, SALAS, SEMESTRES
+from app.repository.bloco_repository import BlocoRepository
+from app.repository.referencia_geracao_repository import ReferenciaGeracaoRepository
+from app.repository.sala_repository import SalaRepository
+from app.repository.semestre_repository import SemestreRepository
+from app.schema.referencia_schema import BlocoSnapshot, SalaSnapshot, SemestreSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho do arquivo: identificação do formato, geração dos dados e
+# tamanho do índice em bytes
+MAGICO = b"RSREF002"
+CABECALHO = struct.Struct("<8sQQ")
+FERIADOS = "feriados"
+INTERVALO_RETENTATIVA_SEGUNDOS = 5
+
+MODELOS = {SALAS: SalaSnapshot, BLOCOS: BlocoSnapshot, SEMESTRES: SemestreSnapshot}
+
+
+def caminho_padrao(nome: str) -> str:
+    """Arquivo do snapshot em memória compartilhada (/dev/shm), se houver"""
+    diretorio = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(diretorio, f"reserva-salas-{nome}.snap")
+
+
+@lru_cache(maxsize=16)
+def _feriados_do_ano(ano: int) -> Dict[date, str]:
+    import holidays
+
+    return dict(holidays.BR(years=ano))
+
+
+class CalendarioFeriados(Mapping[date, str]):
+    """
+    Feriados nacionais por data. Os anos em `anos` vêm prontos do snapshot;
+    os demais são calculados na primeira consulta e guardados no processo.
+    """
+
+    def __init__(self, feriados: Dict[date, str], anos: Tuple[int, int]):
+        self._feriados = feriados
+        self.anos = anos
+
+    def __getitem__(self, dia: date) -> str:
+        if self.anos[0] <= dia.year <= self.anos[1]:
+            return self._feriados[dia]
+        return _feriados_do_ano(dia.year)[dia]
+
+    def __iter__(self) -> Iterator[date]:
+        return iter(self._feriados)
+
+    def __len__(self) -> int:
+        return len(self._feriados)
+
+
+class _Mapeamento:
+    """Um arquivo de snapshot mapeado em memória, somente leitura"""
+
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            estado = os.fstat(arquivo.fileno())
+            self.mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identidade = (estado.st_dev, estado.st_ino)
+        magico, self.geracao, tamanho_indice = CABECALHO.unpack_from(self.mapa)
+        if magico != MAGICO:
+            raise ValueError(f"Formato de snapshot desconhecido: {magico!r}")
+        self.dados = CABECALHO.size + tamanho_indice
+        self.indice = json.loads(self.mapa[CABECALHO.size : self.dados])
+        self.objetos: Dict[Tuple[str, str], Any] = {}
+
+    def ler(self, posicao: List[int]) -> bytes:
+        deslocamento, tamanho = posicao
+        inicio = self.dados + deslocamento
+        return self.mapa[inicio : inicio + tamanho]
+
+
+class SharedReferenceSnapshot:
+    """
+    Snapshot versionado dos dados de referência (salas, blocos, semestres e
+    feriados) em um arquivo mapeado em memória, compartilhado pelos workers
+    da mesma máquina.
+
+    O arquivo tem um índice JSON com a posição de cada registro; cada worker
+    mapeia o arquivo somente para leitura (as páginas ficam uma vez só no
+    cache do sistema operacional) e decodifica apenas os registros que usa.
+    Uma nova versão é gravada em um arquivo temporário e trocada com
+    `os.replace`, então quem lê vê sempre um snapshot completo.
+
+    O cabeçalho guarda a geração dos dados (ver ReferenciaGeracao) lida antes
+    da construção. Cada processo lê a geração do banco no aquecimento e a
+    cada `invalidar`, e só usa um snapshot pelo menos tão novo quanto ela;
+    até lá, quem consulta volta a ler do banco. Um arquivo de uma execução
+    anterior continua valendo se nada mudou desde então.
+
+    Só um processo da máquina reconstrói o arquivo: o que obtém o lock de
+    `<caminho>.lock`, mantido enquanto ele estiver no ar. Ele constrói o
+    snapshot no aquecimento, se preciso, e após cada invalidação em uma
+    thread própria; os demais apenas remapeiam o arquivo quando ele é
+    trocado. Se o dono encerrar, outro processo assume na próxima
+    invalidação ou consulta a um snapshot desatualizado.
+    """
+
+    def __init__(
+        self, caminho: str, session_factory: sessionmaker, anos_feriados: int = 2
+    ):
+        self.caminho = caminho
+        self.session_factory = session_factory
+        self.anos_feriados = anos_feriados
+        # Geração mais recente conhecida do banco; None enquanto não foi lida
+        self._geracao_minima: Optional[int] = None
+        self._mapeamento: Optional[_Mapeamento] = None
+        self._lock = threading.Lock()
+        self._construcao = threading.Lock()
+        # Lock de arquivo, aberto enquanto este processo for o dono
+        self._trava: Optional[IO] = None
+        self._pendente = threading.Event()
+
+    def get(self, entidade: str, chave: Hashable) -> Any:
+        """Retorna o snapshot do registro, ou AUSENTE se não estiver no arquivo"""
+        mapeamento = self._atual()
+        if mapeamento is None:
+            return AUSENTE
+        chave = str(chave)
+        objeto = mapeamento.objetos.get((entidade, chave), AUSENTE)
+        if objeto is AUSENTE:
+            posicao = mapeamento.indice[entidade].get(chave)
+            if posicao is None:
+                return AUSENTE
+            objeto = MODELOS[entidade].model_validate_json(mapeamento.ler(posicao))
+            mapeamento.objetos[(entidade, chave)] = objeto
+        return objeto
+
+    def feriados(self) -> Optional[CalendarioFeriados]:
+        """Calendário de feriados do snapshot, ou None se não houver snapshot"""
+        mapeamento = self._atual()
+        if mapeamento is None:
+            return None
+        calendario = mapeamento.objetos.get((FERIADOS, ""))
+        if calendario is None:
+            dados = json.loads(mapeamento.ler(mapeamento.indice[FERIADOS]))
+            calendario = CalendarioFeriados(
+                {date.fromisoformat(dia): nome for dia, nome in dados.items()},
+                tuple(mapeamento.indice["anos_feriados"]),
+            )
+            mapeamento.objetos[(FERIADOS, "")] = calendario
+        return calendario
+
+    def carregar(self) -> bool:
+        """
+        Lê a geração atual, constrói o snapshot se este processo for o dono e
+        o arquivo estiver desatualizado, e decodifica todos os registros.
+        Retorna se há um snapshot válido.
+        """
+        self._elevar(self._ler_geracao())
+        if self._assumir():
+            self.publicar()
+        mapeamento = self._mapear()
+        if mapeamento is None:
+            return False
+        for entidade in MODELOS:
+            for chave in mapeamento.indice[entidade]:
+                self.get(entidade, chave)
+        return True
+
+    def invalidar(self) -> None:
+        """
+        Passa a ignorar os snapshots anteriores à geração atual do banco.
+        Deve ser chamado após o commit da alteração; não reconstrói o
+        arquivo, apenas agenda a reconstrução no processo dono.
+        """
+        if not self._atualizar_geracao():
+            # Sem saber a geração, nenhum snapshot é confiável
+            with self._lock:
+                self._geracao_minima = None
+        self._agendar()
+
+    def publicar(self) -> bool:
+        """
+        Reconstrói o snapshot a partir do banco e o publica, se o arquivo for
+        de uma geração anterior à atual. Retorna se um novo snapshot foi
+        gravado.
+        """
+        try:
+            with self._construcao:
+                return self._gravar()
+        except Exception as e:
+            logger.error(f"Erro ao publicar o snapshot de referência: {str(e)}")
+            return False
+
+    def _atual(self) -> Optional[_Mapeamento]:
+        if self._geracao_minima is None and not self._atualizar_geracao():
+            return None
+        mapeamento = self._mapear()
+        if mapeamento is None:
+            # Quem consulta lê do banco até o dono publicar um arquivo novo
+            self._agendar()
+        return mapeamento
+
+    def _elevar(self, geracao: int) -> None:
+        with self._lock:
+            self._geracao_minima = max(self._geracao_minima or 0, geracao)
+
+    def _atualizar_geracao(self) -> bool:
+        try:
+            self._elevar(self._ler_geracao())
+        except Exception as e:
+            logger.error(f"Erro ao ler a geração dos dados de referência: {str(e)}")
+            return False
+        return True
+
+    def _ler_geracao(self) -> int:
+        with self.session_factory() as session:
+            return ReferenciaGeracaoRepository(session).get_atual()
+
+    def _agendar(self) -> None:
+        if self._assumir():
+            self._pendente.set()
+
+    def _assumir(self) -> bool:
+        """Tenta se tornar o processo que reconstrói o snapshot da máquina"""
+        if self._trava is not None:
+            return True
+        with self._lock:
+            if self._trava is not None:
+                return True
+            try:
+                os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+                trava = open(f"{self.caminho}.lock", "a")
+            except OSError as e:
+                logger.error(f"Erro ao abrir o lock do snapshot: {str(e)}")
+                return False
+            try:
+                fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Outro processo da máquina é o dono
+                trava.close()
+                return False
+            self._trava = trava
+        threading.Thread(
+            target=self._reconstruir, name="referencia-snapshot", daemon=True
+        ).start()
+        logger.info("Este processo passa a reconstruir o snapshot de referência")
+        return True
+
+    def _reconstruir(self) -> None:
+        while True:
+            self._pendente.wait()
+            self._pendente.clear()
+            self.publicar()
+            if self._mapear() is None:
+                # Falha na construção: espera antes de tentar de novo
+                time.sleep(INTERVALO_RETENTATIVA_SEGUNDOS)
+
+    def _mapear(self) -> Optional[_Mapeamento]:
+        try:
+            estado = os.stat(self.caminho)
+        except FileNotFoundError:
+            return None
+        mapeamento = self._mapeamento
+        if mapeamento is None or mapeamento.identidade != (
+            estado.st_dev,
+            estado.st_ino,
+        ):
+            with self._lock:
+                mapeamento = self._mapeamento
+                if mapeamento is None or mapeamento.identidade != (
+                    estado.st_dev,
+                    estado.st_ino,
+                ):
+                    try:
+                        mapeamento = _Mapeamento(self.caminho)
+                    except (OSError, ValueError, struct.error) as e:
+                        logger.warning(f"Snapshot de referência inválido: {str(e)}")
+                        return None
+                    self._mapeamento = mapeamento
+        geracao_minima = self._geracao_minima
+        if geracao_minima is None or mapeamento.geracao < geracao_minima:
+            return None
+        return mapeamento
+
+    def _geracao_publicada(self) -> int:
+        try:
+            with open(self.caminho, "rb") as arquivo:
+                magico, geracao, _ = CABECALHO.unpack(arquivo.read(CABECALHO.size))
+        except (OSError, struct.error):
+            return -1
+        return geracao if magico == MAGICO else -1
+
+    def _gravar(self) -> bool:
+        with self.session_factory() as session:
+            # A geração é lida antes dos dados: o snapshot pode ter alterações
+            # de gerações seguintes, mas nunca menos que a que declara
+            geracao = ReferenciaGeracaoRepository(session).get_atual()
+            self._elevar(geracao)
+            if self._geracao_publicada() >= geracao:
+                return False
+            registros = {
+                SALAS: [
+                    SalaSnapshot.model_validate(sala)
+                    for sala in SalaRepository(session).get_todas_com_bloco()
+                ],
+                BLOCOS: [
+                    BlocoSnapshot.model_validate(bloco)
+                    for bloco in BlocoRepository(session).get_todos()
+                ],
+                SEMESTRES: [
+                    SemestreSnapshot.model_validate(semestre)
+                    for semestre in SemestreRepository(session).get_all()
+                ],
+            }
+
+        partes: List[bytes] = []
+        tamanho = 0
+
+        def adicionar(dados: bytes) -> List[int]:
+            nonlocal tamanho
+            partes.append(dados)
+            tamanho += len(dados)
+            return [tamanho - len(dados), len(dados)]
+
+        indice: Dict[str, Any] = {
+            SALAS: {
+                str(sala.id): adicionar(sala.model_dump_json().encode())
+                for sala in registros[SALAS]
+            },
+            BLOCOS: {
+                str(bloco.id): adicionar(bloco.model_dump_json().encode())
+                for bloco in registros[BLOCOS]
+            },
+            SEMESTRES: {
+                semestre.identificador: adicionar(semestre.model_dump_json().encode())
+                for semestre in registros[SEMESTRES]
+            },
+        }
+        ano = date.today().year
+        anos = (ano - 1, ano + self.anos_feriados)
+        feriados = {
+            dia.isoformat(): nome
+            for ano_feriado in range(anos[0], anos[1] + 1)
+            for dia, nome in _feriados_do_ano(ano_feriado).items()
+        }
+        indice[FERIADOS] = adicionar(json.dumps(feriados).encode())
+        indice["anos_feriados"] = list(anos)
+        indice_bytes = json.dumps(indice).encode()
+
+        # O arquivo só é visível com o nome final depois de completo, e é
+        # reaproveitado entre execuções: grava em disco antes da troca
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(CABECALHO.pack(MAGICO, geracao, len(indice_bytes)))
+            arquivo.write(indice_bytes)
+            arquivo.writelines(partes)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho)
+        logger.info(
+            f"Snapshot de referência publicado: {len(registros[SALAS])} salas, "
+            f"{len(registros[BLOCOS])} blocos, {len(registros[SEMESTRES])} semestres "
+            f"(geração {geracao})"
+        )
+        return True
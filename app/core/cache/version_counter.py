@@ -0,0 +1,25 @@
+import threading
+
+
+class VersionCounter:
+    """
+    Contador monotônico que identifica a versão atual de um conjunto de dados.
+    Os fluxos de escrita incrementam o contador, e os caches comparam a
+    versão armazenada com a atual para descartar entradas desatualizadas.
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._valor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> int:
+        """Retorna a versão atual"""
+        return self._valor
+
+    def bump(self) -> int:
+        """Incrementa a versão e retorna o novo valor"""
+        with self._lock:
+            self._valor += 1
+            return self._valor
@@ -0,0 +1,112 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from sqlalchemy.engine import Engine
+
+from app.core.cache.reference_cache import ReferenceDataCache
+from app.core.security.token_revocation import TokenRevocationList
+
+logger = logging.getLogger(__name__)
+
+
+class StartupWarmup:
+    """
+    Aquecimento do processo logo após a subida, para que as primeiras
+    requisições não paguem pelos caches frios.
+
+    As etapas padrão abrem as conexões do pool, carregam os dados de
+    referência e o calendário de feriados e a lista de revogação de tokens;
+    outras podem ser incluídas com `adicionar_etapa` antes de `iniciar`. As
+    etapas rodam em ordem, em segundo plano; se uma falha, ela e as seguintes
+    são repetidas após `intervalo_retentativa_segundos`. `pronto` só fica
+    verdadeiro quando todas concluíram, e é o que o endpoint /ready informa
+    ao balanceador.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        referencia_cache: ReferenceDataCache,
+        token_revocation_list: TokenRevocationList,
+        intervalo_retentativa_segundos: float = 5,
+    ):
+        self.engine = engine
+        self.intervalo_retentativa_segundos = intervalo_retentativa_segundos
+        self._etapas: List[Tuple[str, Callable[[], object]]] = [
+            ("conexoes", self._abrir_conexoes),
+            ("referencia", referencia_cache.aquecer),
+            ("revogacoes", token_revocation_list.iniciar),
+        ]
+        self._concluidas: Dict[str, float] = {}
+        self._pronto = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pronto(self) -> bool:
+        """Se todas as etapas já concluíram"""
+        return self._pronto.is_set()
+
+    def adicionar_etapa(self, nome: str, etapa: Callable[[], object]) -> None:
+        """Inclui uma etapa, executada depois das já registradas"""
+        self._etapas.append((nome, etapa))
+
+    def estado(self) -> Dict[str, object]:
+        """Se o processo está pronto e a duração (s) de cada etapa concluída"""
+        return {
+            "pronto": self.pronto,
+            "etapas": {
+                nome: self._concluidas.get(nome) for nome, _ in self._etapas
+            },
+        }
+
+    def iniciar(self) -> None:
+        """Executa o aquecimento em segundo plano"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self.executar, name="startup-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def parar(self) -> None:
+        """Interrompe as retentativas"""
+        self._parar.set()
+
+    def executar(self) -> None:
+        """Executa as etapas pendentes até que todas concluam"""
+        inicio = time.monotonic()
+        while not self._parar.is_set():
+            for nome, etapa in self._etapas:
+                if nome in self._concluidas:
+                    continue
+                inicio_etapa = time.monotonic()
+                try:
+                    etapa()
+                except Exception as e:
+                    # As seguintes podem depender desta (o banco, por exemplo)
+                    logger.error(f"Erro no aquecimento ({nome}): {str(e)}")
+                    break
+                self._concluidas[nome] = round(time.monotonic() - inicio_etapa, 3)
+
+            if len(self._concluidas) == len(self._etapas):
+                self._pronto.set()
+                logger.info(
+                    f"Aquecimento concluído em {time.monotonic() - inicio:.2f}s: "
+                    f"{self._concluidas}"
+                )
+                return
+            self._parar.wait(self.intervalo_retentativa_segundos)
+
+    def _abrir_conexoes(self) -> None:
+        # Abre todas as conexões do pool ao mesmo tempo e as devolve abertas
+        tamanho = getattr(self.engine.pool, "size", lambda: 1)()
+        conexoes = []
+        try:
+            for _ in range(tamanho):
+                conexoes.append(self.engine.connect())
+        finally:
+            for conexao in conexoes:
+                conexao.close()
@@ -93,3 +93,16 @@ class DuplicatedException(BaseAPIException):
 
     def __init__(self, mensagem: str = "Erro de duplicação") -> None:
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=mensagem)
+
+
+class TooManyRequestsException(BaseAPIException):
+    """Exceção para requisições recusadas por excesso de carga"""
+
+    def __init__(
+        self, mensagem: str = "Muitas requisições", retry_after: int = 1
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=mensagem,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import SecretStr, PostgresDsn
+from typing import List, Literal, Optional
+from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings
 from datetime import timedelta
 
@@ -24,6 +24,16 @@ class Settings(BaseSettings):
     # Mailgun
     MAILGUN_API_KEY: str
     MAILGUN_DOMAIN: str
+    MAILGUN_BASE_URL: str = "https://api.mailgun.net/v3"
+    EMAIL_TIMEOUT_SEGUNDOS: float = 10
+    EMAIL_CONNECT_TIMEOUT_SEGUNDOS: float = 5
+    EMAIL_MAX_CONCORRENCIA: int = 10
+    EMAIL_MAX_TENTATIVAS: int = 3
+    EMAIL_BACKOFF_SEGUNDOS: float = 0.5
+    # Cota de envio do plano do Mailgun (mensagens por minuto) e rajada máxima
+    EMAIL_LIMITE_POR_MINUTO: int = 300
+    EMAIL_LIMITE_RAJADA: int = 50
+    EMAIL_METRICAS_INTERVALO_SEGUNDOS: int = 60
 
     # Database - valores default que serão sobrescritos pelo .env
     DB: str
@@ -33,20 +43,97 @@ class Settings(BaseSettings):
     DB_PORT: str
     DB_NAME: str
 
+    # Número máximo de consultas independentes executadas em paralelo
+    QUERY_FANOUT_MAX_WORKERS: int = 8
+
     @property
     def DATABASE_URL(self) -> PostgresDsn:
         """Retorna a URL de conexão do banco de dados"""
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
     # JWT
-    SECRET_KEY: SecretStr = (
-        "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
-    )
-
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "RS256"
+    # Diretório das chaves privadas de assinatura (<kid>.pem); gerado se estiver vazio
+    JWT_KEYS_DIR: str = "keys/jwt"
+    # kid da chave que assina os novos tokens (padrão: o maior kid do diretório)
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_ISSUER: str = "reserva-salas-uni"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 24 * 60  # 1 dia
 
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 24 * 60 * 7
+
+    # Lista de revogação de tokens: releitura em cada processo da API e limpeza
+    AUTH_REVOGACAO_INTERVALO_SEGUNDOS: int = 15
+    AUTH_REVOGACAO_LIMPEZA_INTERVALO_MINUTOS: int = 60
+
+    # Pool dedicado ao bcrypt: threads, pedidos aguardando e espera máxima
+    SENHA_HASH_WORKERS: int = 2
+    SENHA_HASH_FILA: int = 16
+    SENHA_HASH_TIMEOUT_SEGUNDOS: int = 5
+    # Processos usados no hash das senhas da importação em lote (padrão: todos os núcleos)
+    SENHA_HASH_PROCESSOS: Optional[int] = None
+    # Bloqueio temporário do login após tentativas malsucedidas seguidas
+    LOGIN_MAX_TENTATIVAS: int = 5
+    LOGIN_BLOQUEIO_MINUTOS: int = 15
+
+    # Importação de usuários em lote
+    IMPORTACAO_USUARIOS_MAX_LINHAS: int = 10000
+    IMPORTACAO_USUARIOS_LOTE_INSERT: int = 1000
+
+    # Intervalo da atualização incremental do cubo de ocupação
+    CUBO_OCUPACAO_INTERVALO_MINUTOS: int = 10
+
+    # Relatórios processados em segundo plano
+    RELATORIO_JOB_INTERVALO_SEGUNDOS: int = 5
+    RELATORIO_JOB_VALIDADE_MINUTOS: int = 30
+    RELATORIO_JOB_TIMEOUT_MINUTOS: int = 30
+
+    # Backend dos caches: "memoria" (LRU em cada processo) ou "redis" (compartilhado)
+    CACHE_BACKEND: Literal["memoria", "redis"] = "memoria"
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_REDIS_TIMEOUT_SEGUNDOS: float = 0.5
+
+    # Cache das respostas de relatórios
+    RELATORIO_CACHE_TTL_SEGUNDOS: int = 300
+    RELATORIO_CACHE_MAX_ENTRADAS: int = 1024
+
+    # Cache dos dados de referência (salas, blocos e semestres)
+    REFERENCIA_CACHE_TTL_SEGUNDOS: int = 600
+    REFERENCIA_CACHE_MAX_ENTRADAS: int = 4096
+    # Snapshot compartilhado entre os workers da máquina (padrão: /dev/shm)
+    REFERENCIA_SNAPSHOT_CAMINHO: Optional[str] = None
+    REFERENCIA_SNAPSHOT_ANOS_FERIADOS: int = 2
+
+    # Aquecimento dos caches na subida (o /ready responde 503 até concluir)
+    AQUECIMENTO_INTERVALO_RETENTATIVA_SEGUNDOS: int = 5
+
+    # Canal do LISTEN/NOTIFY usado para invalidar os caches dos outros processos
+    CACHE_INVALIDACAO_CANAL: str = "cache_invalidacao"
+
+    # Worker
+    WORKER_MAX_THREADS: int = 4
+    # Chave do advisory lock usado na eleição do worker líder
+    WORKER_LEADER_LOCK_ID: int = 7301001
+    WORKER_LEADER_INTERVALO_SEGUNDOS: int = 10
+    # Tolerância para recuperar execuções perdidas (ex.: durante um deploy)
+    SCHEDULER_MISFIRE_GRACE_SEGUNDOS: int = 6 * 60 * 60
+
+    # Lembretes de reserva (0 desativa)
+    LEMBRETE_MINUTOS_ANTES: int = 30
+    LEMBRETE_TICK_SEGUNDOS: int = 10
+    # Janela de lembretes carregada do banco para a roda de tempo
+    LEMBRETE_JANELA_MINUTOS: int = 10
+    LEMBRETE_RECARGA_SEGUNDOS: int = 60
+
+    # Caixa de saída de emails
+    EMAIL_OUTBOX_INTERVALO_SEGUNDOS: int = 5
+    EMAIL_OUTBOX_LOTE: int = 100
+    EMAIL_OUTBOX_MAX_TENTATIVAS: int = 8
+    EMAIL_OUTBOX_BACKOFF_SEGUNDOS: int = 30
+    EMAIL_OUTBOX_BACKOFF_MAX_SEGUNDOS: int = 60 * 60
+    # Janela em que notificações do mesmo usuário são agrupadas em um resumo (0 desativa)
+    EMAIL_AGRUPAMENTO_MINUTOS: int = 5
+
     # Timezone
     TIMEZONE: str = "America/Sao_Paulo"
 
@@ -64,6 +151,8 @@ class Settings(BaseSettings):
         case_sensitive = True
         env_file = ".env"
         env_file_encoding = "utf-8"
+        # Variáveis antigas (como SECRET_KEY) em .env existentes não impedem a inicialização
+        extra = "ignore"
 
 
 # Instância global das configurações
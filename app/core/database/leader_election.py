@@ -0,0 +1,126 @@
+from typing import Callable, Optional
+import logging
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    Eleição de líder entre processos usando advisory lock do Postgres.
+
+    O lock é de sessão e pertence a uma conexão dedicada: enquanto ela estiver
+    aberta, este processo é o líder. Se o processo morrer ou a conexão cair,
+    o Postgres libera o lock e outro processo assume na próxima tentativa.
+    """
+
+    def __init__(self, engine: Engine, chave: int, intervalo_segundos: float = 10):
+        self.engine = engine
+        self.chave = chave
+        self.intervalo_segundos = intervalo_segundos
+        self._conexao: Optional[Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        """Indica se este processo detém o lock"""
+        return self._conexao is not None
+
+    def tentar_assumir(self) -> bool:
+        """
+        Tenta obter o lock; se já for o líder, confirma que a conexão segue ativa.
+
+        Returns:
+            True se este processo é o líder
+        """
+        with self._lock:
+            if self._conexao is not None:
+                return self._confirmar_conexao()
+
+            conexao = self.engine.connect()
+            try:
+                obtido = conexao.execute(
+                    text("SELECT pg_try_advisory_lock(:chave)"), {"chave": self.chave}
+                ).scalar()
+                conexao.commit()
+            except Exception as e:
+                conexao.invalidate()
+                conexao.close()
+                logger.error(f"Erro ao tentar obter a liderança: {str(e)}")
+                return False
+
+            if not obtido:
+                conexao.close()
+                return False
+
+            self._conexao = conexao
+            logger.info(f"Liderança obtida (lock {self.chave})")
+            return True
+
+    def confirmar(self) -> bool:
+        """Confirma que este processo ainda é o líder"""
+        with self._lock:
+            return self._conexao is not None and self._confirmar_conexao()
+
+    def liberar(self) -> None:
+        """Libera o lock, se este processo for o líder"""
+        with self._lock:
+            if self._conexao is None:
+                return
+            try:
+                self._conexao.execute(
+                    text("SELECT pg_advisory_unlock(:chave)"), {"chave": self.chave}
+                )
+                self._conexao.commit()
+                self._conexao.close()
+            except Exception as e:
+                logger.error(f"Erro ao liberar a liderança: {str(e)}")
+                self._descartar_conexao()
+            self._conexao = None
+            logger.info(f"Liderança liberada (lock {self.chave})")
+
+    def executar(
+        self,
+        parar: threading.Event,
+        ao_assumir: Callable[[], None],
+        ao_perder: Callable[[], None],
+    ) -> None:
+        """
+        Disputa a liderança periodicamente até `parar` ser sinalizado,
+        chamando os callbacks quando a liderança muda.
+        """
+        while not parar.is_set():
+            era_lider = self.is_leader
+            lider = self.tentar_assumir()
+            if lider and not era_lider:
+                ao_assumir()
+            elif era_lider and not lider:
+                ao_perder()
+            parar.wait(self.intervalo_segundos)
+
+        if self.is_leader:
+            ao_perder()
+            self.liberar()
+
+    def _confirmar_conexao(self) -> bool:
+        """Verifica a conexão do lock; se ela caiu, a liderança foi perdida"""
+        try:
+            self._conexao.execute(text("SELECT 1"))
+            self._conexao.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"Conexão do lock de liderança perdida: {str(e)}")
+            self._descartar_conexao()
+            return False
+
+    def _descartar_conexao(self) -> None:
+        """Descarta a conexão sem devolvê-la ao pool, liberando o lock no servidor"""
+        try:
+            self._conexao.invalidate()
+            self._conexao.close()
+        except Exception:
+            pass
+        self._conexao = None
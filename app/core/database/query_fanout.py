@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import logging
+
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+QueryTask = Callable[[Session], Any]
+
+
+class QueryFanOut:
+    """
+    Executa consultas independentes em paralelo.
+
+    Cada tarefa recebe a sua própria sessão, aberta a partir da fábrica de
+    sessões, e roda em um pool de threads limitado. Assim o tempo total fica
+    próximo ao da consulta mais lenta, e não à soma de todas elas.
+    """
+
+    def __init__(self, session_factory: sessionmaker, max_workers: int = 8):
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="query-fanout"
+        )
+
+    def _run_task(self, task: QueryTask) -> Any:
+        """Executa uma tarefa em uma sessão exclusiva, fechada ao final"""
+        session = self.session_factory()
+        try:
+            return task(session)
+        finally:
+            session.rollback()
+            session.close()
+
+    def run(self, tasks: Dict[str, QueryTask]) -> Dict[str, Any]:
+        """
+        Executa as tarefas em paralelo e aguarda todas terminarem.
+
+        Args:
+            tasks: Dicionário nome -> função que recebe uma sessão
+
+        Returns:
+            Dicionário nome -> resultado da tarefa
+        """
+        futures = {
+            nome: self.executor.submit(self._run_task, task)
+            for nome, task in tasks.items()
+        }
+
+        resultados = {}
+        erros = []
+        for nome, future in futures.items():
+            try:
+                resultados[nome] = future.result()
+            except Exception as e:
+                logger.error(f"Erro na consulta paralela '{nome}': {str(e)}")
+                erros.append(e)
+
+        if erros:
+            raise erros[0]
+        return resultados
+
+    def shutdown(self) -> None:
+        """Encerra o pool de threads"""
+        self.executor.shutdown(wait=True)
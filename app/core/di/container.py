@@ -1,6 +1,18 @@
 from dependency_injector import containers, providers
 
-from app.core.database.database import SessionLocal
+from app.core.config.settings import settings
+from app.core.database.database import SessionLocal, db_manager
+from app.core.database.leader_election import LeaderElection
+from app.core.database.query_fanout import QueryFanOut
+from app.core.cache.version_counter import VersionCounter
+from app.core.cache.response_cache import ResponseCache
+from app.core.cache.factory import criar_cache_backend
+from app.core.cache.reference_cache import ReferenceDataCache
+from app.core.cache.invalidation_bus import InvalidationBus
+from app.core.cache.shared_snapshot import SharedReferenceSnapshot, caminho_padrao
+from app.core.cache.warmup import StartupWarmup
+from app.util.single_flight import SingleFlight
+from app.util.email_templates import EmailTemplates
 from app.repository.usuario_repository import UsuarioRepository
 from app.repository.reserva_repository import ReservaRepository
 from app.repository.reserva_recorrente_repository import ReservaRecorrenteRepository
@@ -8,6 +20,10 @@ from app.repository.bloco_repository import BlocoRepository
 from app.repository.sala_repository import SalaRepository
 from app.repository.auditoria_repository import AuditoriaRepository
 from app.repository.semestre_repository import SemestreRepository
+from app.repository.ocupacao_cubo_repository import OcupacaoCuboRepository
+from app.repository.relatorio_job_repository import RelatorioJobRepository
+from app.repository.email_outbox_repository import EmailOutboxRepository
+from app.repository.token_revogado_repository import TokenRevogadoRepository
 from app.services.usuario_service import UsuarioService
 from app.services.reserva_service import ReservaService
 from app.services.reserva_recorrente_service import ReservaRecorrenteService
@@ -19,7 +35,13 @@ from app.services.email_service import EmailService
 from app.services.auditoria_service import AuditoriaService
 from app.services.scheduler_service import SchedulerService
 from app.services.relatorio_service import RelatorioService
+from app.services.ocupacao_cubo_service import OcupacaoCuboService
+from app.services.relatorio_job_service import RelatorioJobService
+from app.services.lembrete_service import LembreteService
+from app.services.email_outbox_service import EmailOutboxService
 from app.core.security.jwt import JWTManager
+from app.core.security.token_revocation import TokenRevocationList
+from app.core.security.password_hasher import PasswordHasher
 from app.clients.email_client import EmailClient
 
 
@@ -41,10 +63,93 @@ class Container(containers.DeclarativeContainer):
 
     # Database
     db = providers.Singleton(SessionLocal)
+    session_factory = providers.Object(SessionLocal)
+    db_engine = providers.Object(db_manager.engine)
+    query_fanout = providers.Singleton(
+        QueryFanOut,
+        session_factory=session_factory,
+        max_workers=settings.QUERY_FANOUT_MAX_WORKERS,
+    )
+
+    # Cache
+    reservas_version = providers.Singleton(VersionCounter, nome="reservas")
+    relatorio_cache_backend = providers.Singleton(
+        criar_cache_backend,
+        tipo=settings.CACHE_BACKEND,
+        prefixo="relatorios",
+        max_entradas=settings.RELATORIO_CACHE_MAX_ENTRADAS,
+        redis_url=settings.CACHE_REDIS_URL,
+        redis_timeout_segundos=settings.CACHE_REDIS_TIMEOUT_SEGUNDOS,
+    )
+    relatorio_cache = providers.Singleton(
+        ResponseCache,
+        version=reservas_version,
+        backend=relatorio_cache_backend,
+        ttl_seconds=settings.RELATORIO_CACHE_TTL_SEGUNDOS,
+    )
+    # Invalidação dos caches em memória entre processos (LISTEN/NOTIFY)
+    invalidation_bus = providers.Singleton(
+        InvalidationBus,
+        engine=db_engine,
+        canal=settings.CACHE_INVALIDACAO_CANAL,
+    )
+    referencia_cache_backend = providers.Singleton(
+        criar_cache_backend,
+        tipo=settings.CACHE_BACKEND,
+        prefixo="referencia",
+        max_entradas=settings.REFERENCIA_CACHE_MAX_ENTRADAS,
+        redis_url=settings.CACHE_REDIS_URL,
+        redis_timeout_segundos=settings.CACHE_REDIS_TIMEOUT_SEGUNDOS,
+    )
+    referencia_snapshot = providers.Singleton(
+        SharedReferenceSnapshot,
+        caminho=(
+            settings.REFERENCIA_SNAPSHOT_CAMINHO or caminho_padrao(settings.DB_NAME)
+        ),
+        session_factory=session_factory,
+        anos_feriados=settings.REFERENCIA_SNAPSHOT_ANOS_FERIADOS,
+    )
+    referencia_cache = providers.Singleton(
+        ReferenceDataCache,
+        session_factory=session_factory,
+        backend=referencia_cache_backend,
+        ttl_seconds=settings.REFERENCIA_CACHE_TTL_SEGUNDOS,
+        snapshot=referencia_snapshot,
+    )
+
+    # Espelho em memória das revogações de tokens
+    token_revocation_list = providers.Singleton(
+        TokenRevocationList,
+        session_factory=session_factory,
+        intervalo_segundos=settings.AUTH_REVOGACAO_INTERVALO_SEGUNDOS,
+    )
+
+    # Aquecimento dos caches na subida do processo
+    startup_warmup = providers.Singleton(
+        StartupWarmup,
+        engine=db_engine,
+        referencia_cache=referencia_cache,
+        token_revocation_list=token_revocation_list,
+        intervalo_retentativa_segundos=settings.AQUECIMENTO_INTERVALO_RETENTATIVA_SEGUNDOS,
+    )
+
+    # Pool limitado do bcrypt, isolado das threads das requisições
+    password_hasher = providers.Singleton(
+        PasswordHasher,
+        max_workers=settings.SENHA_HASH_WORKERS,
+        max_fila=settings.SENHA_HASH_FILA,
+        timeout_segundos=settings.SENHA_HASH_TIMEOUT_SEGUNDOS,
+    )
+
+    # Agrupamento de requisições concorrentes idênticas
+    single_flight = providers.Singleton(SingleFlight)
 
     # Clients
     email_client = providers.Singleton(EmailClient)
 
+    # Templates de email, compilados uma única vez
+    email_templates = providers.Singleton(EmailTemplates)
+
     # Repositories
     usuario_repository = providers.Factory(UsuarioRepository, session=db)
     reserva_repository = providers.Factory(ReservaRepository, session=db)
@@ -55,8 +160,24 @@ class Container(containers.DeclarativeContainer):
     sala_repository = providers.Factory(SalaRepository, session=db)
     auditoria_repository = providers.Factory(AuditoriaRepository, session=db)
     semestre_repository = providers.Factory(SemestreRepository, session=db)
+    ocupacao_cubo_repository = providers.Factory(OcupacaoCuboRepository, session=db)
+    relatorio_job_repository = providers.Factory(RelatorioJobRepository, session=db)
+    email_outbox_repository = providers.Factory(EmailOutboxRepository, session=db)
+    token_revogado_repository = providers.Factory(TokenRevogadoRepository, session=db)
     # Services
-    email_service = providers.Factory(EmailService, email_client=email_client)
+    email_service = providers.Factory(
+        EmailService,
+        email_client=email_client,
+        email_outbox_repository=email_outbox_repository,
+        email_templates=email_templates,
+    )
+
+    email_outbox_service = providers.Factory(
+        EmailOutboxService,
+        session_factory=session_factory,
+        email_client=email_client,
+        email_templates=email_templates,
+    )
     auditoria_service = providers.Factory(
         AuditoriaService, auditoria_repository=auditoria_repository
     )
@@ -66,20 +187,62 @@ class Container(containers.DeclarativeContainer):
         reserva_repository=reserva_repository,
         sala_repository=sala_repository,
         usuario_repository=usuario_repository,
+        query_fanout=query_fanout,
+        cache=relatorio_cache,
+        session_factory=session_factory,
+    )
+
+    ocupacao_cubo_service = providers.Factory(
+        OcupacaoCuboService,
+        ocupacao_cubo_repository=ocupacao_cubo_repository,
+        session_factory=session_factory,
+    )
+
+    relatorio_job_service = providers.Factory(
+        RelatorioJobService,
+        relatorio_job_repository=relatorio_job_repository,
+        session_factory=session_factory,
+        query_fanout=query_fanout,
+    )
+
+    lembrete_service = providers.Factory(
+        LembreteService,
+        session_factory=session_factory,
+        email_service=email_service,
+    )
+
+    leader_election = providers.Singleton(
+        LeaderElection,
+        engine=db_engine,
+        chave=settings.WORKER_LEADER_LOCK_ID,
+        intervalo_segundos=settings.WORKER_LEADER_INTERVALO_SEGUNDOS,
     )
 
     scheduler_service = providers.Singleton(
         SchedulerService,
-        reserva_repository=reserva_repository,
-        usuario_repository=usuario_repository,
+        session_factory=session_factory,
+        engine=db_engine,
+        leader_election=leader_election,
         email_service=email_service,
+        lembrete_service=lembrete_service,
+        email_outbox_service=email_outbox_service,
+        ocupacao_cubo_service=ocupacao_cubo_service,
+        relatorio_job_service=relatorio_job_service,
     )
 
     usuario_service = providers.Factory(
-        UsuarioService, usuario_repository=usuario_repository
+        UsuarioService,
+        usuario_repository=usuario_repository,
+        token_revogado_repository=token_revogado_repository,
+        token_revocation_list=token_revocation_list,
+        password_hasher=password_hasher,
+        invalidation_bus=invalidation_bus,
     )
     semestre_service = providers.Factory(
-        SemestreService, semestre_repository=semestre_repository
+        SemestreService,
+        semestre_repository=semestre_repository,
+        referencia_cache=referencia_cache,
+        invalidation_bus=invalidation_bus,
     )
     
     reserva_service = providers.Factory(
@@ -89,6 +252,9 @@ class Container(containers.DeclarativeContainer):
         usuario_repository=usuario_repository,
         email_service=email_service,
         auditoria_service=auditoria_service,
+        reservas_version=reservas_version,
+        referencia_cache=referencia_cache,
+        invalidation_bus=invalidation_bus,
     )
 
 
@@ -101,15 +267,34 @@ class Container(containers.DeclarativeContainer):
         email_service=email_service,
         auditoria_service=auditoria_service,
         semestre_service=semestre_service,
+        reservas_version=reservas_version,
+        referencia_cache=referencia_cache,
+        invalidation_bus=invalidation_bus,
     )
 
-    bloco_service = providers.Factory(BlocoService, bloco_repository=bloco_repository)
+    bloco_service = providers.Factory(
+        BlocoService,
+        bloco_repository=bloco_repository,
+        referencia_cache=referencia_cache,
+        invalidation_bus=invalidation_bus,
+    )
 
     sala_service = providers.Factory(
-        SalaService, sala_repository=sala_repository, bloco_repository=bloco_repository
+        SalaService,
+        sala_repository=sala_repository,
+        bloco_repository=bloco_repository,
+        referencia_cache=referencia_cache,
+        invalidation_bus=invalidation_bus,
     )
 
-    auth_service = providers.Factory(AuthService, user_repository=usuario_repository)
+    auth_service = providers.Factory(
+        AuthService,
+        user_repository=usuario_repository,
+        token_revogado_repository=token_revogado_repository,
+        token_revocation_list=token_revocation_list,
+        password_hasher=password_hasher,
+        invalidation_bus=invalidation_bus,
+    )
 
     # Routers
 
@@ -3,11 +3,10 @@ from fastapi.security import OAuth2PasswordBearer
 from app.core.config.settings import settings
 from app.core.security.jwt import JWTManager
 from app.core.commons.exceptions import UnauthorizedException
-from app.model.usuario_model import Usuario
-from app.repository.usuario_repository import UsuarioRepository
+from app.core.security.token_revocation import TokenRevocationList
+from app.schema.auth_schema import UsuarioPrincipal
 from app.core.di.container import Container
 from dependency_injector.wiring import inject, Provide
-from uuid import UUID
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login",
@@ -23,61 +22,53 @@ class AuthDependencies:
     @inject
     async def get_current_user(
         request: Request,
-        user_repository: UsuarioRepository = Depends(
-            Provide[Container.usuario_repository]
+        revocation_list: TokenRevocationList = Depends(
+            Provide[Container.token_revocation_list]
         ),
-    ) -> Usuario:
+    ) -> UsuarioPrincipal:
         """
         Obtém o usuário atual a partir do token JWT.
         Usar como dependência em rotas que requerem autenticação.
 
+        A autorização (super_user, curso) vem dos claims do token, e a
+        revogação (logout, troca de senha, desativação da conta) é verificada
+        na lista de revogação em memória, sem consultar o banco.
+
         Exemplo:
         @router.get("/me", response_model=UsuarioResponse)
-        async def read_users_me(current_user: Usuario = Depends(AuthDependencies.get_current_user)):
+        async def read_users_me(current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_user)):
             return current_user
         """
         try:
             payload = JWTManager.get_token_payload(request)
-            # O payload já contém o UUID diretamente no 'sub'
-            user_id = payload.get("sub")
-            if not user_id:
+            if not payload.get("sub"):
                 raise UnauthorizedException("Token inválido")
 
-            # Convertendo a string do UUID para UUID
-            user_id = UUID(user_id)
-
-            user = user_repository.get_by_id(user_id)
-            if not user:
-                raise UnauthorizedException("Usuário não encontrado")
-
-            if not user.ativo:
-                raise UnauthorizedException("Usuário inativo")
+            if revocation_list.esta_revogado(payload):
+                raise UnauthorizedException("Token revogado")
 
-            if user.bloqueado:
-                raise UnauthorizedException("Usuário bloqueado")
-
-            return user
+            return JWTManager.get_principal(payload)
 
         except Exception as e:
             raise UnauthorizedException(str(e))
 
     @staticmethod
-    @inject
     async def get_current_active_superuser(
-        current_user: Usuario = Depends(get_current_user),
-    ) -> Usuario:
+        # __func__: a mesma função de AuthDependencies.get_current_user, para
+        # que o FastAPI a reconheça (e os overrides valham) nas duas dependências
+        current_user: UsuarioPrincipal = Depends(get_current_user.__func__),
+    ) -> UsuarioPrincipal:
         """
         Obtém o usuário atual e verifica se é um super usuário.
         Usar como dependência em rotas que requerem privilégios de super usuário.
 
         Exemplo:
         @router.get("/admin", response_model=AdminResponse)
-        async def read_admin(current_user: Usuario = Depends(AuthDependencies.get_current_active_superuser)):
+        async def read_admin(current_user: UsuarioPrincipal = Depends(AuthDependencies.get_current_active_superuser)):
             return current_user
         """
-        user = await current_user
-        if not user.super_user:
+        if not current_user.super_user:
             raise UnauthorizedException(
                 mensagem="Acesso negado: privilégios insuficientes"
             )
-        return user
+        return current_user
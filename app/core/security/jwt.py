@@ -1,17 +1,67 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict
+from uuid import uuid4
 from jose import jwt
 from passlib.context import CryptContext
 from fastapi import Request
 from app.core.config.settings import settings
 from app.core.commons.exceptions import UnauthorizedException
+from app.core.security.jwt_keys import get_key_set
 from app.model.usuario_model import Usuario
+from app.schema.auth_schema import UsuarioPrincipal
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Versão do formato do conjunto de claims de autorização ("authz")
+AUTHZ_VERSAO = 1
+
+
+def _encode(claims: Dict[str, Any]) -> str:
+    """Assina os claims com a chave ativa, informando o kid no cabeçalho"""
+    kid, chave = get_key_set().chave_assinatura
+    return jwt.encode(
+        {**claims, "iss": settings.JWT_ISSUER},
+        chave,
+        algorithm=settings.ALGORITHM,
+        headers={"kid": kid},
+    )
+
+
+def _decode(token: str) -> Dict[str, Any]:
+    """Valida a assinatura com a chave pública do kid do token"""
+    kid = jwt.get_unverified_header(token).get("kid")
+    chave = get_key_set().chave_publica(kid) if kid else None
+    if chave is None:
+        raise jwt.JWTError("Chave de assinatura desconhecida")
+    return jwt.decode(
+        token,
+        chave,
+        algorithms=[settings.ALGORITHM],
+        issuer=settings.JWT_ISSUER,
+    )
+
+
+def _authz_claims(usuario: Usuario) -> Dict[str, Any]:
+    """Claims de autorização: dispensam consultar o usuário a cada requisição"""
+    return {
+        "v": AUTHZ_VERSAO,
+        "super_user": usuario.super_user,
+        "curso": usuario.curso,
+        "token_version": usuario.token_version,
+    }
+
 
 class JWTManager:
-    """Gerenciador de tokens JWT"""
+    """
+    Gerenciador de tokens JWT.
+
+    Os tokens são assinados com RS256 e trazem o kid da chave no cabeçalho;
+    as chaves públicas são publicadas em JWKS (GET /auth/jwks), então outros
+    serviços podem validar os tokens localmente. O token de acesso carrega os
+    claims de autorização (super_user, curso e token_version do usuário).
+    Os tokens de acesso e de refresh têm um jti, usado para revogá-los
+    individualmente (ver TokenRevocationList).
+    """
 
     @staticmethod
     def extract_token(request: Request) -> str:
@@ -37,12 +87,10 @@ class JWTManager:
                 "nome": usuario.nome,
                 "iat": datetime.utcnow(),
                 "type": "access",
+                "jti": uuid4().hex,
+                "authz": _authz_claims(usuario),
             }
-            return jwt.encode(
-                to_encode,
-                settings.SECRET_KEY.get_secret_value(),
-                algorithm=settings.ALGORITHM,
-            )
+            return _encode(to_encode)
         except Exception as e:
             raise UnauthorizedException(f"Erro ao criar token de acesso: {str(e)}")
 
@@ -59,12 +107,10 @@ class JWTManager:
                 "nome": usuario.nome,
                 "iat": datetime.utcnow(),
                 "type": "refresh",
+                "jti": uuid4().hex,
+                "token_version": usuario.token_version,
             }
-            return jwt.encode(
-                to_encode,
-                settings.SECRET_KEY.get_secret_value(),
-                algorithm=settings.ALGORITHM,
-            )
+            return _encode(to_encode)
         except Exception as e:
             raise UnauthorizedException(f"Erro ao criar token de refresh: {str(e)}")
 
@@ -72,13 +118,12 @@ class JWTManager:
     def verify_token(token: str) -> Dict[str, Any]:
         """Verifica e decodifica um token JWT"""
         try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY.get_secret_value(),
-                algorithms=[settings.ALGORITHM],
-            )
+            payload = _decode(token)
             if payload.get("type") != "access":
                 raise UnauthorizedException("Token inválido")
+            authz = payload.get("authz")
+            if not isinstance(authz, dict) or authz.get("v") != AUTHZ_VERSAO:
+                raise UnauthorizedException("Token inválido")
             return payload
         except jwt.ExpiredSignatureError:
             raise UnauthorizedException("Token expirado")
@@ -88,17 +133,13 @@ class JWTManager:
             raise UnauthorizedException(f"Erro na verificação do token: {str(e)}")
 
     @staticmethod
-    def verify_refresh_token(token: str) -> str:
-        """Verifica um token de refresh"""
+    def verify_refresh_token(token: str) -> Dict[str, Any]:
+        """Verifica um token de refresh e retorna o payload"""
         try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY.get_secret_value(),
-                algorithms=[settings.ALGORITHM],
-            )
+            payload = _decode(token)
             if payload.get("type") != "refresh":
                 raise UnauthorizedException("Token de refresh inválido")
-            return payload["sub"]
+            return payload
         except jwt.ExpiredSignatureError:
             raise UnauthorizedException("Token de refresh expirado")
         except jwt.JWTError:
@@ -119,11 +160,7 @@ class JWTManager:
                 "iat": datetime.utcnow(),
                 "type": "password_reset",
             }
-            return jwt.encode(
-                to_encode,
-                settings.SECRET_KEY.get_secret_value(),
-                algorithm=settings.ALGORITHM,
-            )
+            return _encode(to_encode)
         except Exception as e:
             raise UnauthorizedException(
                 f"Erro ao criar token de reset de senha: {str(e)}"
@@ -133,11 +170,7 @@ class JWTManager:
     def verify_password_reset_token(token: str) -> str:
         """Verifica um token de reset de senha"""
         try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY.get_secret_value(),
-                algorithms=[settings.ALGORITHM],
-            )
+            payload = _decode(token)
             if payload.get("type") != "password_reset":
                 raise UnauthorizedException("Token inválido")
             return payload["sub"]
@@ -158,3 +191,19 @@ class JWTManager:
         """
         token = JWTManager.extract_token(request)
         return JWTManager.verify_token(token)
+
+    @staticmethod
+    def get_principal(payload: Dict[str, Any]) -> UsuarioPrincipal:
+        """
+        Monta o usuário autenticado a partir dos claims de um token de acesso
+        já verificado, sem consultar o banco.
+        """
+        authz = payload["authz"]
+        return UsuarioPrincipal(
+            id=payload["sub"],
+            curso=authz["curso"],
+            super_user=authz["super_user"],
+            token_version=authz["token_version"],
+            ativo=True,
+            bloqueado=False,
+        )
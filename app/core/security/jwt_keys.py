@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+from jose import jwk
+
+from app.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ALGORITMO = "RS256"
+
+# Intervalo mínimo entre releituras do diretório ao encontrar um kid desconhecido
+INTERVALO_RECARGA_SEGUNDOS = 30
+
+
+class JWTKeySet:
+    """
+    Conjunto de chaves RSA de assinatura dos tokens JWT.
+
+    Cada arquivo <kid>.pem do diretório é uma chave privada. A chave ativa
+    (JWT_ACTIVE_KID, ou a de maior kid) assina os novos tokens; todas as
+    chaves do diretório validam tokens, então a rotação consiste em adicionar
+    uma nova chave e remover a antiga só depois que seus tokens expirarem.
+    Tokens com kid desconhecido provocam uma releitura do diretório, para que
+    chaves adicionadas por outro processo sejam reconhecidas.
+    """
+
+    def __init__(self, diretorio: str, kid_ativo: Optional[str] = None):
+        self.diretorio = Path(diretorio)
+        self.kid_ativo_configurado = kid_ativo
+        self._privadas: Dict[str, str] = {}
+        self._publicas: Dict[str, Dict[str, Any]] = {}
+        self._kid_ativo: Optional[str] = None
+        self._recarregado_em = 0.0
+        self._lock = threading.Lock()
+        self.carregar()
+
+    def carregar(self) -> None:
+        """Lê as chaves do diretório, gerando a primeira se ele estiver vazio"""
+        with self._lock:
+            if not any(self.diretorio.glob("*.pem")):
+                self._gerar_chave()
+
+            privadas = {
+                arquivo.stem: arquivo.read_text()
+                for arquivo in sorted(self.diretorio.glob("*.pem"))
+            }
+            publicas = {}
+            for kid, pem in privadas.items():
+                publica = jwk.construct(pem, ALGORITMO).public_key().to_dict()
+                publica.update({"kid": kid, "use": "sig", "alg": ALGORITMO})
+                publicas[kid] = publica
+
+            kid_ativo = self.kid_ativo_configurado or max(privadas)
+            if kid_ativo not in privadas:
+                raise ValueError(
+                    f"Chave JWT ativa '{kid_ativo}' não encontrada em {self.diretorio}"
+                )
+
+            self._privadas = privadas
+            self._publicas = publicas
+            self._kid_ativo = kid_ativo
+            self._recarregado_em = time.monotonic()
+
+    @property
+    def chave_assinatura(self) -> Tuple[str, str]:
+        """Retorna o kid e a chave privada (PEM) que assinam os novos tokens"""
+        return self._kid_ativo, self._privadas[self._kid_ativo]
+
+    def chave_publica(self, kid: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a chave pública (JWK) de um kid, relendo o diretório se o kid
+        for desconhecido.
+        """
+        publica = self._publicas.get(kid)
+        if publica is None and (
+            time.monotonic() - self._recarregado_em > INTERVALO_RECARGA_SEGUNDOS
+        ):
+            self.carregar()
+            publica = self._publicas.get(kid)
+        return publica
+
+    def jwks(self) -> Dict[str, Any]:
+        """Retorna as chaves públicas no formato JWKS"""
+        return {"keys": list(self._publicas.values())}
+
+    def _gerar_chave(self) -> None:
+        """Gera e grava uma nova chave RSA de 2048 bits"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        kid = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        pem = _gerar_pem_rsa()
+        # Grava em um arquivo temporário e publica com link, que falha se outro
+        # processo tiver gerado a mesma chave: o .pem nunca fica incompleto
+        temporario = self.diretorio / f".{kid}.{os.getpid()}.tmp"
+        descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(pem)
+        try:
+            os.link(temporario, self.diretorio / f"{kid}.pem")
+        except FileExistsError:
+            return
+        finally:
+            os.unlink(temporario)
+        logger.warning(
+            f"Nenhuma chave JWT encontrada; gerada a chave {kid} em {self.diretorio}"
+        )
+
+
+def _gerar_pem_rsa() -> bytes:
+    """
+    Gera uma chave privada RSA em PEM, usando o backend cryptography quando
+    instalado e, na falta dele, o pacote rsa (dependência do python-jose)
+    """
+    try:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa as crypto_rsa
+    except ImportError:
+        import rsa
+
+        _, privada = rsa.newkeys(2048)
+        return privada.save_pkcs1()
+
+    chave = crypto_rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return chave.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+_key_set: Optional[JWTKeySet] = None
+_key_set_lock = threading.Lock()
+
+
+def get_key_set() -> JWTKeySet:
+    """Retorna o conjunto de chaves do processo, carregado na primeira chamada"""
+    global _key_set
+    if _key_set is None:
+        with _key_set_lock:
+            if _key_set is None:
+                _key_set = JWTKeySet(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
+    return _key_set
@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+import logging
+import multiprocessing
+import os
+import threading
+
+from passlib.context import CryptContext
+
+from app.core.commons.exceptions import TooManyRequestsException
+from app.model.usuario_model import pwd_context
+
+logger = logging.getLogger(__name__)
+
+
+def _gerar_hash(senha: str) -> str:
+    """Hash bcrypt executado nos processos da importação em lote"""
+    return pwd_context.hash(senha)
+
+
+class PasswordHasher:
+    """
+    Executa o bcrypt (hash e verificação de senhas) em um pool dedicado e
+    limitado, fora das threads que atendem as requisições.
+
+    O bcrypt libera o GIL, então `max_workers` threads usam no máximo esse
+    número de núcleos, e o restante da API continua respondendo durante uma
+    rajada de logins. Na frente do pool há uma fila de admissão com
+    `max_fila` vagas: quando ela está cheia, ou quando o pedido espera mais
+    que `timeout_segundos` na fila até chegar a uma thread, ele é recusado
+    com 429 em vez de acumular. Um pedido que já começou não é interrompido:
+    o tempo do próprio bcrypt não conta para o limite.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_fila: int,
+        timeout_segundos: float,
+        contexto: CryptContext = pwd_context,
+    ):
+        self.timeout_segundos = timeout_segundos
+        self.contexto = contexto
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="senha-hash"
+        )
+        self._vagas = threading.BoundedSemaphore(max_workers + max_fila)
+        self._recusados = 0
+
+    def verificar(self, senha: str, hash_senha: str) -> bool:
+        """Verifica uma senha contra o hash armazenado"""
+        return self._executar(self.contexto.verify, senha, hash_senha)
+
+    def gerar_hash(self, senha: str) -> str:
+        """Gera o hash bcrypt de uma senha"""
+        return self._executar(self.contexto.hash, senha)
+
+    def gerar_hashes(
+        self, senhas: Sequence[str], processos: Optional[int] = None
+    ) -> List[str]:
+        """
+        Gera os hashes de muitas senhas em um pool de processos, usando todos
+        os núcleos. Feito para importações em lote, fora da fila de admissão:
+        o pool é criado só para a chamada e encerrado ao final.
+
+        Os processos são iniciados com spawn, pois a API já tem threads em
+        execução e um fork poderia herdar locks ocupados.
+        """
+        if not senhas:
+            return []
+        processos = min(processos or os.cpu_count() or 1, len(senhas))
+        with ProcessPoolExecutor(
+            max_workers=processos, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            return list(
+                pool.map(
+                    _gerar_hash,
+                    senhas,
+                    chunksize=max(len(senhas) // (processos * 4), 1),
+                )
+            )
+
+    @property
+    def recusados(self) -> int:
+        """Quantidade de pedidos recusados por excesso de carga"""
+        return self._recusados
+
+    def encerrar(self) -> None:
+        """Encerra o pool, aguardando os pedidos em andamento"""
+        self._executor.shutdown(wait=True)
+
+    def _executar(self, funcao: Callable[..., Any], *args: Any) -> Any:
+        if not self._vagas.acquire(blocking=False):
+            self._recusar("fila de senhas cheia")
+
+        iniciado = threading.Event()
+
+        def executar() -> Any:
+            iniciado.set()
+            return funcao(*args)
+
+        future = self._executor.submit(executar)
+        # A vaga só é liberada quando o bcrypt termina (ou o pedido é cancelado)
+        future.add_done_callback(lambda _: self._vagas.release())
+        # Só a espera na fila é limitada; `cancel` falha se o pedido acabou de
+        # começar, e então o resultado é aguardado normalmente
+        if not iniciado.wait(self.timeout_segundos) and future.cancel():
+            self._recusar("tempo de espera esgotado")
+        return future.result()
+
+    def _recusar(self, motivo: str) -> None:
+        self._recusados += 1
+        logger.warning(f"Pedido de hash de senha recusado: {motivo}")
+        raise TooManyRequestsException(
+            "Servidor ocupado processando logins; tente novamente em instantes",
+            retry_after=max(int(self.timeout_segundos), 1),
+        )
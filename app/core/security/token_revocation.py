@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config.settings import settings
+from app.model.token_revogado_model import TokenRevogado
+from app.model.usuario_model import Usuario
+from app.repository.token_revogado_repository import TokenRevogadoRepository
+from app.util.datetime_utils import DateTimeUtils
+
+logger = logging.getLogger(__name__)
+
+
+def revogacao_do_usuario(usuario: Usuario, motivo: str) -> TokenRevogado:
+    """
+    Revoga os tokens emitidos para o usuário antes da sua versão atual de
+    token. O registro vale pelo tempo de vida do token mais longo (refresh).
+    """
+    return TokenRevogado(
+        usuario_id=usuario.id,
+        token_version=usuario.token_version,
+        motivo=motivo,
+        expira_em=DateTimeUtils.now() + settings.refresh_token_expires,
+    )
+
+
+def revogacao_do_token(payload: Dict[str, Any], motivo: str) -> TokenRevogado:
+    """Revoga um token específico, até a sua expiração"""
+    restante = max(payload["exp"] - time.time(), 0)
+    return TokenRevogado(
+        jti=payload["jti"],
+        motivo=motivo,
+        expira_em=DateTimeUtils.now() + timedelta(seconds=restante),
+    )
+
+
+class TokenRevocationList:
+    """
+    Espelho em memória das revogações de tokens (tabela token_revogado).
+
+    Mantém os jti revogados em um conjunto e, por usuário, a menor versão de
+    token ainda válida, de modo que a dependência de autenticação verifica um
+    token com duas consultas a dicionários, sem acessar o banco. A tabela é
+    relida periodicamente por uma thread em segundo plano para receber as
+    revogações feitas por outros processos; as revogações deste processo são
+    aplicadas imediatamente com `registrar`.
+
+    Revogações nunca são desfeitas, então a releitura apenas acrescenta
+    entradas e descarta as que já expiraram.
+    """
+
+    def __init__(self, session_factory: sessionmaker, intervalo_segundos: int):
+        self.session_factory = session_factory
+        self.intervalo_segundos = intervalo_segundos
+        self._jtis: Dict[str, datetime] = {}
+        self._versoes: Dict[str, Tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._inicio_lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def esta_revogado(self, payload: Dict[str, Any]) -> bool:
+        """
+        Verifica se um token (payload já validado) foi revogado, pelo seu jti
+        ou pela versão de token do usuário.
+        """
+        if self._thread is None:
+            self.iniciar()
+
+        jti = payload.get("jti")
+        if jti is not None and jti in self._jtis:
+            return True
+
+        versao_minima = self._versoes.get(str(payload.get("sub")))
+        if versao_minima is None:
+            return False
+        versao = payload.get("authz", payload).get("token_version")
+        return versao is None or versao < versao_minima[0]
+
+    def registrar(self, revogacoes: Iterable[TokenRevogado]) -> None:
+        """Aplica revogações já gravadas no banco, sem esperar a próxima releitura"""
+        with self._lock:
+            jtis = dict(self._jtis)
+            versoes = dict(self._versoes)
+            self._aplicar(jtis, versoes, revogacoes)
+            self._jtis, self._versoes = jtis, versoes
+
+    def atualizar(self) -> None:
+        """Relê as revogações vigentes do banco"""
+        agora = DateTimeUtils.now()
+        with self.session_factory() as session:
+            revogacoes = TokenRevogadoRepository(session).listar_vigentes(agora)
+
+        with self._lock:
+            # Mantém as entradas registradas localmente durante a leitura
+            jtis = {
+                jti: expira_em
+                for jti, expira_em in self._jtis.items()
+                if expira_em > agora
+            }
+            versoes = {
+                usuario_id: entrada
+                for usuario_id, entrada in self._versoes.items()
+                if entrada[1] > agora
+            }
+            self._aplicar(jtis, versoes, revogacoes)
+            # Troca os dicionários inteiros: leitores nunca veem um estado parcial
+            self._jtis, self._versoes = jtis, versoes
+
+    def iniciar(self) -> None:
+        """Carrega as revogações e inicia a releitura periódica"""
+        with self._inicio_lock:
+            if self._thread is not None:
+                return
+            self.atualizar()
+            self._thread = threading.Thread(
+                target=self._executar, name="token-revocation", daemon=True
+            )
+            self._thread.start()
+        logger.info(
+            f"Lista de revogação carregada: {len(self._jtis)} tokens, "
+            f"{len(self._versoes)} usuários"
+        )
+
+    def parar(self) -> None:
+        """Interrompe a releitura periódica"""
+        self._parar.set()
+
+    def _executar(self) -> None:
+        while not self._parar.wait(self.intervalo_segundos):
+            try:
+                self.atualizar()
+            except Exception as e:
+                logger.error(f"Erro ao atualizar a lista de revogação: {str(e)}")
+
+    @staticmethod
+    def _aplicar(
+        jtis: Dict[str, datetime],
+        versoes: Dict[str, Tuple[int, datetime]],
+        revogacoes: Iterable[TokenRevogado],
+    ) -> None:
+        for revogacao in revogacoes:
+            if revogacao.jti is not None:
+                jtis[revogacao.jti] = revogacao.expira_em
+            if revogacao.usuario_id is not None:
+                chave = str(revogacao.usuario_id)
+                atual = versoes.get(chave)
+                if atual is None or revogacao.token_version >= atual[0]:
+                    versoes[chave] = (revogacao.token_version, revogacao.expira_em)
@@ -1,8 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 
 from app.core.di.container import Container
+from app.core.cache.invalidation_bus import (
+    BLOCOS,
+    RESERVAS,
+    SALAS,
+    SEMESTRES,
+    TOKENS,
+)
 
 from app.api.v1.auth_api import router as auth_router
 from app.api.v1.usuario_api import router as usuario_router
@@ -62,6 +70,10 @@ def create_app() -> FastAPI:
     # Initialize database
     init_db()
 
+    # Caches locais invalidados pelas escritas dos outros processos
+    assinar_invalidacoes(container)
+    aquecimento = container.startup_warmup()
+
     # Register exception handlers
     app.add_exception_handler(BaseAPIException, api_exception_handler)
 
@@ -100,6 +112,12 @@ def create_app() -> FastAPI:
     def root():
         return "service is working"
 
+    # Prontidão para o balanceador: 503 enquanto o aquecimento não termina
+    @app.get("/ready", include_in_schema=False)
+    def ready():
+        estado = aquecimento.estado()
+        return JSONResponse(estado, status_code=200 if estado["pronto"] else 503)
+
     # Include routers
     app.include_router(auth_router, prefix=settings.API_V1_STR)
     app.include_router(usuario_router, prefix=settings.API_V1_STR)
@@ -109,21 +127,28 @@ def create_app() -> FastAPI:
     app.include_router(semestre_router, prefix=settings.API_V1_STR)
     app.include_router(relatorio_router, prefix=settings.API_V1_STR)
 
-    # Start scheduler
-    @app.on_event("startup")
-    async def startup_event():
-        scheduler_service = container.scheduler_service()
-        scheduler_service.start()
-        scheduler_service.schedule_daily_notifications()
-        logger.info("Scheduler started and daily notifications scheduled")
-
-    # Stop scheduler
-    @app.on_event("shutdown")
-    async def shutdown_event():
-        scheduler_service = container.scheduler_service()
-        scheduler_service.stop()
-        logger.info("Scheduler stopped")
+    # Pool, dados de referência, feriados, revogações e o schema do OpenAPI
+    aquecimento.adicionar_etapa("openapi", app.openapi)
+    aquecimento.iniciar()
 
     return app
 
+
+def assinar_invalidacoes(container: Container) -> None:
+    """Liga cada cache em memória às notificações do barramento de invalidação"""
+    bus = container.invalidation_bus()
+    referencia_cache = container.referencia_cache()
+    reservas_version = container.reservas_version()
+    token_revocation_list = container.token_revocation_list()
+
+    for entidade in (SALAS, BLOCOS, SEMESTRES):
+        bus.assinar(
+            entidade,
+            lambda chave, entidade=entidade: referencia_cache.invalidar(entidade),
+        )
+    bus.assinar(RESERVAS, lambda chave: reservas_version.bump())
+    bus.assinar(TOKENS, lambda chave: token_revocation_list.atualizar())
+    bus.iniciar()
+
+
 app = create_app()
@@ -5,6 +5,20 @@ from app.model.usuario_model import Usuario
 from app.model.reserva_model import Reserva
 from app.model.reserva_recorrente_model import ReservaRecorrente, FrequenciaEnum
 from app.model.auditoria_model import AuditoriaReserva
+from app.model.ocupacao_cubo_model import (
+    OcupacaoCubo,
+    OcupacaoCuboFato,
+    OcupacaoCuboMarca,
+    OcupacaoCuboRemocao,
+)
+from app.model.relatorio_job_model import (
+    RelatorioJob,
+    StatusRelatorioJob,
+    FormatoRelatorio,
+)
+from app.model.email_outbox_model import EmailOutbox, StatusEmailOutbox
+from app.model.token_revogado_model import TokenRevogado
+from app.model.referencia_geracao_model import ReferenciaGeracao
 
 __all__ = [
     "Base",
@@ -16,5 +30,16 @@ __all__ = [
     "ReservaRecorrente",
     "FrequenciaEnum",
     "AuditoriaReserva",
+    "OcupacaoCubo",
+    "OcupacaoCuboFato",
+    "OcupacaoCuboMarca",
+    "OcupacaoCuboRemocao",
+    "RelatorioJob",
+    "StatusRelatorioJob",
+    "FormatoRelatorio",
+    "EmailOutbox",
+    "StatusEmailOutbox",
+    "TokenRevogado",
+    "ReferenciaGeracao",
     "registrar_event_listeners",
 ]
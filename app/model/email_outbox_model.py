@@ -0,0 +1,65 @@
+from sqlalchemy import Column, String, DateTime, Enum, Integer, JSON, Text, Index
+from app.model.base_model import BaseModel
+from sqlalchemy.dialects.postgresql import UUID
+import enum
+import uuid
+from app.util.datetime_utils import DateTimeUtils
+
+
+class StatusEmailOutbox(str, enum.Enum):
+    PENDENTE = "PENDENTE"
+    ENVIADO = "ENVIADO"
+    FALHA = "FALHA"
+
+
+class EmailOutbox(BaseModel):
+    """
+    Modelo da caixa de saída de emails.
+    As mensagens são gravadas na mesma transação da operação que as gerou e
+    entregues depois pelo worker. Mensagens com status FALHA esgotaram as
+    tentativas (dead letter).
+
+    Mensagens com `evento` são notificações agrupáveis: as pendentes de um
+    mesmo destinatário são entregues juntas, em um único email de resumo.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_proxima_tentativa", "status", "proxima_tentativa"),
+        Index("ix_email_outbox_destinatario_status", "destinatario", "status"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, comment="ID da mensagem"
+    )
+    destinatario = Column(String(255), nullable=False, comment="Email do destinatário")
+    assunto = Column(String(255), nullable=False, comment="Assunto do email")
+    texto = Column(Text, nullable=False, comment="Conteúdo em texto plano")
+    html = Column(Text, nullable=True, comment="Conteúdo em HTML")
+    variaveis = Column(JSON, nullable=True, comment="Dados do template do email")
+    evento = Column(
+        String(50),
+        nullable=True,
+        comment="Evento da notificação; se informado, pode ser agrupada em um resumo",
+    )
+    status = Column(
+        Enum(StatusEmailOutbox),
+        nullable=False,
+        default=StatusEmailOutbox.PENDENTE,
+        comment="Status da entrega",
+    )
+    tentativas = Column(
+        Integer, nullable=False, default=0, comment="Quantidade de tentativas de envio"
+    )
+    proxima_tentativa = Column(
+        DateTime,
+        nullable=False,
+        default=DateTimeUtils.now,
+        comment="Quando a mensagem pode ser enviada novamente",
+    )
+    ultimo_erro = Column(Text, nullable=True, comment="Erro da última tentativa")
+    criado_em = Column(DateTime, nullable=False, default=DateTimeUtils.now)
+    enviado_em = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, destinatario={self.destinatario}, status={self.status})>"
@@ -0,0 +1,125 @@
+from sqlalchemy import DDL, Column, String, Integer, DateTime, Index, event, func
+from app.model.base_model import BaseModel, metadata
+from sqlalchemy.dialects.postgresql import UUID
+from app.util.datetime_utils import DateTimeUtils
+
+
+class OcupacaoCubo(BaseModel):
+    """
+    Cubo pré-agregado de ocupação das salas.
+    Cada célula guarda a quantidade de reservas e os minutos reservados
+    para uma combinação de semestre, bloco, sala, curso, dia da semana e hora.
+    """
+
+    __tablename__ = "ocupacao_cubo"
+
+    semestre = Column(
+        String(12),
+        primary_key=True,
+        comment="Semestre da reserva, vazio quando fora de um semestre cadastrado",
+    )
+    bloco_id = Column(UUID(as_uuid=True), primary_key=True, comment="ID do bloco")
+    sala_id = Column(UUID(as_uuid=True), primary_key=True, comment="ID da sala")
+    curso = Column(String(255), primary_key=True, comment="Curso do usuário")
+    dia_semana = Column(
+        Integer, primary_key=True, comment="Dia da semana (0=segunda, 6=domingo)"
+    )
+    hora = Column(Integer, primary_key=True, comment="Faixa horária (0-23)")
+    quantidade_reservas = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Quantidade de reservas que ocupam a faixa horária",
+    )
+    minutos_reservados = Column(
+        Integer, nullable=False, default=0, comment="Minutos reservados na faixa"
+    )
+    atualizado_em = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=DateTimeUtils.now,
+        onupdate=DateTimeUtils.now,
+    )
+
+
+class OcupacaoCuboFato(BaseModel):
+    """
+    Contribuição de cada reserva para o cubo, por faixa horária.
+    Permite remover a contribuição antiga quando a reserva é alterada.
+    """
+
+    __tablename__ = "ocupacao_cubo_fato"
+    __table_args__ = (Index("ix_ocupacao_cubo_fato_reserva_id", "reserva_id"),)
+
+    reserva_id = Column(UUID(as_uuid=True), primary_key=True, comment="ID da reserva")
+    data = Column(DateTime(timezone=True), primary_key=True, comment="Início da faixa")
+    semestre = Column(String(12), nullable=False)
+    bloco_id = Column(UUID(as_uuid=True), nullable=False)
+    sala_id = Column(UUID(as_uuid=True), nullable=False)
+    curso = Column(String(255), nullable=False)
+    dia_semana = Column(Integer, nullable=False)
+    hora = Column(Integer, nullable=False)
+    minutos = Column(Integer, nullable=False)
+
+
+class OcupacaoCuboMarca(BaseModel):
+    """Marca d'água da última atualização incremental do cubo"""
+
+    __tablename__ = "ocupacao_cubo_marca"
+
+    nome = Column(String(50), primary_key=True, comment="Nome do processo")
+    processado_ate = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Maior atualizado_em já processado",
+    )
+
+
+class OcupacaoCuboRemocao(BaseModel):
+    """
+    Fila de reservas removidas fisicamente, preenchida por trigger no banco.
+    O trigger também registra as remoções em cascata (sala, reserva recorrente),
+    que não passam pelos eventos do ORM. A atualização incremental consome a
+    fila para retirar a contribuição dessas reservas sem varrer os fatos.
+    """
+
+    __tablename__ = "ocupacao_cubo_remocao"
+
+    reserva_id = Column(UUID(as_uuid=True), primary_key=True, comment="ID da reserva")
+    removido_em = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+# Criado depois de todas as tabelas (o trigger depende de `reservas`) e de forma
+# idempotente, pois `create_all` roda a cada inicialização.
+event.listen(
+    metadata,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION ocupacao_cubo_registrar_remocao() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO ocupacao_cubo_remocao (reserva_id, removido_em)
+            VALUES (OLD.id, now())
+            ON CONFLICT (reserva_id) DO NOTHING;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'tg_reservas_ocupacao_cubo_remocao'
+                  AND tgrelid = 'reservas'::regclass
+            ) THEN
+                CREATE TRIGGER tg_reservas_ocupacao_cubo_remocao
+                AFTER DELETE ON reservas
+                FOR EACH ROW EXECUTE FUNCTION ocupacao_cubo_registrar_remocao();
+            END IF;
+        END;
+        $$;
+        """
+    ).execute_if(dialect="postgresql"),
+)
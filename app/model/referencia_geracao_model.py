@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, Integer
+from app.model.base_model import BaseModel
+
+
+class ReferenciaGeracao(BaseModel):
+    """
+    Geração dos dados de referência (salas, blocos e semestres), incrementada
+    na transação de cada escrita. O snapshot compartilhado guarda a geração
+    que leu, e só é usado enquanto ela não for menor que a do banco.
+    """
+
+    __tablename__ = "referencia_geracao"
+
+    id = Column(Integer, primary_key=True, default=1, comment="Linha única")
+    geracao = Column(
+        BigInteger, nullable=False, default=0, comment="Geração atual dos dados"
+    )
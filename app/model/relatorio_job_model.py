@@ -0,0 +1,78 @@
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    Enum,
+    ForeignKey,
+    JSON,
+    LargeBinary,
+    Text,
+    Index,
+)
+from sqlalchemy.orm import deferred
+from app.model.base_model import BaseModel
+from sqlalchemy.dialects.postgresql import UUID
+import enum
+import uuid
+from app.util.datetime_utils import DateTimeUtils
+
+
+class StatusRelatorioJob(str, enum.Enum):
+    PENDENTE = "PENDENTE"
+    PROCESSANDO = "PROCESSANDO"
+    CONCLUIDO = "CONCLUIDO"
+    ERRO = "ERRO"
+
+
+class FormatoRelatorio(str, enum.Enum):
+    JSON = "JSON"
+    CSV = "CSV"
+
+
+class RelatorioJob(BaseModel):
+    """
+    Modelo para relatórios processados em segundo plano.
+    O resultado é armazenado comprimido com gzip.
+    """
+
+    __tablename__ = "relatorio_job"
+    __table_args__ = (
+        Index("ix_relatorio_job_parametros_hash", "parametros_hash"),
+        Index("ix_relatorio_job_status_criado_em", "status", "criado_em"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, comment="ID do job"
+    )
+    tipo = Column(String(50), nullable=False, comment="Tipo do relatório")
+    parametros = Column(JSON, nullable=False, comment="Parâmetros do relatório")
+    parametros_hash = Column(
+        String(64),
+        nullable=False,
+        comment="Hash de tipo, parâmetros e formato, usado para reaproveitar resultados",
+    )
+    formato = Column(
+        Enum(FormatoRelatorio), nullable=False, comment="Formato do resultado"
+    )
+    status = Column(
+        Enum(StatusRelatorioJob),
+        nullable=False,
+        default=StatusRelatorioJob.PENDENTE,
+        comment="Status do processamento",
+    )
+    resultado = deferred(
+        Column(LargeBinary, nullable=True, comment="Resultado comprimido com gzip")
+    )
+    erro = Column(Text, nullable=True, comment="Mensagem de erro do processamento")
+    solicitado_por_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("usuarios.id"),
+        nullable=False,
+        comment="ID do usuário que solicitou o relatório",
+    )
+    criado_em = Column(DateTime, nullable=False, default=DateTimeUtils.now)
+    iniciado_em = Column(DateTime, nullable=True)
+    concluido_em = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<RelatorioJob(id={self.id}, tipo={self.tipo}, status={self.status})>"
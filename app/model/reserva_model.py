@@ -2,6 +2,7 @@ from sqlalchemy import Column, DateTime, ForeignKey, Text, CheckConstraint
 from sqlalchemy.orm import relationship
 from app.model.base_model import BaseModel
 from sqlalchemy.dialects.postgresql import UUID
+from datetime import timedelta
 import uuid
 from app.util.datetime_utils import DateTimeUtils
 
@@ -38,11 +39,30 @@ class Reserva(BaseModel):
     excluido_por_id = Column(
         UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
     )
+    proximo_lembrete = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True,
+        comment="Quando enviar o lembrete da reserva; nulo se não houver lembrete pendente",
+    )
 
     # Relationships
     sala = relationship("Sala")
     usuario = relationship("Usuario", foreign_keys=[usuario_id])
     reserva_recorrente = relationship("ReservaRecorrente")
 
+    def agendar_lembrete(self, minutos_antes: int) -> None:
+        """
+        Define o próximo lembrete para `minutos_antes` do início da reserva.
+        Reservas excluídas ou já iniciadas ficam sem lembrete; se o horário
+        do lembrete já passou, ele é enviado assim que possível.
+        """
+        agora = DateTimeUtils.now()
+        inicio = self.inicio.replace(tzinfo=None) if self.inicio.tzinfo else self.inicio
+        if minutos_antes <= 0 or self.excluido_em is not None or inicio <= agora:
+            self.proximo_lembrete = None
+            return
+        self.proximo_lembrete = max(inicio - timedelta(minutes=minutos_antes), agora)
+
     def __repr__(self):
         return f"<Reserva(id={self.id}, sala_id={self.sala_id}, inicio={self.inicio}, fim={self.fim})>"
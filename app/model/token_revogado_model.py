@@ -0,0 +1,44 @@
+from sqlalchemy import Column, String, DateTime, Integer, Index
+from app.model.base_model import BaseModel
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from app.util.datetime_utils import DateTimeUtils
+
+
+class TokenRevogado(BaseModel):
+    """
+    Modelo das revogações de tokens JWT ainda não expirados.
+
+    Cada registro revoga um token específico (`jti`) ou todos os tokens de um
+    usuário emitidos com versão menor que `token_version`. O registro só é
+    necessário até `expira_em`, quando os tokens que ele revoga já expiraram.
+    """
+
+    __tablename__ = "token_revogado"
+    __table_args__ = (Index("ix_token_revogado_expira_em", "expira_em"),)
+
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, comment="ID da revogação"
+    )
+    jti = Column(
+        String(64), nullable=True, unique=True, comment="Identificador do token revogado"
+    )
+    # Sem chave estrangeira: a revogação precisa sobreviver à exclusão do usuário
+    usuario_id = Column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="Usuário cujos tokens anteriores a token_version estão revogados",
+    )
+    token_version = Column(
+        Integer, nullable=True, comment="Menor versão de token ainda válida"
+    )
+    motivo = Column(String(255), nullable=True, comment="Motivo da revogação")
+    expira_em = Column(
+        DateTime,
+        nullable=False,
+        comment="Quando os tokens revogados expiram e o registro pode ser removido",
+    )
+    criado_em = Column(DateTime, nullable=False, default=DateTimeUtils.now)
+
+    def __repr__(self):
+        return f"<TokenRevogado(jti={self.jti}, usuario_id={self.usuario_id}, token_version={self.token_version})>"
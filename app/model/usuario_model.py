@@ -1,6 +1,7 @@
 from sqlalchemy import Column, String, Boolean, DateTime, Integer
 from app.model.base_model import BaseModel
 from passlib.context import CryptContext
+from datetime import datetime, timedelta
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from app.util.datetime_utils import DateTimeUtils
@@ -55,9 +56,21 @@ class Usuario(BaseModel):
         default=0,
         comment="Número de tentativas de login malsucedidas",
     )
+    bloqueado_ate = Column(
+        DateTime,
+        nullable=True,
+        comment="Fim do bloqueio temporário do login por tentativas malsucedidas",
+    )
     super_user = Column(
         Boolean, nullable=False, default=False, comment="Indica se é um super usuário"
     )
+    token_version = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Versão dos tokens; incrementada para invalidar os tokens já emitidos",
+    )
 
     # Campos de auditoria
     ultimo_login = Column(
@@ -80,8 +93,14 @@ class Usuario(BaseModel):
 
     def set_senha(self, senha: str) -> None:
         """Define a senha do usuário usando bcrypt (que já inclui o salt automaticamente)"""
-        self.senha = pwd_context.hash(senha)
+        self.set_hash_senha(pwd_context.hash(senha))
+
+    def set_hash_senha(self, hash_senha: str) -> None:
+        """Define a senha a partir de um hash bcrypt já calculado"""
+        self.senha = hash_senha
         self.tentativas_login = 0
+        self.bloqueado_ate = None
+        self.revogar_tokens()
 
     def verificar_senha(self, senha: str) -> bool:
         """Verifica se a senha fornecida corresponde ao hash armazenado"""
@@ -92,22 +111,36 @@ class Usuario(BaseModel):
         self.ultimo_login = DateTimeUtils.now()
         self.ultimo_ip = ip
         self.tentativas_login = 0
+        self.bloqueado_ate = None
         if self.bloqueado:
             self.bloqueado = False
             self.motivo_bloqueio = None
 
-    def registrar_tentativa_falha(self) -> None:
-        """Registra uma tentativa de login malsucedida"""
+    def registrar_tentativa_falha(
+        self, max_tentativas: int, bloqueio: timedelta
+    ) -> None:
+        """
+        Registra uma tentativa de login malsucedida. A partir de `max_tentativas`
+        falhas seguidas, cada nova falha bloqueia o login por `bloqueio`.
+        """
         self.tentativas_login += 1
-        if self.tentativas_login >= 5:
-            self.bloqueado = True
-            self.motivo_bloqueio = "Excesso de tentativas de login malsucedidas"
+        if self.tentativas_login >= max_tentativas:
+            self.bloqueado_ate = DateTimeUtils.now() + bloqueio
+
+    def login_bloqueado(self, agora: datetime) -> bool:
+        """Indica se o login está temporariamente bloqueado"""
+        return self.bloqueado_ate is not None and self.bloqueado_ate > agora
+
+    def revogar_tokens(self) -> None:
+        """Invalida os tokens já emitidos para o usuário"""
+        self.token_version = (self.token_version or 0) + 1
 
     def desativar(self, motivo: str) -> None:
         """Desativa a conta do usuário"""
         self.ativo = False
         self.bloqueado = True
         self.motivo_bloqueio = motivo
+        self.revogar_tokens()
 
     def ativar(self) -> None:
         """Ativa a conta do usuário"""
@@ -115,3 +148,4 @@ class Usuario(BaseModel):
         self.bloqueado = False
         self.motivo_bloqueio = None
         self.tentativas_login = 0
+        self.bloqueado_ate = None
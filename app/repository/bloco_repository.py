@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.model.bloco_model import Bloco
@@ -49,3 +49,7 @@ class BlocoRepository(BaseRepository):
             .filter(self.model.identificacao == identificacao)
             .first()
         )
+
+    def get_todos(self) -> List[Bloco]:
+        """Busca todos os blocos, sem paginação"""
+        return self.session.query(Bloco).all()
@@ -0,0 +1,57 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.model.email_outbox_model import EmailOutbox, StatusEmailOutbox
+from app.repository.base_repository import BaseRepository
+
+
+class EmailOutboxRepository(BaseRepository):
+    """Repositório responsável pelo acesso à caixa de saída de emails"""
+
+    def __init__(self, session: Session):
+        super().__init__(session, EmailOutbox)
+        self.session = session
+
+    def adicionar(self, mensagem: EmailOutbox) -> EmailOutbox:
+        """
+        Adiciona uma mensagem à sessão sem commit, para que ela seja gravada
+        na mesma transação da operação que a gerou.
+        """
+        self.session.add(mensagem)
+        return mensagem
+
+    def reservar_proxima(self, agora: datetime) -> Optional[EmailOutbox]:
+        """
+        Reserva a próxima mensagem pendente cuja tentativa já venceu.
+        Usa SKIP LOCKED para que vários workers não entreguem a mesma mensagem.
+        """
+        return (
+            self.session.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status == StatusEmailOutbox.PENDENTE,
+                EmailOutbox.proxima_tentativa <= agora,
+            )
+            .order_by(EmailOutbox.proxima_tentativa.asc())
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+    def reservar_agrupaveis(self, mensagem: EmailOutbox) -> List[EmailOutbox]:
+        """
+        Reserva as demais notificações agrupáveis pendentes do mesmo
+        destinatário, mesmo que ainda não vencidas, para entregá-las no mesmo
+        resumo. Mensagens reservadas por outro worker são ignoradas.
+        """
+        return (
+            self.session.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status == StatusEmailOutbox.PENDENTE,
+                EmailOutbox.destinatario == mensagem.destinatario,
+                EmailOutbox.evento.isnot(None),
+                EmailOutbox.id != mensagem.id,
+            )
+            .order_by(EmailOutbox.criado_em.asc())
+            .with_for_update(skip_locked=True)
+            .all()
+        )
@@ -0,0 +1,169 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.model.ocupacao_cubo_model import (
+    OcupacaoCubo,
+    OcupacaoCuboFato,
+    OcupacaoCuboMarca,
+    OcupacaoCuboRemocao,
+)
+from app.model.reserva_model import Reserva
+from app.model.sala_model import Sala
+from app.model.usuario_model import Usuario
+
+# Dimensões permitidas para agregação e filtro
+DIMENSOES_CUBO = {
+    "semestre": OcupacaoCubo.semestre,
+    "bloco_id": OcupacaoCubo.bloco_id,
+    "sala_id": OcupacaoCubo.sala_id,
+    "curso": OcupacaoCubo.curso,
+    "dia_semana": OcupacaoCubo.dia_semana,
+    "hora": OcupacaoCubo.hora,
+}
+
+CHAVE_CELULA = ("semestre", "bloco_id", "sala_id", "curso", "dia_semana", "hora")
+
+
+class OcupacaoCuboRepository:
+    """Repositório responsável pelo acesso ao cubo de ocupação"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def agregar(
+        self, dimensoes: List[str], filtros: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Agrega o cubo pelas dimensões informadas.
+
+        Args:
+            dimensoes: Dimensões do agrupamento (devem estar em DIMENSOES_CUBO)
+            filtros: Filtros de igualdade por dimensão
+
+        Returns:
+            Lista de linhas com as dimensões, quantidade e minutos
+        """
+        colunas = [DIMENSOES_CUBO[nome].label(nome) for nome in dimensoes]
+        query = self.session.query(
+            *colunas,
+            func.sum(OcupacaoCubo.quantidade_reservas).label("quantidade_reservas"),
+            func.sum(OcupacaoCubo.minutos_reservados).label("minutos_reservados"),
+        )
+        for nome, valor in filtros.items():
+            query = query.filter(DIMENSOES_CUBO[nome] == valor)
+        if colunas:
+            query = query.group_by(*colunas).order_by(*colunas)
+
+        return [dict(linha._mapping) for linha in query.all()]
+
+    def get_marca(self, nome: str) -> Optional[datetime]:
+        """Retorna a marca d'água de um processo"""
+        marca = self.session.get(OcupacaoCuboMarca, nome)
+        return marca.processado_ate if marca else None
+
+    def set_marca(self, nome: str, processado_ate: datetime) -> None:
+        """Atualiza a marca d'água de um processo (sem commit)"""
+        stmt = insert(OcupacaoCuboMarca).values(
+            nome=nome, processado_ate=processado_ate
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OcupacaoCuboMarca.nome],
+            set_={"processado_ate": stmt.excluded.processado_ate},
+        )
+        self.session.execute(stmt)
+
+    def get_reservas_alteradas(self, desde: Optional[datetime]) -> List[Tuple]:
+        """
+        Busca as reservas alteradas ou excluídas após a marca d'água,
+        já com o bloco da sala e o curso do usuário.
+        """
+        query = (
+            self.session.query(
+                Reserva.id,
+                Reserva.sala_id,
+                Reserva.inicio,
+                Reserva.fim,
+                Reserva.atualizado_em,
+                Reserva.excluido_em,
+                Sala.bloco_id,
+                Usuario.curso,
+            )
+            .join(Sala, Sala.id == Reserva.sala_id)
+            .join(Usuario, Usuario.id == Reserva.usuario_id)
+        )
+        if desde is not None:
+            query = query.filter(
+                or_(Reserva.atualizado_em > desde, Reserva.excluido_em > desde)
+            )
+        return query.all()
+
+    def get_fatos_por_reservas(self, reserva_ids: Iterable[UUID]) -> List[OcupacaoCuboFato]:
+        """Busca as contribuições atuais das reservas informadas"""
+        return (
+            self.session.query(OcupacaoCuboFato)
+            .filter(OcupacaoCuboFato.reserva_id.in_(list(reserva_ids)))
+            .all()
+        )
+
+    def get_reservas_removidas(self) -> List[UUID]:
+        """Busca as reservas removidas fisicamente ainda não processadas"""
+        return [
+            reserva_id
+            for (reserva_id,) in self.session.query(
+                OcupacaoCuboRemocao.reserva_id
+            ).all()
+        ]
+
+    def delete_remocoes(self, reserva_ids: Iterable[UUID]) -> None:
+        """Retira as reservas informadas da fila de remoções (sem commit)"""
+        self.session.query(OcupacaoCuboRemocao).filter(
+            OcupacaoCuboRemocao.reserva_id.in_(list(reserva_ids))
+        ).delete(synchronize_session=False)
+
+    def delete_fatos(self, reserva_ids: Iterable[UUID]) -> None:
+        """Remove as contribuições das reservas informadas (sem commit)"""
+        self.session.query(OcupacaoCuboFato).filter(
+            OcupacaoCuboFato.reserva_id.in_(list(reserva_ids))
+        ).delete(synchronize_session=False)
+
+    def insert_fatos(self, fatos: List[Dict[str, Any]]) -> None:
+        """Insere novas contribuições (sem commit)"""
+        if fatos:
+            self.session.execute(insert(OcupacaoCuboFato), fatos)
+
+    def aplicar_deltas(self, deltas: Dict[Tuple, Tuple[int, int]]) -> None:
+        """
+        Soma os deltas de quantidade e minutos nas células do cubo e remove
+        as células que ficaram vazias (sem commit).
+        """
+        linhas = [
+            {
+                **dict(zip(CHAVE_CELULA, chave)),
+                "quantidade_reservas": quantidade,
+                "minutos_reservados": minutos,
+            }
+            for chave, (quantidade, minutos) in deltas.items()
+            if quantidade or minutos
+        ]
+        if not linhas:
+            return
+
+        stmt = insert(OcupacaoCubo)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DIMENSOES_CUBO[nome] for nome in CHAVE_CELULA],
+            set_={
+                "quantidade_reservas": OcupacaoCubo.quantidade_reservas
+                + stmt.excluded.quantidade_reservas,
+                "minutos_reservados": OcupacaoCubo.minutos_reservados
+                + stmt.excluded.minutos_reservados,
+                "atualizado_em": func.now(),
+            },
+        )
+        self.session.execute(stmt, linhas)
+        self.session.query(OcupacaoCubo).filter(
+            OcupacaoCubo.quantidade_reservas <= 0
+        ).delete(synchronize_session=False)
@@ -0,0 +1,32 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.model.referencia_geracao_model import ReferenciaGeracao
+from app.repository.base_repository import BaseRepository
+
+LINHA = 1
+
+
+class ReferenciaGeracaoRepository(BaseRepository):
+    """Repositório responsável pela geração dos dados de referência"""
+
+    def __init__(self, session: Session):
+        super().__init__(session, ReferenciaGeracao)
+        self.session = session
+
+    def get_atual(self) -> int:
+        """Retorna a geração atual, 0 se nenhuma escrita foi registrada"""
+        registro = self.session.get(ReferenciaGeracao, LINHA)
+        return registro.geracao if registro else 0
+
+    def incrementar(self) -> int:
+        """
+        Incrementa a geração sem commit, para que ela mude na mesma transação
+        da alteração. Retorna a nova geração.
+        """
+        stmt = insert(ReferenciaGeracao).values(id=LINHA, geracao=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReferenciaGeracao.id],
+            set_={"geracao": ReferenciaGeracao.geracao + 1},
+        ).returning(ReferenciaGeracao.geracao)
+        return self.session.execute(stmt).scalar_one()
@@ -0,0 +1,70 @@
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.model.relatorio_job_model import RelatorioJob, StatusRelatorioJob
+from app.repository.base_repository import BaseRepository
+
+
+class RelatorioJobRepository(BaseRepository):
+    """Repositório responsável pelo acesso aos jobs de relatório"""
+
+    def __init__(self, session: Session):
+        super().__init__(session, RelatorioJob)
+        self.session = session
+
+    def get_reaproveitavel(
+        self,
+        parametros_hash: str,
+        concluido_desde: datetime,
+        solicitado_por_id: Optional[UUID] = None,
+    ) -> Optional[RelatorioJob]:
+        """
+        Busca um job com os mesmos parâmetros que ainda está em andamento
+        ou que foi concluído dentro do prazo de validade. Com
+        `solicitado_por_id`, apenas entre os jobs desse usuário.
+        """
+        query = self.session.query(RelatorioJob)
+        if solicitado_por_id is not None:
+            query = query.filter(RelatorioJob.solicitado_por_id == solicitado_por_id)
+        return (
+            query.filter(
+                RelatorioJob.parametros_hash == parametros_hash,
+                or_(
+                    RelatorioJob.status.in_(
+                        [StatusRelatorioJob.PENDENTE, StatusRelatorioJob.PROCESSANDO]
+                    ),
+                    and_(
+                        RelatorioJob.status == StatusRelatorioJob.CONCLUIDO,
+                        RelatorioJob.concluido_em >= concluido_desde,
+                    ),
+                ),
+            )
+            .order_by(RelatorioJob.criado_em.desc())
+            .first()
+        )
+
+    def reservar_proximo(self, travado_antes_de: datetime) -> Optional[RelatorioJob]:
+        """
+        Reserva o próximo job pendente para processamento.
+        Jobs em processamento há muito tempo são considerados abandonados.
+        Usa SKIP LOCKED para que vários workers não peguem o mesmo job.
+        """
+        job = (
+            self.session.query(RelatorioJob)
+            .filter(
+                or_(
+                    RelatorioJob.status == StatusRelatorioJob.PENDENTE,
+                    and_(
+                        RelatorioJob.status == StatusRelatorioJob.PROCESSANDO,
+                        RelatorioJob.iniciado_em < travado_antes_de,
+                    ),
+                )
+            )
+            .order_by(RelatorioJob.criado_em.asc())
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        return job
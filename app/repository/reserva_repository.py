@@ -1,11 +1,12 @@
-from typing import List
-from datetime import datetime, date
+from typing import Iterable, Iterator, List, Tuple
+from datetime import datetime, date, time, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, joinedload
 from uuid import UUID
 
 from app.model.reserva_model import Reserva
+from app.model.sala_model import Sala
 from app.repository.base_repository import BaseRepository
 from app.schema.reserva_schema import ReservaFiltros, ReservasPaginadas
 from app.core.commons.responses import InformacoesPaginacao
@@ -74,6 +75,7 @@ class ReservaRepository(BaseRepository):
             {
                 Reserva.excluido_em: DateTimeUtils.now(),
                 Reserva.excluido_por_id: usuario_id,
+                Reserva.proximo_lembrete: None,
             }
         )
         self.session.commit()
@@ -101,6 +103,85 @@ class ReservaRepository(BaseRepository):
             .all()
         )
 
+    def get_ativas_do_dia_com_detalhes(
+        self, data: date, tamanho_lote: int = 1000
+    ) -> Iterator[Reserva]:
+        """
+        Busca as reservas ativas de uma data já carregadas com usuário, sala
+        e bloco, em uma única consulta ordenada por usuário.
+
+        O resultado é lido em lotes, permitindo agrupar por usuário em uma
+        única passada sem carregar todas as reservas em memória.
+
+        Args:
+            data: Data das reservas
+            tamanho_lote: Quantidade de linhas lidas do banco por vez
+
+        Returns:
+            Iterador de reservas ordenadas por usuário e horário de início
+        """
+        inicio_dia = datetime.combine(data, time.min)
+        return (
+            self.session.query(Reserva)
+            .join(Reserva.usuario)
+            .join(Reserva.sala)
+            .join(Sala.bloco)
+            .options(
+                contains_eager(Reserva.usuario),
+                contains_eager(Reserva.sala).contains_eager(Sala.bloco),
+            )
+            .filter(
+                Reserva.inicio >= inicio_dia,
+                Reserva.inicio < inicio_dia + timedelta(days=1),
+                Reserva.excluido_em.is_(None),
+            )
+            .order_by(Reserva.usuario_id, Reserva.inicio)
+            .yield_per(tamanho_lote)
+        )
+
+    def get_lembretes_ate(self, limite: datetime) -> List[Tuple[UUID, datetime]]:
+        """
+        Busca os lembretes pendentes até o limite informado, usando o índice
+        de proximo_lembrete.
+
+        Returns:
+            Lista de tuplas (id da reserva, horário do lembrete)
+        """
+        return (
+            self.session.query(Reserva.id, Reserva.proximo_lembrete)
+            .filter(
+                Reserva.proximo_lembrete <= limite,
+                Reserva.excluido_em.is_(None),
+            )
+            .all()
+        )
+
+    def get_lembretes_vencidos(
+        self, reserva_ids: Iterable[UUID], agora: datetime
+    ) -> List[Reserva]:
+        """
+        Busca, entre as reservas informadas, as que ainda têm lembrete vencido,
+        já carregadas com usuário, sala e bloco. As linhas ficam travadas
+        (SKIP LOCKED) até o commit, evitando envio duplicado.
+        """
+        return (
+            self.session.query(Reserva)
+            .join(Reserva.usuario)
+            .join(Reserva.sala)
+            .join(Sala.bloco)
+            .options(
+                contains_eager(Reserva.usuario),
+                contains_eager(Reserva.sala).contains_eager(Sala.bloco),
+            )
+            .filter(
+                Reserva.id.in_(list(reserva_ids)),
+                Reserva.proximo_lembrete <= agora,
+                Reserva.excluido_em.is_(None),
+            )
+            .with_for_update(of=Reserva, skip_locked=True)
+            .all()
+        )
+
     def get_by_date_range(self, data_inicio: datetime, data_fim: datetime) -> List[Reserva]:
         """
         Busca todas as reservas em um período específico.
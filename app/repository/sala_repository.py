@@ -102,3 +102,7 @@ class SalaRepository(BaseRepository):
             .filter(Sala.id == sala_id)
             .first()
         )
+
+    def get_todas_com_bloco(self) -> List[Sala]:
+        """Busca todas as salas, com o bloco de cada uma"""
+        return self.session.query(Sala).options(joinedload(Sala.bloco)).all()
@@ -0,0 +1,40 @@
+from typing import List
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.model.token_revogado_model import TokenRevogado
+from app.repository.base_repository import BaseRepository
+
+
+class TokenRevogadoRepository(BaseRepository):
+    """Repositório responsável pelo acesso às revogações de tokens"""
+
+    def __init__(self, session: Session):
+        super().__init__(session, TokenRevogado)
+        self.session = session
+
+    def adicionar(self, revogacao: TokenRevogado) -> TokenRevogado:
+        """
+        Adiciona uma revogação à sessão sem commit, para que ela seja gravada
+        na mesma transação da alteração do usuário que a gerou.
+        """
+        self.session.add(revogacao)
+        return revogacao
+
+    def listar_vigentes(self, agora: datetime) -> List[TokenRevogado]:
+        """Lista as revogações cujos tokens ainda não expiraram"""
+        return (
+            self.session.query(TokenRevogado)
+            .filter(TokenRevogado.expira_em > agora)
+            .all()
+        )
+
+    def remover_expiradas(self, agora: datetime) -> int:
+        """Remove as revogações cujos tokens já expiraram"""
+        removidas = (
+            self.session.query(TokenRevogado)
+            .filter(TokenRevogado.expira_em <= agora)
+            .delete(synchronize_session=False)
+        )
+        self.session.commit()
+        return removidas
@@ -1,11 +1,20 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, case, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from uuid import UUID
+import logging
 
 from app.model.usuario_model import Usuario
 from app.repository.base_repository import BaseRepository
 from app.schema.usuario_schema import UsuarioFiltros, UsuariosPaginados
 from app.core.commons.responses import InformacoesPaginacao
+from app.core.commons.exceptions import BusinessException
+from app.util.datetime_utils import DateTimeUtils
+
+logger = logging.getLogger(__name__)
 
 
 class UsuarioRepository(BaseRepository):
@@ -94,3 +103,87 @@ class UsuarioRepository(BaseRepository):
             .filter(and_(Usuario.id == usuario_id, Usuario.ativo ))
             .first()
         )
+
+    def registrar_falha_login(
+        self, usuario_id: UUID, max_tentativas: int, bloqueado_ate: datetime
+    ) -> None:
+        """
+        Incrementa as tentativas malsucedidas em um único UPDATE, para que
+        tentativas simultâneas não se percam, bloqueando o login até
+        `bloqueado_ate` a partir de `max_tentativas` falhas seguidas.
+        """
+        self.session.query(Usuario).filter(Usuario.id == usuario_id).update(
+            {
+                Usuario.tentativas_login: Usuario.tentativas_login + 1,
+                Usuario.bloqueado_ate: case(
+                    (Usuario.tentativas_login + 1 >= max_tentativas, bloqueado_ate),
+                    else_=Usuario.bloqueado_ate,
+                ),
+            },
+            synchronize_session=False,
+        )
+        self.session.commit()
+
+    def registrar_login(self, usuario_id: UUID, ip: Optional[str]) -> None:
+        """Registra um login bem-sucedido, zerando as tentativas malsucedidas"""
+        self.session.query(Usuario).filter(Usuario.id == usuario_id).update(
+            {
+                Usuario.ultimo_login: DateTimeUtils.now(),
+                Usuario.ultimo_ip: ip,
+                Usuario.tentativas_login: 0,
+                Usuario.bloqueado_ate: None,
+            },
+            synchronize_session=False,
+        )
+        self.session.commit()
+
+    def get_matriculas_emails_existentes(
+        self, matriculas: Iterable[str], emails: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Busca, em uma única consulta, quais matrículas e emails já estão
+        cadastrados (em usuários ativos ou não).
+
+        Returns:
+            Matrículas e emails já existentes
+        """
+        matriculas, emails = list(matriculas), list(emails)
+        if not matriculas and not emails:
+            return set(), set()
+        existentes = (
+            self.session.query(Usuario.matricula, Usuario.email)
+            .filter(or_(Usuario.matricula.in_(matriculas), Usuario.email.in_(emails)))
+            .all()
+        )
+        return (
+            {matricula for matricula, _ in existentes},
+            {email for _, email in existentes},
+        )
+
+    def inserir_em_lote(
+        self, linhas: List[Dict[str, Any]], tamanho_lote: int = 1000
+    ) -> Set[UUID]:
+        """
+        Insere usuários com INSERT de várias linhas por comando, ignorando as
+        que conflitam com matrícula ou email já existentes (ON CONFLICT DO
+        NOTHING). Todos os lotes são gravados em uma única transação.
+
+        Returns:
+            IDs dos usuários efetivamente inseridos
+        """
+        inseridos: Set[UUID] = set()
+        try:
+            for inicio in range(0, len(linhas), tamanho_lote):
+                comando = (
+                    insert(Usuario)
+                    .values(linhas[inicio : inicio + tamanho_lote])
+                    .on_conflict_do_nothing()
+                    .returning(Usuario.id)
+                )
+                inseridos.update(self.session.execute(comando).scalars())
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Erro ao importar usuários: {str(e)}")
+            raise BusinessException(f"Erro ao importar usuários: {str(e)}")
+        return inseridos
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, field_validator
 import re
@@ -72,6 +73,14 @@ class AtualizarTokenRequisicao(BaseModel):
     refresh_token: str = Field(..., description="Token de atualização")
 
 
+class LogoutRequisicao(BaseModel):
+    """Dados opcionais do logout"""
+
+    refresh_token: Optional[str] = Field(
+        None, description="Token de atualização da sessão, revogado junto"
+    )
+
+
 class AtualizarTokenResposta(BaseModel):
     """Resposta da atualização do token"""
 
@@ -84,6 +93,24 @@ class AtualizarTokenResposta(BaseModel):
         from_attributes = True
 
 
+class UsuarioPrincipal(BaseModel):
+    """
+    Dados mínimos do usuário autenticado, usados para autorização.
+    Não está ligado a uma sessão do banco e pode ser compartilhado entre requisições.
+    """
+
+    id: UUID
+    curso: str
+    super_user: bool
+    token_version: int
+    ativo: bool
+    bloqueado: bool
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class TokenPayload(BaseModel):
     """Payload do token JWT"""
 
@@ -0,0 +1,32 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class ModeloEmail(BaseModel):
+    """
+    Schema de um modelo de email compartilhado por vários destinatários.
+    Os textos podem usar variáveis do Mailgun no formato %recipient.variavel%.
+    """
+
+    assunto: str
+    texto: str
+    html: Optional[str] = None
+
+    class Config:
+        frozen = True
+
+
+class DestinatarioEmail(BaseModel):
+    """Schema de um destinatário com as variáveis do seu email"""
+
+    email: str
+    variaveis: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ResultadoEnvioEmail(BaseModel):
+    """Schema do resultado do envio para um destinatário"""
+
+    email: str
+    enviado: bool
+    mensagem_id: Optional[str] = None
+    erro: Optional[str] = None
@@ -0,0 +1,41 @@
+from typing import Tuple
+from uuid import UUID
+
+from app.schema.bloco_schema import BlocoResponse
+from app.schema.sala_schema import SalaResponse
+from app.schema.semestre_schema import SemestreResponse
+
+# ------------------------
+# Cópias imutáveis dos dados de referência, mantidas em cache.
+# Não estão ligadas a uma sessão do banco e podem ser compartilhadas entre
+# requisições.
+# ------------------------
+
+
+class BlocoSnapshot(BlocoResponse):
+    """Cópia imutável de um bloco"""
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class SalaSnapshot(SalaResponse):
+    """Cópia imutável de uma sala, com o seu bloco"""
+
+    recursos: Tuple[str, ...] = ()
+    bloco: BlocoSnapshot
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+class SemestreSnapshot(SemestreResponse):
+    """Cópia imutável de um semestre"""
+
+    id: UUID
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -1,6 +1,9 @@
-from datetime import date
-from typing import List
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 from pydantic import BaseModel, Field
+from app.model.relatorio_job_model import FormatoRelatorio, StatusRelatorioJob
 from app.schema.sala_schema import SalaResponse
 from app.schema.usuario_schema import UsuarioResponse
 
@@ -41,4 +44,75 @@ class DashboardStatsResponse(BaseModel):
     reservas_semana: int = Field(..., description="Reservas para esta semana")
     reservas_mes: int = Field(..., description="Reservas para este mês")
     salas_mais_ocupadas: List[ReservasPorSalaResponse] = Field(..., description="Top 5 salas mais ocupadas")
-    usuarios_mais_ativos: List[ReservasPorUsuarioResponse] = Field(..., description="Top 5 usuários mais ativos") 
\ No newline at end of file
+    usuarios_mais_ativos: List[ReservasPorUsuarioResponse] = Field(..., description="Top 5 usuários mais ativos")
+
+class OcupacaoCuboFiltros(BaseModel):
+    """Filtros de igualdade aplicados ao cubo de ocupação"""
+    semestre: Optional[str] = Field(None, description="Semestre, no formato '2025.1'")
+    bloco_id: Optional[UUID] = Field(None, description="ID do bloco")
+    sala_id: Optional[UUID] = Field(None, description="ID da sala")
+    curso: Optional[str] = Field(None, description="Curso do usuário")
+    dia_semana: Optional[int] = Field(None, ge=0, le=6, description="Dia da semana (0=segunda, 6=domingo)")
+    hora: Optional[int] = Field(None, ge=0, le=23, description="Faixa horária (0-23)")
+
+class OcupacaoCuboResponse(BaseModel):
+    """Schema para uma linha agregada do cubo de ocupação"""
+    semestre: Optional[str] = Field(None, description="Semestre")
+    bloco_id: Optional[UUID] = Field(None, description="ID do bloco")
+    sala_id: Optional[UUID] = Field(None, description="ID da sala")
+    curso: Optional[str] = Field(None, description="Curso do usuário")
+    dia_semana: Optional[int] = Field(None, description="Dia da semana")
+    hora: Optional[int] = Field(None, description="Faixa horária")
+    quantidade_reservas: int = Field(..., description="Quantidade de reservas")
+    minutos_reservados: int = Field(..., description="Minutos reservados")
+
+class TipoRelatorio(str, Enum):
+    """Tipos de relatório que podem ser processados em segundo plano"""
+    DASHBOARD = "dashboard"
+    RESERVAS_POR_SALA = "reservas_por_sala"
+    RESERVAS_POR_USUARIO = "reservas_por_usuario"
+    RESERVAS_POR_PERIODO = "reservas_por_periodo"
+    OCUPACAO_POR_SALA = "ocupacao_por_sala"
+    USO_SALAS = "uso_salas"
+
+class ParametrosRelatorioVazio(BaseModel):
+    """Relatório sem parâmetros"""
+
+class ParametrosRelatorioPeriodo(BaseModel):
+    """Parâmetros de relatórios por período"""
+    data_inicio: date = Field(..., description="Data inicial do período")
+    data_fim: date = Field(..., description="Data final do período")
+
+class ParametrosRelatorioPeriodoSala(ParametrosRelatorioPeriodo):
+    """Parâmetros de relatórios por período de uma sala"""
+    sala_id: str = Field(..., description="ID da sala")
+
+class ParametrosRelatorioData(BaseModel):
+    """Parâmetros de relatórios de uma data"""
+    data: date = Field(..., description="Data para análise")
+
+class ParametrosRelatorioUsoSalas(BaseModel):
+    """Parâmetros do relatório de uso das salas"""
+    data_inicio: datetime = Field(..., description="Data inicial do relatório")
+    data_fim: datetime = Field(..., description="Data final do relatório")
+
+class RelatorioJobCreate(BaseModel):
+    """Schema para solicitação de relatório em segundo plano"""
+    tipo: TipoRelatorio = Field(..., description="Tipo do relatório")
+    parametros: Dict[str, Any] = Field(default_factory=dict, description="Parâmetros do relatório")
+    formato: FormatoRelatorio = Field(FormatoRelatorio.JSON, description="Formato do resultado")
+
+class RelatorioJobResponse(BaseModel):
+    """Schema para status de um relatório em segundo plano"""
+    id: UUID
+    tipo: str
+    parametros: Dict[str, Any]
+    formato: FormatoRelatorio
+    status: StatusRelatorioJob
+    erro: Optional[str] = None
+    criado_em: datetime
+    iniciado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
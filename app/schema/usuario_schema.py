@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 from uuid import UUID
 
@@ -66,3 +67,32 @@ class UsuariosPaginados(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class StatusImportacaoUsuario(str, Enum):
+    """Resultado da importação de uma linha"""
+
+    CRIADO = "CRIADO"
+    IGNORADO = "IGNORADO"
+    ERRO = "ERRO"
+
+
+class ResultadoImportacaoUsuario(BaseModel):
+    """Resultado da importação de uma linha do arquivo"""
+
+    linha: int
+    matricula: Optional[str] = None
+    email: Optional[str] = None
+    status: StatusImportacaoUsuario
+    mensagem: Optional[str] = None
+    id: Optional[UUID] = None
+
+
+class RelatorioImportacaoUsuarios(BaseModel):
+    """Relatório da importação de usuários em lote"""
+
+    total: int
+    criados: int
+    ignorados: int
+    erros: int
+    resultados: List[ResultadoImportacaoUsuario]
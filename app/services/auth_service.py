@@ -1,9 +1,23 @@
-from typing import List
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from app.core.cache.invalidation_bus import TOKENS, InvalidationBus
 from app.core.config.settings import settings
 from app.core.security.jwt import JWTManager
-from app.core.commons.exceptions import UnauthorizedException, NotFoundException
+from app.core.security.password_hasher import PasswordHasher
+from app.core.security.token_revocation import (
+    TokenRevocationList,
+    revogacao_do_token,
+    revogacao_do_usuario,
+)
+from app.core.commons.exceptions import (
+    BaseAPIException,
+    UnauthorizedException,
+    NotFoundException,
+    TooManyRequestsException,
+)
 from app.model.usuario_model import Usuario
 from app.repository.usuario_repository import UsuarioRepository
+from app.repository.token_revogado_repository import TokenRevogadoRepository
 from app.schema.auth_schema import (
     LoginRequisicao,
     LoginResposta,
@@ -14,16 +28,33 @@ from app.schema.auth_schema import (
 )
 from app.schema.usuario_schema import UsuarioFiltros
 from app.services.base_service import BaseService
+from app.util.datetime_utils import DateTimeUtils
 
 
 class AuthService(BaseService):
-    def __init__(self, user_repository: UsuarioRepository):
+    def __init__(
+        self,
+        user_repository: UsuarioRepository,
+        token_revogado_repository: TokenRevogadoRepository,
+        token_revocation_list: TokenRevocationList,
+        password_hasher: PasswordHasher,
+        invalidation_bus: InvalidationBus,
+    ):
         self.user_repository = user_repository
+        self.token_revogado_repository = token_revogado_repository
+        self.token_revocation_list = token_revocation_list
+        self.password_hasher = password_hasher
+        self.invalidation_bus = invalidation_bus
         super().__init__(user_repository)
 
-    def login(self, credentials: LoginRequisicao) -> LoginResposta:
+    def login(
+        self, credentials: LoginRequisicao, ip: Optional[str] = None
+    ) -> LoginResposta:
         """
-        Autentica o usuário e retorna tokens de acesso
+        Autentica o usuário e retorna tokens de acesso.
+
+        Contas com login bloqueado por tentativas malsucedidas são recusadas
+        antes da verificação da senha, que roda no pool limitado do bcrypt.
         """
         user = self.user_repository.get_by_matricula(credentials.matricula)
 
@@ -33,9 +64,23 @@ class AuthService(BaseService):
         if not user.ativo:
             raise UnauthorizedException(mensagem="Conta não está ativa")
 
-        if not user.verificar_senha(credentials.senha):
+        agora = DateTimeUtils.now()
+        if user.login_bloqueado(agora):
+            raise TooManyRequestsException(
+                "Login bloqueado por excesso de tentativas; tente novamente mais tarde",
+                retry_after=int((user.bloqueado_ate - agora).total_seconds()) + 1,
+            )
+
+        if not self.password_hasher.verificar(credentials.senha, user.senha):
+            self.user_repository.registrar_falha_login(
+                user.id,
+                settings.LOGIN_MAX_TENTATIVAS,
+                agora + timedelta(minutes=settings.LOGIN_BLOQUEIO_MINUTOS),
+            )
             raise UnauthorizedException(mensagem="Matrícula ou senha incorretos")
 
+        self.user_repository.registrar_login(user.id, ip)
+
         # Gerar tokens com o ID do usuário como subject
         access_token = JWTManager.create_access_token(user)
         refresh_token = JWTManager.create_refresh_token(user)
@@ -54,18 +99,51 @@ class AuthService(BaseService):
         Renova o token de acesso usando re  fresh token
         """
         try:
-            user_id = JWTManager.verify_refresh_token(refresh_token.refresh_token)
-            user = self.user_repository.get_by_id(user_id)
+            payload = JWTManager.verify_refresh_token(refresh_token.refresh_token)
+            if self.token_revocation_list.esta_revogado(payload):
+                raise UnauthorizedException(mensagem="Refresh token revogado")
+            user = self.user_repository.get_by_id(payload["sub"])
+            if not user or payload.get("token_version") != user.token_version:
+                raise UnauthorizedException(mensagem="Refresh token revogado")
             new_access_token = JWTManager.create_access_token(user)
 
             return AtualizarTokenResposta(
                 access_token=new_access_token,
-                refresh_token=refresh_token,
-                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+                refresh_token=refresh_token.refresh_token,
+                expires_in=DateTimeUtils.now() + settings.access_token_expires,
+                usuario=user,
             )
         except Exception:
             raise UnauthorizedException(mensagem="Refresh token inválido ou expirado")
 
+    def logout(
+        self, payload_acesso: Dict[str, Any], refresh_token: Optional[str] = None
+    ) -> None:
+        """
+        Revoga o token de acesso da requisição e, se informado, o token de
+        refresh da mesma sessão
+        """
+        payloads = [payload_acesso]
+        if refresh_token:
+            payload_refresh = JWTManager.verify_refresh_token(refresh_token)
+            if payload_refresh["sub"] != payload_acesso["sub"]:
+                raise UnauthorizedException(mensagem="Refresh token inválido")
+            payloads.append(payload_refresh)
+
+        # Tokens emitidos antes da inclusão do jti expiram normalmente
+        revogacoes = [
+            revogacao_do_token(payload, "Logout")
+            for payload in payloads
+            if payload.get("jti")
+        ]
+        for revogacao in revogacoes:
+            self.token_revogado_repository.adicionar(revogacao)
+        self.invalidation_bus.publicar(
+            self.token_revogado_repository.session, TOKENS, payload_acesso["sub"]
+        )
+        self.token_revogado_repository.session.commit()
+        self.token_revocation_list.registrar(revogacoes)
+
     ## TODO: Implementar a recuperação de senha
     def forgot_password(self, request: RecuperarSenhaRequisicao) -> dict:
         """
@@ -98,10 +176,21 @@ class AuthService(BaseService):
             if not user:
                 raise NotFoundException(mensagem="Usuário não encontrado")
 
-            user.set_senha(request.nova_senha)
-            self.user_repository.update(user)
+            hash_senha = self.password_hasher.gerar_hash(request.nova_senha)
+            user.set_hash_senha(hash_senha)
+            revogacao = self.token_revogado_repository.adicionar(
+                revogacao_do_usuario(user, "Senha redefinida")
+            )
+            self.invalidation_bus.publicar(
+                self.token_revogado_repository.session, TOKENS, user.id
+            )
+            self.user_repository.save(user)
+            self.token_revocation_list.registrar([revogacao])
 
             return {"message": "Senha alterada com sucesso"}
+        except BaseAPIException:
+            # Ex.: 429 do pool de senhas, que precisa chegar com o Retry-After
+            raise
         except Exception:
             raise UnauthorizedException(
                 mensagem="Token de recuperação inválido ou expirado"
@@ -1,5 +1,7 @@
 from uuid import UUID
 from app.repository.bloco_repository import BlocoRepository
+from app.core.cache.invalidation_bus import BLOCOS, InvalidationBus
+from app.core.cache.reference_cache import ReferenceDataCache
 from app.services.base_service import BaseService
 from app.core.commons.exceptions import NotFoundException, BusinessException
 from app.model.bloco_model import Bloco
@@ -14,9 +16,16 @@ from app.schema.bloco_schema import (
 class BlocoService(BaseService):
     """Serviço responsável pela gestão de blocos"""
 
-    def __init__(self, bloco_repository: BlocoRepository):
+    def __init__(
+        self,
+        bloco_repository: BlocoRepository,
+        referencia_cache: ReferenceDataCache,
+        invalidation_bus: InvalidationBus,
+    ):
         super().__init__(bloco_repository)
         self.bloco_repository = bloco_repository
+        self.referencia_cache = referencia_cache
+        self.invalidation_bus = invalidation_bus
 
     def get_by_id(self, bloco_id: UUID) -> Bloco:
         """Busca um bloco pelo ID"""
@@ -33,7 +42,11 @@ class BlocoService(BaseService):
                 f"Já existe um bloco com a identificação {bloco_data.identificacao}"
             )
 
-        return self.bloco_repository.save(Bloco(**bloco_data.model_dump()))
+        self.invalidation_bus.publicar(self.bloco_repository.session, BLOCOS)
+        self.referencia_cache.registrar_alteracao(self.bloco_repository.session)
+        bloco = self.bloco_repository.save(Bloco(**bloco_data.model_dump()))
+        self.referencia_cache.invalidar(BLOCOS)
+        return bloco
 
     def update(self, bloco_id: UUID, bloco_data: BlocoUpdate) -> Bloco:
         """Atualiza um bloco existente"""
@@ -46,7 +59,13 @@ class BlocoService(BaseService):
                     f"Já existe um bloco com a identificação {bloco_data.identificacao}"
                 )
 
-        return self.bloco_repository.update(bloco_id, bloco_data)
+        self.invalidation_bus.publicar(self.bloco_repository.session, BLOCOS, bloco_id)
+        self.referencia_cache.registrar_alteracao(self.bloco_repository.session)
+        bloco = self.bloco_repository.update(
+            bloco_id, bloco_data.model_dump(exclude_unset=True)
+        )
+        self.referencia_cache.invalidar(BLOCOS)
+        return bloco
 
     def delete(self, bloco_id: UUID) -> Bloco:
         """Remove um bloco"""
@@ -56,7 +75,10 @@ class BlocoService(BaseService):
         # TODO: Se possuir, lançar uma exceção
         # TODO: Se não possuir, deletar o bloco
 
+        self.invalidation_bus.publicar(self.bloco_repository.session, BLOCOS, bloco_id)
+        self.referencia_cache.registrar_alteracao(self.bloco_repository.session)
         self.bloco_repository.delete(bloco_id)
+        self.referencia_cache.invalidar(BLOCOS)
         return bloco
 
     def get_by_query(self, filtros: BlocoFiltros) -> BlocosPaginados:
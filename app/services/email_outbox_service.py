@@ -0,0 +1,139 @@
+from datetime import timedelta
+from typing import List, Optional
+import logging
+
+from sqlalchemy.orm import sessionmaker
+
+from app.clients.email_client import EmailClient
+from app.core.config.settings import settings
+from app.model.email_outbox_model import EmailOutbox, StatusEmailOutbox
+from app.repository.email_outbox_repository import EmailOutboxRepository
+from app.schema.email_schema import ModeloEmail
+from app.util.datetime_utils import DateTimeUtils
+from app.util.email_templates import EmailTemplates
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxService:
+    """
+    Serviço responsável pela entrega das mensagens da caixa de saída.
+
+    Notificações agrupáveis (com `evento`) pendentes para o mesmo destinatário
+    são entregues juntas em um único email de resumo, quando a primeira delas
+    vence. Como elas entram na caixa de saída com o atraso da janela de
+    agrupamento, alterações em sequência geram um único email.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        email_client: EmailClient,
+        email_templates: EmailTemplates,
+    ):
+        self.session_factory = session_factory
+        self.email_client = email_client
+        self.email_templates = email_templates
+
+    def entregar_pendentes(self, limite: Optional[int] = None) -> int:
+        """
+        Entrega as mensagens pendentes, uma (ou um resumo) por transação, para
+        que uma falha no meio do lote não provoque reenvio das já entregues.
+
+        Returns:
+            Quantidade de emails processados
+        """
+        limite = limite or settings.EMAIL_OUTBOX_LOTE
+        processadas = 0
+        while processadas < limite:
+            with self.session_factory() as session:
+                repository = EmailOutboxRepository(session)
+                mensagem = repository.reservar_proxima(DateTimeUtils.now())
+                if mensagem is None:
+                    session.rollback()
+                    break
+                grupo = [mensagem]
+                if mensagem.evento is not None:
+                    grupo.extend(repository.reservar_agrupaveis(mensagem))
+                self._entregar(grupo)
+                session.commit()
+            processadas += 1
+        return processadas
+
+    def _entregar(self, grupo: List[EmailOutbox]) -> None:
+        """
+        Tenta enviar uma mensagem, ou o resumo de um grupo de notificações,
+        e atualiza o status de todas elas (sem commit)
+        """
+        principal = grupo[0]
+        for mensagem in grupo:
+            mensagem.tentativas += 1
+        try:
+            if len(grupo) == 1:
+                self.email_client.send_email(
+                    to_email=principal.destinatario,
+                    subject=principal.assunto,
+                    text=principal.texto,
+                    html=principal.html,
+                    template_data=principal.variaveis,
+                )
+            else:
+                resumo = self._renderizar_resumo(grupo)
+                self.email_client.send_email(
+                    to_email=principal.destinatario,
+                    subject=resumo.assunto,
+                    text=resumo.texto,
+                    html=resumo.html,
+                )
+                logger.info(
+                    f"{len(grupo)} notificações para {principal.destinatario} "
+                    f"agrupadas em um resumo"
+                )
+        except Exception as e:
+            for mensagem in grupo:
+                self._registrar_falha(mensagem, e)
+            return
+
+        agora = DateTimeUtils.now()
+        for mensagem in grupo:
+            mensagem.status = StatusEmailOutbox.ENVIADO
+            mensagem.enviado_em = agora
+            mensagem.ultimo_erro = None
+
+    def _renderizar_resumo(self, grupo: List[EmailOutbox]) -> ModeloEmail:
+        """Renderiza o email de resumo a partir das notificações do grupo"""
+        return self.email_templates.renderizar(
+            "resumo_notificacoes",
+            {
+                "nome": (grupo[0].variaveis or {}).get("nome", ""),
+                "eventos": [
+                    {"assunto": mensagem.assunto, "variaveis": mensagem.variaveis or {}}
+                    for mensagem in grupo
+                ],
+            },
+        )
+
+    def _registrar_falha(self, mensagem: EmailOutbox, erro: Exception) -> None:
+        """Agenda nova tentativa com backoff ou descarta a mensagem (dead letter)"""
+        mensagem.ultimo_erro = str(erro)
+        if mensagem.tentativas >= settings.EMAIL_OUTBOX_MAX_TENTATIVAS:
+            mensagem.status = StatusEmailOutbox.FALHA
+            logger.error(
+                f"Email {mensagem.id} para {mensagem.destinatario} descartado "
+                f"após {mensagem.tentativas} tentativas: {str(erro)}"
+            )
+        else:
+            mensagem.proxima_tentativa = DateTimeUtils.now() + self._espera(
+                mensagem.tentativas
+            )
+            logger.warning(
+                f"Falha ao enviar email {mensagem.id} "
+                f"(tentativa {mensagem.tentativas}): {str(erro)}"
+            )
+
+    def _espera(self, tentativas: int) -> timedelta:
+        """Backoff exponencial: base * 2^(tentativas - 1), limitado ao máximo"""
+        segundos = settings.EMAIL_OUTBOX_BACKOFF_SEGUNDOS * 2 ** (tentativas - 1)
+        return timedelta(
+            seconds=min(segundos, settings.EMAIL_OUTBOX_BACKOFF_MAX_SEGUNDOS)
+        )
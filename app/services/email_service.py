@@ -1,16 +1,54 @@
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import logging
 from app.clients.email_client import EmailClient
+from app.core.config.settings import settings
+from app.model.email_outbox_model import EmailOutbox
 from app.model.reserva_model import Reserva
 from app.model.reserva_recorrente_model import ReservaRecorrente
 from app.model.usuario_model import Usuario
+from app.schema.referencia_schema import SalaSnapshot
+from app.repository.email_outbox_repository import EmailOutboxRepository
+from app.schema.email_schema import (
+    ModeloEmail,
+    DestinatarioEmail,
+    ResultadoEnvioEmail,
+)
+from app.util.datetime_utils import DateTimeUtils
+from app.util.email_templates import EmailTemplates
+
+logger = logging.getLogger(__name__)
+
+# Limite de destinatários por envio em lote do Mailgun
+TAMANHO_LOTE_EMAIL = 1000
+
+# Modelo dos lotes de emails já renderizados por destinatário
+MODELO_RENDERIZADO = ModeloEmail(
+    assunto="%recipient.assunto%",
+    texto="%recipient.texto%",
+    html="%recipient.html%",
+)
 
 
 class EmailService:
-    """Serviço responsável pelo envio de emails de notificação"""
+    """
+    Serviço responsável pelo envio de emails de notificação.
+
+    As notificações geradas pela API são gravadas na caixa de saída
+    (email_outbox), na mesma transação da operação, e entregues pelo worker.
+    As notificações do próprio worker são enviadas diretamente.
+    O conteúdo vem dos templates em app/templates/email.
+    """
 
-    def __init__(self, email_client: EmailClient):
+    def __init__(
+        self,
+        email_client: EmailClient,
+        email_outbox_repository: EmailOutboxRepository,
+        email_templates: EmailTemplates,
+    ):
         self.email_client = email_client
+        self.email_outbox_repository = email_outbox_repository
+        self.email_templates = email_templates
 
     def _format_date(self, date: datetime) -> str:
         """Formata uma data para exibição no email"""
@@ -21,13 +59,13 @@ class EmailService:
         return date.strftime("%H:%M")
 
     def _get_reserva_template_data(
-        self, reserva: Reserva, usuario: Usuario
+        self, reserva: Reserva, usuario: Usuario, sala: SalaSnapshot
     ) -> Dict[str, Any]:
         """Gera os dados para o template de email de reserva"""
         return {
             "nome": usuario.nome,
-            "sala": reserva.sala.identificacao_sala,
-            "bloco": reserva.sala.bloco.nome,
+            "sala": sala.identificacao_sala,
+            "bloco": sala.bloco.nome,
             "data": self._format_date(reserva.inicio),
             "hora_inicio": self._format_time(reserva.inicio),
             "hora_fim": self._format_time(reserva.fim),
@@ -35,13 +73,13 @@ class EmailService:
         }
 
     def _get_reserva_recorrente_template_data(
-        self, reserva: ReservaRecorrente, usuario: Usuario
+        self, reserva: ReservaRecorrente, usuario: Usuario, sala: SalaSnapshot
     ) -> Dict[str, Any]:
         """Gera os dados para o template de email de reserva recorrente"""
         return {
             "nome": usuario.nome,
-            "sala": reserva.sala.identificacao_sala,
-            "bloco": reserva.sala.bloco.nome,
+            "sala": sala.identificacao_sala,
+            "bloco": sala.bloco.nome,
             "data_inicio": self._format_date(reserva.data_inicio),
             "data_fim": self._format_date(reserva.data_fim),
             "hora_inicio": reserva.hora_inicio.strftime("%H:%M"),
@@ -50,96 +88,237 @@ class EmailService:
             "motivo": reserva.motivo,
         }
 
-    def notificar_reserva_criada(self, reserva: Reserva, usuario: Usuario) -> None:
-        """Envia notificação de nova reserva criada"""
-        template_data = self._get_reserva_template_data(reserva, usuario)
-
-        subject = f"Nova reserva de sala - {reserva.sala.identificacao_sala}"
-        text = (
-            f"Olá {usuario.nome},\n\n"
-            f"Sua reserva foi criada com sucesso!\n\n"
-            f"Detalhes da reserva:\n"
-            f"Sala: {reserva.sala.identificacao_sala}\n"
-            f"Bloco: {reserva.sala.bloco.nome}\n"
-            f"Data: {self._format_date(reserva.inicio)}\n"
-            f"Horário: {self._format_time(reserva.inicio)} - {self._format_time(reserva.fim)}\n"
-            f"Motivo: {reserva.motivo}\n\n"
-            f"Atenciosamente,\n"
-            f"Sistema de Reserva de Salas"
-        )
-
-        html = f"""
-        <html>
-            <body>
-                <h2>Nova reserva criada</h2>
-                <p>Olá {usuario.nome},</p>
-                <p>Sua reserva foi criada com sucesso!</p>
-                <h3>Detalhes da reserva:</h3>
-                <ul>
-                    <li><strong>Sala:</strong> {reserva.sala.identificacao_sala}</li>
-                    <li><strong>Bloco:</strong> {reserva.sala.bloco.nome}</li>
-                    <li><strong>Data:</strong> {self._format_date(reserva.inicio)}</li>
-                    <li><strong>Horário:</strong> {self._format_time(reserva.inicio)} - {self._format_time(reserva.fim)}</li>
-                    <li><strong>Motivo:</strong> {reserva.motivo}</li>
-                </ul>
-                <p>Atenciosamente,<br>Sistema de Reserva de Salas</p>
-            </body>
-        </html>
+    def notificar_reserva_criada(
+        self, reserva: Reserva, usuario: Usuario, sala: Optional[SalaSnapshot] = None
+    ) -> None:
         """
-
-        self.email_client.send_email(
+        Envia notificação de nova reserva criada.
+        A `sala` vem do cache de referência; sem ela, usa a relação da reserva.
+        """
+        sala = sala or reserva.sala
+        email = self.email_templates.renderizar(
+            "reserva_criada", {"reserva": reserva, "usuario": usuario, "sala": sala}
+        )
+        self._enfileirar(
             to_email=usuario.email,
-            subject=subject,
-            text=text,
-            html=html,
-            template_data=template_data,
+            subject=email.assunto,
+            text=email.texto,
+            html=email.html,
+            template_data=self._get_reserva_template_data(reserva, usuario, sala),
         )
 
     def notificar_reserva_recorrente_criada(
-        self, reserva: ReservaRecorrente, usuario: Usuario
+        self,
+        reserva: ReservaRecorrente,
+        usuario: Usuario,
+        sala: Optional[SalaSnapshot] = None,
     ) -> None:
         """Envia notificação de nova reserva recorrente criada"""
-        template_data = self._get_reserva_recorrente_template_data(reserva, usuario)
-
-        subject = f"Nova reserva recorrente - {reserva.sala.identificacao_sala}"
-        text = (
-            f"Olá {usuario.nome},\n\n"
-            f"Sua reserva recorrente foi criada com sucesso!\n\n"
-            f"Detalhes da reserva:\n"
-            f"Sala: {reserva.sala.identificacao_sala}\n"
-            f"Bloco: {reserva.sala.bloco.nome}\n"
-            f"Período: {self._format_date(reserva.data_inicio)} a {self._format_date(reserva.data_fim)}\n"
-            f"Horário: {reserva.hora_inicio.strftime('%H:%M')} - {reserva.hora_fim.strftime('%H:%M')}\n"
-            f"Frequência: {reserva.frequencia.value}\n"
-            f"Motivo: {reserva.motivo}\n\n"
-            f"Atenciosamente,\n"
-            f"Sistema de Reserva de Salas"
+        self._notificar_reserva_recorrente(
+            "reserva_recorrente_criada", reserva, usuario, sala
         )
 
-        html = f"""
-        <html>
-            <body>
-                <h2>Nova reserva recorrente criada</h2>
-                <p>Olá {usuario.nome},</p>
-                <p>Sua reserva recorrente foi criada com sucesso!</p>
-                <h3>Detalhes da reserva:</h3>
-                <ul>
-                    <li><strong>Sala:</strong> {reserva.sala.identificacao_sala}</li>
-                    <li><strong>Bloco:</strong> {reserva.sala.bloco.nome}</li>
-                    <li><strong>Período:</strong> {self._format_date(reserva.data_inicio)} a {self._format_date(reserva.data_fim)}</li>
-                    <li><strong>Horário:</strong> {reserva.hora_inicio.strftime("%H:%M")} - {reserva.hora_fim.strftime("%H:%M")}</li>
-                    <li><strong>Frequência:</strong> {reserva.frequencia.value}</li>
-                    <li><strong>Motivo:</strong> {reserva.motivo}</li>
-                </ul>
-                <p>Atenciosamente,<br>Sistema de Reserva de Salas</p>
-            </body>
-        </html>
+    def notificar_reserva_recorrente_atualizada(
+        self,
+        reserva: ReservaRecorrente,
+        usuario: Usuario,
+        sala: Optional[SalaSnapshot] = None,
+    ) -> None:
+        """Envia notificação de reserva recorrente atualizada"""
+        self._notificar_reserva_recorrente(
+            "reserva_recorrente_atualizada", reserva, usuario, sala
+        )
+
+    def notificar_reservas_recriadas(
+        self,
+        reserva: ReservaRecorrente,
+        usuario: Usuario,
+        sala: Optional[SalaSnapshot] = None,
+    ) -> None:
+        """Envia notificação de reservas individuais recriadas"""
+        self._notificar_reserva_recorrente("reservas_recriadas", reserva, usuario, sala)
+
+    def _notificar_reserva_recorrente(
+        self,
+        evento: str,
+        reserva: ReservaRecorrente,
+        usuario: Usuario,
+        sala: Optional[SalaSnapshot],
+    ) -> None:
+        """
+        Enfileira uma notificação de reserva recorrente como agrupável: várias
+        alterações em sequência chegam ao usuário em um único resumo.
         """
+        sala = sala or reserva.sala
+        email = self.email_templates.renderizar(
+            evento, {"reserva": reserva, "usuario": usuario, "sala": sala}
+        )
+        self._enfileirar(
+            to_email=usuario.email,
+            subject=email.assunto,
+            text=email.texto,
+            html=email.html,
+            template_data=self._get_reserva_recorrente_template_data(
+                reserva, usuario, sala
+            ),
+            evento=evento,
+        )
 
+    def notificar_lembrete_reserva(self, reserva: Reserva, usuario: Usuario) -> None:
+        """Envia o lembrete de uma reserva que está para começar"""
+        email = self.email_templates.renderizar(
+            "lembrete_reserva",
+            {"reserva": reserva, "usuario": usuario, "sala": reserva.sala},
+        )
         self.email_client.send_email(
             to_email=usuario.email,
-            subject=subject,
-            text=text,
+            subject=email.assunto,
+            text=email.texto,
+            html=email.html,
+            template_data=self._get_reserva_template_data(
+                reserva, usuario, reserva.sala
+            ),
+        )
+
+    def _enfileirar(
+        self,
+        to_email: str,
+        subject: str,
+        text: str,
+        html: str = None,
+        template_data: Dict[str, Any] = None,
+        evento: Optional[str] = None,
+    ) -> EmailOutbox:
+        """
+        Grava a mensagem na caixa de saída, sem commit: ela é confirmada junto
+        com a operação que a gerou e entregue depois pelo worker.
+
+        Mensagens com `evento` só vencem após a janela de agrupamento, para que
+        as demais notificações do usuário nesse intervalo vão no mesmo resumo.
+        """
+        mensagem = EmailOutbox(
+            destinatario=to_email,
+            assunto=subject,
+            texto=text,
             html=html,
-            template_data=template_data,
+            variaveis=template_data,
+            evento=evento,
+        )
+        if evento is not None and settings.EMAIL_AGRUPAMENTO_MINUTOS > 0:
+            mensagem.proxima_tentativa = DateTimeUtils.now() + timedelta(
+                minutes=settings.EMAIL_AGRUPAMENTO_MINUTOS
+            )
+        return self.email_outbox_repository.adicionar(mensagem)
+
+    def notificar_reservas_do_dia(
+        self, reservas_por_usuario: Iterable[Tuple[Usuario, List[Reserva]]]
+    ) -> Dict[str, ResultadoEnvioEmail]:
+        """Envia a cada usuário o resumo das suas reservas do dia"""
+        hoje = datetime.now()
+        return self.enviar_renderizado_em_lote(
+            "reservas_do_dia",
+            (
+                (usuario.email, {"usuario": usuario, "reservas": reservas, "hoje": hoje})
+                for usuario, reservas in reservas_por_usuario
+            ),
+        )
+
+    def enviar_renderizado_em_lote(
+        self, nome_template: str, contextos: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> Dict[str, ResultadoEnvioEmail]:
+        """
+        Renderiza um template para cada destinatário e envia tudo em lotes
+        do Mailgun. Cada destinatário recebe o email já renderizado nas suas
+        variáveis, então o conteúdo chega escapado e não depende da
+        substituição do Mailgun para dados do usuário.
+
+        Args:
+            nome_template: Nome do template de email
+            contextos: Pares (email do destinatário, contexto do template)
+
+        Returns:
+            Resultado do envio por email do destinatário
+        """
+        destinatarios = (
+            DestinatarioEmail(
+                email=email,
+                variaveis={
+                    "assunto": renderizado.assunto,
+                    "texto": renderizado.texto,
+                    "html": renderizado.html,
+                },
+            )
+            for email, renderizado in self.email_templates.renderizar_lote(
+                nome_template, contextos
+            )
         )
+        return self.enviar_em_lote(MODELO_RENDERIZADO, destinatarios)
+
+    def enviar_agrupado(
+        self, mensagens: Iterable[Tuple[ModeloEmail, DestinatarioEmail]]
+    ) -> Dict[str, ResultadoEnvioEmail]:
+        """
+        Agrupa mensagens que compartilham o mesmo modelo e envia cada grupo
+        em lotes.
+
+        Returns:
+            Resultado do envio por email do destinatário
+        """
+        grupos: Dict[ModeloEmail, List[DestinatarioEmail]] = {}
+        for modelo, destinatario in mensagens:
+            grupos.setdefault(modelo, []).append(destinatario)
+
+        resultados = {}
+        for modelo, destinatarios in grupos.items():
+            resultados.update(self.enviar_em_lote(modelo, destinatarios))
+        return resultados
+
+    def enviar_em_lote(
+        self, modelo: ModeloEmail, destinatarios: Iterable[DestinatarioEmail]
+    ) -> Dict[str, ResultadoEnvioEmail]:
+        """
+        Envia um modelo para vários destinatários, em lotes de até
+        TAMANHO_LOTE_EMAIL destinatários por requisição ao Mailgun. Os lotes
+        também não passam da rajada do limitador de envio, para que as
+        mensagens transacionais possam ser intercaladas entre eles.
+
+        Returns:
+            Resultado do envio por email do destinatário
+        """
+        tamanho_lote = min(TAMANHO_LOTE_EMAIL, settings.EMAIL_LIMITE_RAJADA)
+        resultados = {}
+        lote: List[DestinatarioEmail] = []
+        for destinatario in destinatarios:
+            lote.append(destinatario)
+            if len(lote) >= tamanho_lote:
+                resultados.update(self._enviar_lote(modelo, lote))
+                lote = []
+        if lote:
+            resultados.update(self._enviar_lote(modelo, lote))
+        return resultados
+
+    def _enviar_lote(
+        self, modelo: ModeloEmail, lote: List[DestinatarioEmail]
+    ) -> Dict[str, ResultadoEnvioEmail]:
+        """Envia um único lote; uma falha marca todos os destinatários do lote"""
+        try:
+            resposta = self.email_client.send_batch_emails(
+                recipients={d.email: d.variaveis for d in lote},
+                subject_template=modelo.assunto,
+                text_template=modelo.texto,
+                html_template=modelo.html,
+            )
+        except Exception as e:
+            logger.error(f"Erro ao enviar lote de {len(lote)} emails: {str(e)}")
+            return {
+                d.email: ResultadoEnvioEmail(email=d.email, enviado=False, erro=str(e))
+                for d in lote
+            }
+
+        mensagem_id = resposta.get("id")
+        return {
+            d.email: ResultadoEnvioEmail(
+                email=d.email, enviado=True, mensagem_id=mensagem_id
+            )
+            for d in lote
+        }
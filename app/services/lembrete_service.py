@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+import logging
+import threading
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config.settings import settings
+from app.repository.reserva_repository import ReservaRepository
+from app.services.email_service import EmailService
+from app.util.datetime_utils import DateTimeUtils
+from app.util.timing_wheel import HashedTimingWheel
+
+logger = logging.getLogger(__name__)
+
+
+class LembreteService:
+    """
+    Serviço responsável pelos lembretes "N minutos antes" das reservas.
+
+    Os lembretes da próxima janela são lidos do banco pelo índice de
+    proximo_lembrete e colocados em uma roda de tempo em memória; a cada tick
+    apenas os itens vencidos são processados. O banco continua sendo a fonte
+    da verdade: cada lembrete vencido é conferido de novo antes do envio, então
+    reservas alteradas ou excluídas depois da carga são simplesmente ignoradas.
+    """
+
+    def __init__(self, session_factory: sessionmaker, email_service: EmailService):
+        self.session_factory = session_factory
+        self.email_service = email_service
+        self.roda = HashedTimingWheel(
+            tick_segundos=settings.LEMBRETE_TICK_SEGUNDOS,
+            inicio=self._timestamp(DateTimeUtils.now()),
+        )
+        self._proxima_recarga: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def processar(self) -> int:
+        """
+        Executa um tick: recarrega a janela quando necessário e envia os
+        lembretes vencidos.
+
+        Returns:
+            Quantidade de lembretes enviados
+        """
+        with self._lock:
+            agora = DateTimeUtils.now()
+            if self._proxima_recarga is None or agora >= self._proxima_recarga:
+                self.recarregar(agora)
+            vencidos = self.roda.advance(self._timestamp(agora))
+            if not vencidos:
+                return 0
+            return self._enviar(vencidos, agora)
+
+    def recarregar(self, agora: datetime) -> int:
+        """
+        Carrega na roda os lembretes que vencem até o fim da próxima janela.
+
+        Returns:
+            Quantidade de lembretes carregados
+        """
+        limite = agora + timedelta(minutes=settings.LEMBRETE_JANELA_MINUTOS)
+        with self.session_factory() as session:
+            lembretes = ReservaRepository(session).get_lembretes_ate(limite)
+
+        for reserva_id, proximo_lembrete in lembretes:
+            self.roda.add(reserva_id, self._timestamp(proximo_lembrete))
+        self._proxima_recarga = agora + timedelta(
+            seconds=settings.LEMBRETE_RECARGA_SEGUNDOS
+        )
+        return len(lembretes)
+
+    def _enviar(self, reserva_ids: List[UUID], agora: datetime) -> int:
+        """Envia os lembretes que continuam vencidos e os marca como enviados"""
+        enviados = 0
+        with self.session_factory() as session:
+            try:
+                reservas = ReservaRepository(session).get_lembretes_vencidos(
+                    reserva_ids, agora
+                )
+                for reserva in reservas:
+                    try:
+                        self.email_service.notificar_lembrete_reserva(
+                            reserva, reserva.usuario
+                        )
+                        enviados += 1
+                    except Exception as e:
+                        logger.error(
+                            f"Erro ao enviar lembrete da reserva {reserva.id}: {str(e)}"
+                        )
+                    # Não reenvia em caso de erro, evitando repetir o lembrete
+                    reserva.proximo_lembrete = None
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Erro ao processar lembretes: {str(e)}")
+                raise
+
+        if enviados:
+            logger.info(f"{enviados} lembretes de reserva enviados")
+        return enviados
+
+    def _timestamp(self, instante: datetime) -> float:
+        """Converte para timestamp, ignorando o timezone como o resto da aplicação"""
+        return instante.replace(tzinfo=None).timestamp()
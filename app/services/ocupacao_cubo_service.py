@@ -0,0 +1,159 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.orm import sessionmaker
+import logging
+
+from app.core.commons.exceptions import ValidationException
+from app.model.semestre_model import Semestre
+from app.repository.ocupacao_cubo_repository import (
+    OcupacaoCuboRepository,
+    DIMENSOES_CUBO,
+    CHAVE_CELULA,
+)
+from app.schema.relatorio_schema import OcupacaoCuboFiltros, OcupacaoCuboResponse
+
+logger = logging.getLogger(__name__)
+
+MARCA_CUBO = "ocupacao_cubo"
+
+# Margem de segurança para transações que confirmaram fora de ordem.
+# Reprocessar uma reserva é idempotente, então a sobreposição é segura.
+MARGEM_MARCA = timedelta(minutes=5)
+
+
+class OcupacaoCuboService:
+    """Serviço responsável pela manutenção e consulta do cubo de ocupação"""
+
+    def __init__(
+        self,
+        ocupacao_cubo_repository: OcupacaoCuboRepository,
+        session_factory: sessionmaker,
+    ):
+        self.ocupacao_cubo_repository = ocupacao_cubo_repository
+        self.session_factory = session_factory
+
+    def fatiar(
+        self, dimensoes: List[str], filtros: OcupacaoCuboFiltros
+    ) -> List[OcupacaoCuboResponse]:
+        """Agrega o cubo pelas dimensões informadas, aplicando os filtros"""
+        invalidas = [nome for nome in dimensoes if nome not in DIMENSOES_CUBO]
+        if invalidas:
+            raise ValidationException(
+                f"Dimensões inválidas: {', '.join(invalidas)}. "
+                f"Permitidas: {', '.join(DIMENSOES_CUBO)}"
+            )
+
+        # Remove duplicadas mantendo a ordem
+        dimensoes = list(dict.fromkeys(dimensoes))
+        linhas = self.ocupacao_cubo_repository.agregar(
+            dimensoes, filtros.model_dump(exclude_none=True)
+        )
+        return [OcupacaoCuboResponse(**linha) for linha in linhas]
+
+    def atualizar_incremental(self) -> int:
+        """
+        Atualiza o cubo com as reservas alteradas desde a última execução.
+
+        Returns:
+            Quantidade de reservas reprocessadas
+        """
+        with self.session_factory() as session:
+            repository = OcupacaoCuboRepository(session)
+            try:
+                marca = repository.get_marca(MARCA_CUBO)
+                desde = marca - MARGEM_MARCA if marca else None
+                semestres = session.query(Semestre).all()
+
+                # Lê a fila antes das alterações: uma reserva apagada depois
+                # desta leitura entra na fila e é tratada na próxima execução
+                removidas = repository.get_reservas_removidas()
+                alteradas = repository.get_reservas_alteradas(desde)
+                if not alteradas and not removidas:
+                    return 0
+
+                reserva_ids = {reserva.id for reserva in alteradas} | set(removidas)
+                deltas: Dict[Tuple, List[int]] = defaultdict(lambda: [0, 0])
+
+                # Remove a contribuição antiga das reservas alteradas ou apagadas
+                antigos = repository.get_fatos_por_reservas(reserva_ids)
+                for fato in antigos:
+                    delta = deltas[tuple(getattr(fato, nome) for nome in CHAVE_CELULA)]
+                    delta[0] -= 1
+                    delta[1] -= fato.minutos
+                repository.delete_fatos(reserva_ids)
+                repository.delete_remocoes(removidas)
+
+                # Soma a contribuição atual das reservas ativas
+                novos = []
+                for reserva in alteradas:
+                    if reserva.excluido_em is not None:
+                        continue
+                    for fato in self._gerar_fatos(reserva, semestres):
+                        delta = deltas[tuple(fato[nome] for nome in CHAVE_CELULA)]
+                        delta[0] += 1
+                        delta[1] += fato["minutos"]
+                        novos.append(fato)
+                repository.insert_fatos(novos)
+
+                repository.aplicar_deltas(
+                    {chave: tuple(valor) for chave, valor in deltas.items()}
+                )
+
+                candidatos = [r.atualizado_em for r in alteradas] + [
+                    r.excluido_em for r in alteradas if r.excluido_em
+                ]
+                if marca:
+                    candidatos.append(marca)
+                if candidatos:
+                    repository.set_marca(MARCA_CUBO, max(candidatos))
+
+                session.commit()
+                logger.info(
+                    f"Cubo de ocupação atualizado: {len(alteradas)} reservas, "
+                    f"{len(removidas)} reservas removidas"
+                )
+                return len(alteradas)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Erro ao atualizar cubo de ocupação: {str(e)}")
+                raise
+
+    def _gerar_fatos(self, reserva: Any, semestres: List[Semestre]) -> List[Dict[str, Any]]:
+        """Divide uma reserva em faixas de uma hora, uma linha por faixa"""
+        fatos = []
+        inicio_faixa = reserva.inicio.replace(minute=0, second=0, microsecond=0)
+        while inicio_faixa < reserva.fim:
+            fim_faixa = inicio_faixa + timedelta(hours=1)
+            minutos = int(
+                (min(fim_faixa, reserva.fim) - max(inicio_faixa, reserva.inicio))
+                .total_seconds()
+                // 60
+            )
+            if minutos > 0:
+                fatos.append(
+                    {
+                        "reserva_id": reserva.id,
+                        "data": inicio_faixa,
+                        "semestre": self._identificar_semestre(
+                            inicio_faixa, semestres
+                        ),
+                        "bloco_id": reserva.bloco_id,
+                        "sala_id": reserva.sala_id,
+                        "curso": reserva.curso or "",
+                        "dia_semana": inicio_faixa.weekday(),
+                        "hora": inicio_faixa.hour,
+                        "minutos": minutos,
+                    }
+                )
+            inicio_faixa = fim_faixa
+        return fatos
+
+    def _identificar_semestre(
+        self, data: datetime, semestres: List[Semestre]
+    ) -> str:
+        """Retorna o identificador do semestre que contém a data, ou vazio"""
+        for semestre in semestres:
+            if semestre.data_inicio <= data.date() <= semestre.data_fim:
+                return semestre.identificador
+        return ""
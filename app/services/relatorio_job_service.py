@@ -0,0 +1,273 @@
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Tuple, Type
+from uuid import UUID
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.commons.exceptions import (
+    BusinessException,
+    NotFoundException,
+    UnauthorizedException,
+    ValidationException,
+)
+from app.core.config.settings import settings
+from app.core.database.query_fanout import QueryFanOut
+from app.model.relatorio_job_model import (
+    RelatorioJob,
+    StatusRelatorioJob,
+    FormatoRelatorio,
+)
+from app.repository.relatorio_job_repository import RelatorioJobRepository
+from app.repository.reserva_repository import ReservaRepository
+from app.repository.sala_repository import SalaRepository
+from app.repository.usuario_repository import UsuarioRepository
+from app.schema.auth_schema import UsuarioPrincipal
+from app.schema.relatorio_schema import (
+    TipoRelatorio,
+    RelatorioJobCreate,
+    ParametrosRelatorioVazio,
+    ParametrosRelatorioPeriodo,
+    ParametrosRelatorioPeriodoSala,
+    ParametrosRelatorioData,
+    ParametrosRelatorioUsoSalas,
+)
+from app.services.relatorio_service import RelatorioService
+from app.util.datetime_utils import DateTimeUtils
+
+logger = logging.getLogger(__name__)
+
+# Tipo do relatório -> (schema dos parâmetros, função que gera o relatório)
+RELATORIOS: Dict[
+    TipoRelatorio, Tuple[Type[BaseModel], Callable[[RelatorioService, Any], Any]]
+] = {
+    TipoRelatorio.DASHBOARD: (
+        ParametrosRelatorioVazio,
+        lambda service, p: service.get_dashboard_stats(),
+    ),
+    TipoRelatorio.RESERVAS_POR_SALA: (
+        ParametrosRelatorioPeriodo,
+        lambda service, p: service.get_reservas_por_sala(p.data_inicio, p.data_fim),
+    ),
+    TipoRelatorio.RESERVAS_POR_USUARIO: (
+        ParametrosRelatorioPeriodo,
+        lambda service, p: service.get_reservas_por_usuario(
+            p.data_inicio, p.data_fim
+        ),
+    ),
+    TipoRelatorio.RESERVAS_POR_PERIODO: (
+        ParametrosRelatorioPeriodoSala,
+        lambda service, p: service.get_reservas_por_periodo(
+            p.sala_id, p.data_inicio, p.data_fim
+        ),
+    ),
+    TipoRelatorio.OCUPACAO_POR_SALA: (
+        ParametrosRelatorioData,
+        lambda service, p: service.get_ocupacao_por_sala(p.data),
+    ),
+    TipoRelatorio.USO_SALAS: (
+        ParametrosRelatorioUsoSalas,
+        lambda service, p: service.gerar_relatorio_uso_salas(
+            p.data_inicio, p.data_fim
+        ),
+    ),
+}
+
+# Relatórios que só super usuários podem solicitar e baixar
+RELATORIOS_RESTRITOS = {TipoRelatorio.USO_SALAS}
+
+
+class RelatorioJobService:
+    """Serviço responsável pelos relatórios processados em segundo plano"""
+
+    def __init__(
+        self,
+        relatorio_job_repository: RelatorioJobRepository,
+        session_factory: sessionmaker,
+        query_fanout: QueryFanOut,
+    ):
+        self.relatorio_job_repository = relatorio_job_repository
+        self.session_factory = session_factory
+        self.query_fanout = query_fanout
+
+    def enfileirar(
+        self, dados: RelatorioJobCreate, usuario: UsuarioPrincipal
+    ) -> RelatorioJob:
+        """
+        Enfileira um relatório para processamento.
+        Se já existir um job com os mesmos parâmetros em andamento ou concluído
+        recentemente, que o usuário possa ler, ele é reaproveitado.
+        """
+        if dados.tipo in RELATORIOS_RESTRITOS and not usuario.super_user:
+            raise UnauthorizedException("Acesso negado: privilégios insuficientes")
+
+        schema, _ = RELATORIOS[dados.tipo]
+        try:
+            parametros = schema(**dados.parametros).model_dump(mode="json")
+        except ValidationError as e:
+            raise ValidationException(f"Parâmetros inválidos para o relatório: {e}")
+
+        parametros_hash = self._gerar_hash(dados.tipo, parametros, dados.formato)
+        validade = DateTimeUtils.now() - timedelta(
+            minutes=settings.RELATORIO_JOB_VALIDADE_MINUTOS
+        )
+        # Super usuários leem qualquer job; os demais, apenas os seus
+        existente = self.relatorio_job_repository.get_reaproveitavel(
+            parametros_hash,
+            validade,
+            solicitado_por_id=None if usuario.super_user else usuario.id,
+        )
+        if existente:
+            return existente
+
+        job = RelatorioJob(
+            tipo=dados.tipo.value,
+            parametros=parametros,
+            parametros_hash=parametros_hash,
+            formato=dados.formato,
+            status=StatusRelatorioJob.PENDENTE,
+            solicitado_por_id=usuario.id,
+        )
+        return self.relatorio_job_repository.save(job)
+
+    def get_by_id(self, job_id: UUID, usuario: UsuarioPrincipal) -> RelatorioJob:
+        """
+        Busca um job pelo ID. Jobs de outros usuários só são visíveis para
+        super usuários; para os demais, não existem.
+        """
+        try:
+            job = self.relatorio_job_repository.get_by_id(job_id)
+        except NotFoundException:
+            job = None
+        if not job or not self._pode_ler(job, usuario):
+            raise NotFoundException(f"Relatório com ID {job_id} não encontrado")
+        return job
+
+    def get_resultado(
+        self, job_id: UUID, usuario: UsuarioPrincipal
+    ) -> Tuple[RelatorioJob, bytes]:
+        """Retorna o job e o resultado comprimido com gzip"""
+        job = self.get_by_id(job_id, usuario)
+        if job.status != StatusRelatorioJob.CONCLUIDO:
+            raise BusinessException(
+                f"Relatório ainda não está disponível (status: {job.status.value})"
+            )
+        return job, job.resultado
+
+    def _pode_ler(self, job: RelatorioJob, usuario: UsuarioPrincipal) -> bool:
+        """Dono do job ou super usuário; relatórios restritos, só super usuário"""
+        if usuario.super_user:
+            return True
+        return (
+            job.solicitado_por_id == usuario.id
+            and TipoRelatorio(job.tipo) not in RELATORIOS_RESTRITOS
+        )
+
+    def processar_pendentes(self, limite: int = 10) -> int:
+        """
+        Processa os jobs pendentes, um por vez, cada um em sua própria sessão.
+
+        Returns:
+            Quantidade de jobs processados
+        """
+        processados = 0
+        while processados < limite:
+            job_id = self._reservar_proximo()
+            if job_id is None:
+                break
+            self._processar(job_id)
+            processados += 1
+        return processados
+
+    def _reservar_proximo(self):
+        """Marca o próximo job pendente como em processamento"""
+        with self.session_factory() as session:
+            repository = RelatorioJobRepository(session)
+            travado_antes_de = DateTimeUtils.now() - timedelta(
+                minutes=settings.RELATORIO_JOB_TIMEOUT_MINUTOS
+            )
+            job = repository.reservar_proximo(travado_antes_de)
+            if job is None:
+                session.rollback()
+                return None
+            job.status = StatusRelatorioJob.PROCESSANDO
+            job.iniciado_em = DateTimeUtils.now()
+            session.commit()
+            return job.id
+
+    def _processar(self, job_id: UUID) -> None:
+        """Gera o relatório de um job e armazena o resultado"""
+        with self.session_factory() as session:
+            job = session.get(RelatorioJob, job_id)
+            try:
+                schema, gerar = RELATORIOS[TipoRelatorio(job.tipo)]
+                relatorio_service = RelatorioService(
+                    reserva_repository=ReservaRepository(session),
+                    sala_repository=SalaRepository(session),
+                    usuario_repository=UsuarioRepository(session),
+                    query_fanout=self.query_fanout,
+                )
+                resultado = jsonable_encoder(
+                    gerar(relatorio_service, schema(**job.parametros))
+                )
+                job.resultado = gzip.compress(self._serializar(resultado, job.formato))
+                job.status = StatusRelatorioJob.CONCLUIDO
+                job.erro = None
+                logger.info(f"Relatório {job.id} ({job.tipo}) concluído")
+            except Exception as e:
+                session.rollback()
+                job = session.get(RelatorioJob, job_id)
+                job.status = StatusRelatorioJob.ERRO
+                job.erro = str(e)
+                logger.error(f"Erro ao processar relatório {job_id}: {str(e)}")
+            job.concluido_em = DateTimeUtils.now()
+            session.commit()
+
+    def _serializar(self, resultado: Any, formato: FormatoRelatorio) -> bytes:
+        """Serializa o resultado em JSON ou CSV"""
+        if formato == FormatoRelatorio.JSON:
+            return json.dumps(resultado, ensure_ascii=False).encode("utf-8")
+
+        linhas = resultado if isinstance(resultado, list) else [resultado]
+        linhas = [self._achatar(linha) for linha in linhas]
+        colunas: List[str] = []
+        for linha in linhas:
+            colunas.extend(c for c in linha if c not in colunas)
+
+        saida = io.StringIO()
+        writer = csv.DictWriter(saida, fieldnames=colunas)
+        writer.writeheader()
+        writer.writerows(linhas)
+        return saida.getvalue().encode("utf-8")
+
+    def _achatar(self, valor: Any, prefixo: str = "") -> Dict[str, Any]:
+        """Achata dicionários aninhados em colunas 'a.b'; listas viram JSON"""
+        if not isinstance(valor, dict):
+            return {prefixo or "valor": valor}
+        linha = {}
+        for chave, item in valor.items():
+            nome = f"{prefixo}.{chave}" if prefixo else str(chave)
+            if isinstance(item, dict):
+                linha.update(self._achatar(item, nome))
+            elif isinstance(item, list):
+                linha[nome] = json.dumps(item, ensure_ascii=False)
+            else:
+                linha[nome] = item
+        return linha
+
+    def _gerar_hash(
+        self, tipo: TipoRelatorio, parametros: Dict[str, Any], formato: FormatoRelatorio
+    ) -> str:
+        """Gera o hash que identifica relatórios com os mesmos parâmetros"""
+        chave = json.dumps(
+            {"tipo": tipo.value, "parametros": parametros, "formato": formato.value},
+            sort_keys=True,
+        )
+        return hashlib.sha256(chave.encode("utf-8")).hexdigest()
@@ -1,5 +1,8 @@
 from datetime import datetime, date, timedelta
-from typing import List
+from typing import Any, Callable, List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache.response_cache import ResponseCache, cached_response
+from app.core.database.query_fanout import QueryFanOut
 from app.repository.reserva_repository import ReservaRepository
 from app.repository.sala_repository import SalaRepository
 from app.repository.usuario_repository import UsuarioRepository
@@ -22,49 +25,79 @@ class RelatorioService:
         reserva_repository: ReservaRepository,
         sala_repository: SalaRepository,
         usuario_repository: UsuarioRepository,
+        query_fanout: QueryFanOut,
+        cache: Optional[ResponseCache] = None,
+        session_factory: Optional[sessionmaker] = None,
     ):
         self.reserva_repository = reserva_repository
         self.sala_repository = sala_repository
         self.usuario_repository = usuario_repository
+        self.query_fanout = query_fanout
+        self.cache = cache
+        self.session_factory = session_factory
 
+    def em_sessao_propria(self, metodo: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa `metodo` (ex.: RelatorioService.get_reservas_por_sala) em uma
+        cópia do serviço, com o mesmo cache, ligada a uma sessão exclusiva
+        que é fechada ao final. Permite gerar relatórios em threads
+        diferentes sem compartilhar a sessão da requisição.
+        """
+        with self.session_factory() as session:
+            return metodo(self._em_sessao(session, cache=self.cache), *args)
+
+    def _em_sessao(
+        self, session: Session, cache: Optional[ResponseCache] = None
+    ) -> "RelatorioService":
+        """Cria uma cópia do serviço ligada a uma sessão exclusiva"""
+        return RelatorioService(
+            reserva_repository=ReservaRepository(session),
+            sala_repository=SalaRepository(session),
+            usuario_repository=UsuarioRepository(session),
+            query_fanout=self.query_fanout,
+            cache=cache,
+        )
+
+    @cached_response
     def get_dashboard_stats(self) -> DashboardStatsResponse:
         """Retorna estatísticas gerais para o dashboard"""
         try:
             hoje = date.today()
             inicio_semana = hoje - timedelta(days=hoje.weekday())
             inicio_mes = hoje.replace(day=1)
-
-            # Totais gerais
-            total_reservas = self.reserva_repository.count_all()
-            total_salas = self.sala_repository.count_all()
-            total_usuarios = self.usuario_repository.count_all()
-
-            # Reservas por período
-            reservas_hoje = self.reserva_repository.count_by_date(hoje)
-            reservas_semana = self.reserva_repository.count_by_date_range(inicio_semana, hoje)
-            reservas_mes = self.reserva_repository.count_by_date_range(inicio_mes, hoje)
-
-            # Top 5 salas mais ocupadas
-            salas_mais_ocupadas = self._get_salas_mais_ocupadas(hoje - timedelta(days=30), hoje)
-
-            # Top 5 usuários mais ativos
-            usuarios_mais_ativos = self._get_usuarios_mais_ativos(hoje - timedelta(days=30), hoje)
-
-            return DashboardStatsResponse(
-                total_reservas=total_reservas,
-                total_salas=total_salas,
-                total_usuarios=total_usuarios,
-                reservas_hoje=reservas_hoje,
-                reservas_semana=reservas_semana,
-                reservas_mes=reservas_mes,
-                salas_mais_ocupadas=salas_mais_ocupadas,
-                usuarios_mais_ativos=usuarios_mais_ativos,
+            inicio_ranking = hoje - timedelta(days=30)
+
+            # Consultas independentes, executadas em paralelo
+            resultados = self.query_fanout.run(
+                {
+                    "total_reservas": lambda s: ReservaRepository(s).count_all(),
+                    "total_salas": lambda s: SalaRepository(s).count_all(),
+                    "total_usuarios": lambda s: UsuarioRepository(s).count_all(),
+                    "reservas_hoje": lambda s: ReservaRepository(s).count_by_date(hoje),
+                    "reservas_semana": lambda s: ReservaRepository(
+                        s
+                    ).count_by_date_range(inicio_semana, hoje),
+                    "reservas_mes": lambda s: ReservaRepository(s).count_by_date_range(
+                        inicio_mes, hoje
+                    ),
+                    # Top 5 salas mais ocupadas
+                    "salas_mais_ocupadas": lambda s: self._em_sessao(
+                        s
+                    )._get_salas_mais_ocupadas(inicio_ranking, hoje),
+                    # Top 5 usuários mais ativos
+                    "usuarios_mais_ativos": lambda s: self._em_sessao(
+                        s
+                    )._get_usuarios_mais_ativos(inicio_ranking, hoje),
+                }
             )
 
+            return DashboardStatsResponse(**resultados)
+
         except Exception as e:
             logger.error(f"Erro ao gerar estatísticas do dashboard: {str(e)}")
             raise
 
+    @cached_response
     def get_reservas_por_sala(
         self, data_inicio: date, data_fim: date
     ) -> List[ReservasPorSalaResponse]:
@@ -92,6 +125,7 @@ class RelatorioService:
             logger.error(f"Erro ao gerar relatório de reservas por sala: {str(e)}")
             raise
 
+    @cached_response
     def get_reservas_por_usuario(
         self, data_inicio: date, data_fim: date
     ) -> List[ReservasPorUsuarioResponse]:
@@ -119,6 +153,7 @@ class RelatorioService:
             logger.error(f"Erro ao gerar relatório de reservas por usuário: {str(e)}")
             raise
 
+    @cached_response
     def get_reservas_por_periodo(
         self, sala_id: str, data_inicio: date, data_fim: date
     ) -> List[ReservasPorPeriodoResponse]:
@@ -150,6 +185,7 @@ class RelatorioService:
             logger.error(f"Erro ao gerar relatório de reservas por período: {str(e)}")
             raise
 
+    @cached_response
     def get_ocupacao_por_sala(self, data: date) -> List[OcupacaoPorSalaResponse]:
         """Retorna taxa de ocupação por sala em uma data específica"""
         try:
@@ -202,6 +238,7 @@ class RelatorioService:
         usuarios = self.get_reservas_por_usuario(data_inicio, data_fim)
         return sorted(usuarios, key=lambda x: x.quantidade, reverse=True)[:limit]
 
+    @cached_response
     def gerar_relatorio_uso_salas(
         self, data_inicio: datetime, data_fim: datetime
     ) -> dict:
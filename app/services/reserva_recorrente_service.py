@@ -1,7 +1,6 @@
 from uuid import UUID
 from datetime import date, time, timedelta, datetime
-from typing import List, Optional, Union
-import holidays
+from typing import List, Mapping, Optional, Union
 
 from app.repository.reserva_repository import ReservaRepository
 from app.repository.reserva_recorrente_repository import ReservaRecorrenteRepository
@@ -20,13 +19,17 @@ from app.schema.reserva_schema import (
     ReservaRecorrenteSemestreCreate,
 )
 from app.util.datetime_utils import DateTimeUtils
+from app.core.cache.invalidation_bus import RESERVAS, InvalidationBus
+from app.core.cache.reference_cache import ReferenceDataCache
+from app.core.cache.version_counter import VersionCounter
+from app.core.config.settings import settings
 from app.schema.reserva_schema import FrequenciaRecorrencia
 from app.services.email_service import EmailService
 from app.repository.sala_repository import SalaRepository
 from app.repository.usuario_repository import UsuarioRepository
 from app.services.auditoria_service import AuditoriaService
 from app.services.semestre_service import SemestreService
-from app.model.sala_model import Sala
+from app.schema.referencia_schema import SalaSnapshot
 
 
 class ReservaRecorrenteService:
@@ -41,6 +44,9 @@ class ReservaRecorrenteService:
         email_service: EmailService,
         auditoria_service: AuditoriaService,
         semestre_service: SemestreService,
+        reservas_version: VersionCounter,
+        referencia_cache: ReferenceDataCache,
+        invalidation_bus: InvalidationBus,
     ):
         self.reserva_repository = reserva_repository
         self.reserva_recorrente_repository = reserva_recorrente_repository
@@ -49,7 +55,14 @@ class ReservaRecorrenteService:
         self.email_service = email_service
         self.auditoria_service = auditoria_service
         self.semestre_service = semestre_service
-        self.feriados = holidays.BR()
+        self.reservas_version = reservas_version
+        self.referencia_cache = referencia_cache
+        self.invalidation_bus = invalidation_bus
+
+    @property
+    def feriados(self) -> Mapping[date, str]:
+        """Feriados nacionais, do snapshot de referência"""
+        return self.referencia_cache.feriados()
 
     def get_by_id(self, reserva_id: UUID) -> ReservaRecorrente:
         """Busca uma reserva recorrente pelo ID"""
@@ -111,9 +124,18 @@ class ReservaRecorrenteService:
             self._validar_feriados(create_data)
 
         # Atualiza a reserva recorrente
+        self._publicar_alteracao(reserva_id)
         reserva_atualizada = self.reserva_recorrente_repository.update(
             reserva_id, reserva_data
         )
+        self.reservas_version.bump()
+
+        # Gravada junto com a auditoria; edições em sequência viram um resumo
+        self.email_service.notificar_reserva_recorrente_atualizada(
+            reserva_atualizada,
+            reserva_atualizada.usuario,
+            self.referencia_cache.get_sala(reserva_atualizada.sala_id),
+        )
 
         # Registra a auditoria
         self.auditoria_service.registrar_auditoria(
@@ -141,7 +163,9 @@ class ReservaRecorrenteService:
         self.reserva_recorrente_repository.update(reserva_id, reserva)
 
         # Soft delete das reservas individuais
+        self._publicar_alteracao(reserva_id)
         self.reserva_repository.soft_delete_reservas_recorrentes(reserva_id, usuario_id)
+        self.reservas_version.bump()
 
         # Registra a auditoria
         self.auditoria_service.registrar_auditoria(
@@ -168,8 +192,15 @@ class ReservaRecorrenteService:
             reserva_id, reserva.usuario_id
         )
 
+        # A notificação é gravada junto com as reservas recriadas
+        self.email_service.notificar_reservas_recriadas(
+            reserva, reserva.usuario, self.referencia_cache.get_sala(reserva.sala_id)
+        )
+
         # Recriar as reservas
+        self._publicar_alteracao(reserva_id)
         self._gerar_reservas_individuais(reserva)
+        self.reservas_version.bump()
 
         # Registra a auditoria
         self.auditoria_service.registrar_auditoria(
@@ -278,6 +309,7 @@ class ReservaRecorrenteService:
         if not reserva_data.excecoes:
             reserva_data.excecoes = []
 
+        feriados = self.feriados
         data_atual = data_inicio
         while data_atual <= data_fim:
             # Para frequência diária, verifica todos os dias
@@ -287,9 +319,9 @@ class ReservaRecorrenteService:
                 and data_atual.weekday() in reserva_data.dia_da_semana
             ):
                 # Verifica se é feriado
-                if data_atual in self.feriados:
+                if data_atual in feriados:
                     print(
-                        f"A data {data_atual.strftime('%d/%m/%Y')} é um feriado nacional: {self.feriados[data_atual]}"
+                        f"A data {data_atual.strftime('%d/%m/%Y')} é um feriado nacional: {feriados[data_atual]}"
                     )
                     reserva_data.excecoes.append(data_atual)
             data_atual = data_atual + timedelta(days=1)
@@ -304,6 +336,7 @@ class ReservaRecorrenteService:
         data_atual = reserva_recorrente.data_inicio
         lote_reservas = []
         TAMANHO_LOTE = 500
+        feriados = self.feriados
 
         while data_atual <= reserva_recorrente.data_fim:
             deve_criar = False
@@ -320,7 +353,7 @@ class ReservaRecorrenteService:
             if (
                 deve_criar
                 and data_atual not in reserva_recorrente.excecoes
-                and data_atual not in self.feriados
+                and data_atual not in feriados
             ):
                 inicio = datetime.combine(data_atual, reserva_recorrente.hora_inicio)
                 fim = datetime.combine(data_atual, reserva_recorrente.hora_fim)
@@ -333,6 +366,7 @@ class ReservaRecorrenteService:
                     motivo=reserva_recorrente.motivo,
                     reserva_recorrente_id=reserva_recorrente.id,
                 )
+                reserva.agendar_lembrete(settings.LEMBRETE_MINUTOS_ANTES)
                 lote_reservas.append(reserva)
 
                 if len(lote_reservas) >= TAMANHO_LOTE:
@@ -383,9 +417,18 @@ class ReservaRecorrenteService:
             # Para frequência diária, não é necessário validar dias da semana
             pass
 
+    def _publicar_alteracao(self, reserva_id: UUID) -> None:
+        """
+        Avisa os outros processos que as reservas mudaram. Chamado antes do
+        último commit da operação, para que a notificação vá junto com ele.
+        """
+        self.invalidation_bus.publicar(
+            self.reserva_recorrente_repository.session, RESERVAS, reserva_id
+        )
+
     def _gerar_identificacao(
         self, 
-        sala: Sala, 
+        sala: SalaSnapshot, 
         reserva_data: Union[ReservaRecorrenteRegularCreate, ReservaRecorrenteSemestreCreate]
     ) -> str:
         """Gera a identificação da reserva recorrente
@@ -414,8 +457,8 @@ class ReservaRecorrenteService:
         self, reserva_data: ReservaRecorrenteRegularCreate, usuario_id: UUID, curso_usuario: str
     ) -> ReservaRecorrente:
         """Cria uma nova reserva recorrente regular e gera as reservas individuais"""
-        # Busca a sala
-        sala = self.sala_repository.get_by_id(reserva_data.sala_id)
+        # Busca a sala no cache de referência
+        sala = self.referencia_cache.get_sala(reserva_data.sala_id)
         if not sala:
             raise NotFoundException(
                 f"Sala com ID {reserva_data.sala_id} não encontrada"
@@ -444,24 +487,24 @@ class ReservaRecorrenteService:
         # Criar a reserva recorrente
         reserva_recorrente = ReservaRecorrente(**reserva_data.model_dump())
 
-
+        # A notificação vai para a caixa de saída e é gravada junto com a reserva
+        self.email_service.notificar_reserva_recorrente_criada(
+            reserva_recorrente, usuario, sala
+        )
         reserva_recorrente = self.reserva_recorrente_repository.save(reserva_recorrente)
 
         # Gerar as reservas individuais
+        self._publicar_alteracao(reserva_recorrente.id)
         self._gerar_reservas_individuais(reserva_recorrente)
-
-        # Envia notificações
-        self.email_service.notificar_reserva_recorrente_criada(
-            reserva_recorrente, usuario
-        )
+        self.reservas_version.bump()
         return reserva_recorrente
 
     def create_semestre(
         self, reserva_data: ReservaRecorrenteSemestreCreate, usuario_id: UUID, curso_usuario: str
     ) -> ReservaRecorrente:
         """Cria uma nova reserva recorrente baseada em um semestre"""
-        # Busca a sala
-        sala = self.sala_repository.get_by_id(reserva_data.sala_id)
+        # Busca a sala no cache de referência
+        sala = self.referencia_cache.get_sala(reserva_data.sala_id)
         if not sala:
             raise NotFoundException(
                 f"Sala com ID {reserva_data.sala_id} não encontrada"
@@ -498,15 +541,16 @@ class ReservaRecorrenteService:
         reserva_recorrente.data_fim = semestre.data_fim
         reserva_recorrente.semestre = semestre.identificador
 
+        # A notificação vai para a caixa de saída e é gravada junto com a reserva
+        self.email_service.notificar_reserva_recorrente_criada(
+            reserva_recorrente, usuario, sala
+        )
         reserva_recorrente = self.reserva_recorrente_repository.save(reserva_recorrente)
 
         # Gerar as reservas individuais
+        self._publicar_alteracao(reserva_recorrente.id)
         self._gerar_reservas_individuais(reserva_recorrente)
-
-        # Envia notificações
-        self.email_service.notificar_reserva_recorrente_criada(
-            reserva_recorrente, usuario
-        )
+        self.reservas_version.bump()
 
         # Registra a auditoria
         # self.auditoria_service.registrar_auditoria(
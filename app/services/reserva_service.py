@@ -6,6 +6,10 @@ from app.repository.reserva_repository import ReservaRepository
 from app.repository.sala_repository import SalaRepository
 from app.repository.usuario_repository import UsuarioRepository
 from app.core.commons.exceptions import NotFoundException, BusinessException
+from app.core.cache.invalidation_bus import RESERVAS, InvalidationBus
+from app.core.cache.reference_cache import ReferenceDataCache
+from app.core.cache.version_counter import VersionCounter
+from app.core.config.settings import settings
 from app.util.datetime_utils import DateTimeUtils
 from app.model.reserva_model import Reserva
 from app.model.reserva_recorrente_model import ReservaRecorrente
@@ -30,12 +34,18 @@ class ReservaService:
         usuario_repository: UsuarioRepository,
         email_service: EmailService,
         auditoria_service: AuditoriaService,
+        reservas_version: VersionCounter,
+        referencia_cache: ReferenceDataCache,
+        invalidation_bus: InvalidationBus,
     ):
         self.reserva_repository = reserva_repository
         self.sala_repository = sala_repository
         self.usuario_repository = usuario_repository
         self.email_service = email_service
         self.auditoria_service = auditoria_service
+        self.reservas_version = reservas_version
+        self.referencia_cache = referencia_cache
+        self.invalidation_bus = invalidation_bus
 
     def get_by_id(self, reserva_id: UUID) -> Reserva:
         """Busca uma reserva pelo ID"""
@@ -46,8 +56,8 @@ class ReservaService:
 
     def create(self, reserva_data: ReservaCreate, usuario_id: UUID, curso_usuario: str) -> Reserva:
         """Cria uma nova reserva"""
-        # Busca a sala
-        sala = self.sala_repository.get_by_id(reserva_data.sala_id)
+        # Busca a sala no cache de referência
+        sala = self.referencia_cache.get_sala(reserva_data.sala_id)
         if not sala:
             raise NotFoundException(
                 f"Sala com ID {reserva_data.sala_id} não encontrada"
@@ -75,7 +85,13 @@ class ReservaService:
         # Cria a reserva
         reserva = Reserva(**reserva_data.model_dump())
         reserva.usuario_id = usuario_id
+        reserva.agendar_lembrete(settings.LEMBRETE_MINUTOS_ANTES)
+
+        # A notificação vai para a caixa de saída e é gravada junto com a reserva
+        self.email_service.notificar_reserva_criada(reserva, usuario, sala)
+        self._publicar_alteracao(reserva.id)
         reserva = self.reserva_repository.save(reserva)
+        self.reservas_version.bump()
 
         # Registra a auditoria
         # self.auditoria_service.registrar_criacao_reserva(
@@ -85,9 +101,6 @@ class ReservaService:
         #     ip_address="",
         # )
 
-        # Envia notificações
-        self.email_service.notificar_reserva_criada(reserva, usuario)
-
         return reserva
 
     def update(
@@ -114,8 +127,14 @@ class ReservaService:
             # Verifica conflitos com a nova data/hora
             self._verificar_conflitos(reserva_data, reserva_id)
 
-        # Atualiza a reserva
+        # Atualiza a reserva; a notificação é gravada na mesma transação
+        reserva.agendar_lembrete(settings.LEMBRETE_MINUTOS_ANTES)
+        usuario = self.usuario_repository.get_by_id(usuario_id)
+        sala = self.referencia_cache.get_sala(reserva.sala_id)
+        self.email_service.notificar_reserva_criada(reserva, usuario, sala)
+        self._publicar_alteracao(reserva.id)
         reserva = self.reserva_repository.save(reserva)
+        self.reservas_version.bump()
 
         # Registra a auditoria
         # self.auditoria_service.registrar_atualizacao_reserva(
@@ -126,10 +145,6 @@ class ReservaService:
         #     ip_address="",
         # )
 
-        # Envia notificações
-        usuario = self.usuario_repository.get_by_id(usuario_id)
-        self.email_service.notificar_reserva_criada(reserva, usuario)
-
         return reserva
 
     def delete(self, reserva_id: UUID, usuario_id: UUID) -> None:
@@ -144,7 +159,9 @@ class ReservaService:
             raise BusinessException("Você não tem permissão para remover esta reserva, pois não é o dono da reserva")
 
         # Remove a reserva
+        self._publicar_alteracao(reserva_id)
         self.reserva_repository.delete(reserva_id)
+        self.reservas_version.bump()
 
     def get_by_query(self, filtros: ReservaFiltros) -> ReservasPaginadas:
         """Busca reservas com filtros e paginação"""
@@ -158,6 +175,12 @@ class ReservaService:
         """Busca todas as reservas de uma sala"""
         return self.reserva_repository.get_by_sala(sala_id)
 
+    def _publicar_alteracao(self, reserva_id: UUID = None) -> None:
+        """Avisa os outros processos, na transação da escrita, que houve alteração"""
+        self.invalidation_bus.publicar(
+            self.reserva_repository.session, RESERVAS, reserva_id
+        )
+
     def _validar_datas(self, inicio: datetime, fim: datetime) -> None:
         """Valida as datas de início e fim da reserva"""
         if inicio >= fim:
@@ -1,6 +1,8 @@
 from uuid import UUID
 from app.repository.sala_repository import SalaRepository
 from app.repository.bloco_repository import BlocoRepository
+from app.core.cache.invalidation_bus import SALAS, InvalidationBus
+from app.core.cache.reference_cache import ReferenceDataCache
 from app.services.base_service import BaseService
 from app.core.commons.exceptions import NotFoundException, BusinessException
 from app.model.sala_model import Sala
@@ -11,11 +13,17 @@ class SalaService(BaseService):
     """Serviço responsável pela gestão de salas"""
 
     def __init__(
-        self, sala_repository: SalaRepository, bloco_repository: BlocoRepository
+        self,
+        sala_repository: SalaRepository,
+        bloco_repository: BlocoRepository,
+        referencia_cache: ReferenceDataCache,
+        invalidation_bus: InvalidationBus,
     ):
         super().__init__(sala_repository)
         self.sala_repository = sala_repository
         self.bloco_repository = bloco_repository
+        self.referencia_cache = referencia_cache
+        self.invalidation_bus = invalidation_bus
 
     def get_by_id(self, sala_id: UUID) -> Sala:
         """Busca uma sala pelo ID"""
@@ -50,7 +58,11 @@ class SalaService(BaseService):
                 "É necessário informar o curso restrito para salas de uso restrito"
             )
 
-        return self.sala_repository.save(Sala(**sala_data.model_dump()))
+        self.invalidation_bus.publicar(self.sala_repository.session, SALAS)
+        self.referencia_cache.registrar_alteracao(self.sala_repository.session)
+        sala = self.sala_repository.save(Sala(**sala_data.model_dump()))
+        self.referencia_cache.invalidar(SALAS)
+        return sala
 
     def update(self, sala_id: UUID, sala_data: SalaUpdate) -> Sala:
         """Atualiza uma sala existente"""
@@ -102,7 +114,11 @@ class SalaService(BaseService):
         if sala_data.identificacao_sala:
             sala_in_db.identificacao_sala = sala_data.identificacao_sala
 
-            return self.sala_repository.save(sala_in_db)
+        self.invalidation_bus.publicar(self.sala_repository.session, SALAS, sala_id)
+        self.referencia_cache.registrar_alteracao(self.sala_repository.session)
+        sala = self.sala_repository.save(sala_in_db)
+        self.referencia_cache.invalidar(SALAS)
+        return sala
 
     def delete(self, sala_id: UUID) -> Sala:
         """Remove uma sala"""
@@ -111,7 +127,10 @@ class SalaService(BaseService):
         # Aqui poderia verificar se existem reservas para esta sala
         # Mas isso seria feito em outro momento ou por constraint no banco
 
+        self.invalidation_bus.publicar(self.sala_repository.session, SALAS, sala_id)
+        self.referencia_cache.registrar_alteracao(self.sala_repository.session)
         self.sala_repository.delete(sala_id)
+        self.referencia_cache.invalidar(SALAS)
         return sala
 
     def get_by_query(self, filtros: SalaFiltros) -> SalasPaginadas:
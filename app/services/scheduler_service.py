@@ -1,134 +1,306 @@
-from datetime import datetime, date
-from typing import List
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from datetime import date
+from itertools import groupby
+from operator import attrgetter
+from typing import Optional
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.base import BaseTrigger
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from app.core.config.settings import settings
+from app.util.datetime_utils import DateTimeUtils
+from app.core.database.leader_election import LeaderElection
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
 from app.repository.reserva_repository import ReservaRepository
-from app.repository.usuario_repository import UsuarioRepository
+from app.repository.token_revogado_repository import TokenRevogadoRepository
 from app.services.email_service import EmailService
-from app.model.reserva_model import Reserva
-from app.model.usuario_model import Usuario
-from app.util.datetime_utils import DateTimeUtils
+from app.services.lembrete_service import LembreteService
+from app.services.email_outbox_service import EmailOutboxService
+from app.services.ocupacao_cubo_service import OcupacaoCuboService
+from app.services.relatorio_job_service import RelatorioJobService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# O job store persiste apenas a referência textual da função e seus argumentos,
+# então as tarefas são despachadas para a instância ativa do SchedulerService.
+_instancia_ativa: Optional["SchedulerService"] = None
+
+
+def executar_tarefa(nome: str) -> None:
+    """Executa a tarefa `nome` da instância ativa, se ela ainda for a líder"""
+    instancia = _instancia_ativa
+    if instancia is None:
+        logger.warning(f"Tarefa {nome} ignorada: scheduler não iniciado")
+        return
+    if not instancia.leader_election.confirmar():
+        logger.warning(f"Tarefa {nome} ignorada: este worker não é mais o líder")
+        return
+    getattr(instancia, nome)()
+
+
 class SchedulerService:
-    """Serviço responsável pelo agendamento de tarefas"""
+    """
+    Serviço responsável pelo agendamento de tarefas.
+
+    Roda no processo do worker (python -m app.worker), fora da API. As tarefas
+    são executadas em um pool de threads e cada uma abre sua própria sessão.
+
+    Vários workers podem rodar ao mesmo tempo: apenas o líder, eleito por
+    advisory lock no Postgres, executa as tarefas. Os agendamentos ficam
+    persistidos no banco, então execuções perdidas durante um deploy são
+    recuperadas (uma única vez) pelo próximo líder.
+    """
 
     def __init__(
         self,
-        reserva_repository: ReservaRepository,
-        usuario_repository: UsuarioRepository,
+        session_factory: sessionmaker,
+        engine: Engine,
+        leader_election: LeaderElection,
         email_service: EmailService,
+        lembrete_service: LembreteService,
+        email_outbox_service: EmailOutboxService,
+        ocupacao_cubo_service: OcupacaoCuboService,
+        relatorio_job_service: RelatorioJobService,
     ):
-        self.reserva_repository = reserva_repository
-        self.usuario_repository = usuario_repository
+        self.session_factory = session_factory
+        self.leader_election = leader_election
         self.email_service = email_service
-        self.scheduler = AsyncIOScheduler()
+        self.lembrete_service = lembrete_service
+        self.email_outbox_service = email_outbox_service
+        self.ocupacao_cubo_service = ocupacao_cubo_service
+        self.relatorio_job_service = relatorio_job_service
+        self.scheduler = BackgroundScheduler(
+            jobstores={
+                "default": SQLAlchemyJobStore(
+                    engine=engine, tablename="apscheduler_jobs"
+                )
+            },
+            executors={"default": ThreadPoolExecutor(settings.WORKER_MAX_THREADS)},
+            job_defaults={
+                "coalesce": True,
+                "max_instances": 1,
+                "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_SEGUNDOS,
+            },
+            timezone=settings.TIMEZONE,
+        )
 
     def start(self):
-        """Inicia o scheduler"""
-        self.scheduler.start()
+        """Inicia o scheduler pausado; as tarefas só rodam após assumir a liderança"""
+        global _instancia_ativa
+        _instancia_ativa = self
+        self.scheduler.start(paused=True)
         logger.info("Scheduler started")
 
     def stop(self):
-        """Para o scheduler"""
-        self.scheduler.shutdown()
+        """Para o scheduler, aguardando as tarefas em execução"""
+        global _instancia_ativa
+        self.scheduler.shutdown(wait=True)
+        _instancia_ativa = None
         logger.info("Scheduler stopped")
 
+    def assumir(self):
+        """Chamado ao obter a liderança: agenda as tarefas e retoma a execução"""
+        self.schedule_all()
+        self.scheduler.resume()
+        logger.info("Scheduler resumed (leader)")
+
+    def liberar(self):
+        """Chamado ao perder a liderança: pausa a execução das tarefas"""
+        self.scheduler.pause()
+        logger.info("Scheduler paused (standby)")
+
+    def schedule_all(self):
+        """Agenda todas as tarefas do worker"""
+        self.schedule_daily_notifications()
+        self.schedule_lembretes()
+        self.schedule_email_outbox()
+        self.schedule_cubo_ocupacao()
+        self.schedule_relatorio_jobs()
+        self.schedule_metricas_email()
+        self.schedule_limpeza_tokens_revogados()
+
+    def _agendar(self, job_id: str, nome: str, tarefa: str, trigger: BaseTrigger):
+        """
+        Agenda uma tarefa no job store persistente.
+
+        Se a tarefa já existe com o mesmo trigger ela é mantida como está, para
+        preservar o próximo horário persistido e recuperar execuções perdidas.
+        """
+        job = self.scheduler.get_job(job_id)
+        if job is not None and str(job.trigger) == str(trigger):
+            return
+        self.scheduler.add_job(
+            f"{__name__}:executar_tarefa",
+            trigger,
+            args=[tarefa],
+            id=job_id,
+            name=nome,
+            replace_existing=True,
+        )
+
     def schedule_daily_notifications(self):
         """Agenda a tarefa de notificação diária"""
         # Agenda para rodar todo dia às 00:00
-        self.scheduler.add_job(
-            self._send_daily_notifications,
+        self._agendar(
+            "daily_notifications",
+            "Enviar notificações diárias de reservas",
+            "_send_daily_notifications",
             CronTrigger(hour=0, minute=0),
-            id="daily_notifications",
-            name="Enviar notificações diárias de reservas",
-            replace_existing=True,
         )
         logger.info("Daily notifications scheduled")
 
-    async def _send_daily_notifications(self):
-        """Envia notificações para as reservas do dia"""
+    def schedule_lembretes(self):
+        """Agenda o tick da roda de lembretes de reserva"""
+        self._agendar(
+            "lembretes",
+            "Enviar lembretes antes do início das reservas",
+            "_processar_lembretes",
+            IntervalTrigger(seconds=settings.LEMBRETE_TICK_SEGUNDOS),
+        )
+        logger.info("Lembretes scheduled")
+
+    def _processar_lembretes(self):
+        """Envia os lembretes vencidos"""
         try:
-            today = date.today()
-            logger.info(f"Enviando notificações para reservas do dia {today}")
+            self.lembrete_service.processar()
+        except Exception as e:
+            logger.error(f"Erro ao processar lembretes: {str(e)}")
 
-            # Busca todas as reservas do dia
-            reservas = self.reserva_repository.get_by_date(today)
-            
-            if not reservas:
-                logger.info("Nenhuma reserva encontrada para hoje")
-                return
+    def schedule_email_outbox(self):
+        """Agenda a entrega dos emails da caixa de saída"""
+        self._agendar(
+            "email_outbox",
+            "Entregar emails da caixa de saída",
+            "_entregar_email_outbox",
+            IntervalTrigger(seconds=settings.EMAIL_OUTBOX_INTERVALO_SEGUNDOS),
+        )
+        logger.info("Email outbox scheduled")
 
-            # Agrupa reservas por usuário
-            reservas_por_usuario = {}
-            for reserva in reservas:
-                usuario = self.usuario_repository.get_by_id(reserva.usuario_id)
-                if usuario:
-                    if usuario.id not in reservas_por_usuario:
-                        reservas_por_usuario[usuario.id] = []
-                    reservas_por_usuario[usuario.id].append(reserva)
+    def _entregar_email_outbox(self):
+        """Entrega os emails pendentes da caixa de saída"""
+        try:
+            self.email_outbox_service.entregar_pendentes()
+        except Exception as e:
+            logger.error(f"Erro ao entregar emails da caixa de saída: {str(e)}")
 
-            # Envia email para cada usuário com suas reservas
-            for usuario_id, reservas_usuario in reservas_por_usuario.items():
-                usuario = self.usuario_repository.get_by_id(usuario_id)
-                if usuario:
-                    self._send_user_notifications(usuario, reservas_usuario)
+    def schedule_cubo_ocupacao(self):
+        """Agenda a atualização incremental do cubo de ocupação"""
+        self._agendar(
+            "cubo_ocupacao",
+            "Atualizar cubo de ocupação das salas",
+            "_atualizar_cubo_ocupacao",
+            IntervalTrigger(minutes=settings.CUBO_OCUPACAO_INTERVALO_MINUTOS),
+        )
+        logger.info("Cubo de ocupação scheduled")
 
-            logger.info(f"Notificações enviadas com sucesso para {len(reservas_por_usuario)} usuários")
+    def _atualizar_cubo_ocupacao(self):
+        """Atualiza o cubo de ocupação com as reservas alteradas"""
+        try:
+            self.ocupacao_cubo_service.atualizar_incremental()
+        except Exception as e:
+            logger.error(f"Erro ao atualizar cubo de ocupação: {str(e)}")
 
+    def schedule_relatorio_jobs(self):
+        """Agenda o processamento dos relatórios em segundo plano"""
+        self._agendar(
+            "relatorio_jobs",
+            "Processar relatórios em segundo plano",
+            "_processar_relatorio_jobs",
+            IntervalTrigger(seconds=settings.RELATORIO_JOB_INTERVALO_SEGUNDOS),
+        )
+        logger.info("Relatório jobs scheduled")
+
+    def _processar_relatorio_jobs(self):
+        """Processa os relatórios pendentes"""
+        try:
+            self.relatorio_job_service.processar_pendentes()
         except Exception as e:
-            logger.error(f"Erro ao enviar notificações diárias: {str(e)}")
+            logger.error(f"Erro ao processar relatórios pendentes: {str(e)}")
+
+    def schedule_metricas_email(self):
+        """Agenda o registro das métricas da fila de envio de emails"""
+        self._agendar(
+            "metricas_email",
+            "Registrar métricas da fila de envio de emails",
+            "_registrar_metricas_email",
+            IntervalTrigger(seconds=settings.EMAIL_METRICAS_INTERVALO_SEGUNDOS),
+        )
+        logger.info("Métricas de email scheduled")
 
-    def _send_user_notifications(self, usuario: Usuario, reservas: List[Reserva]):
-        """Envia notificações para um usuário específico"""
+    def _registrar_metricas_email(self):
+        """Registra no log a profundidade da fila de envio e o saldo da cota"""
         try:
-            subject = f"Suas reservas para hoje ({DateTimeUtils.format_datetime(datetime.now(), '%d/%m/%Y')})"
-            
-            text = f"Olá {usuario.nome},\n\n"
-            text += "Você tem as seguintes reservas para hoje:\n\n"
-            
-            for reserva in reservas:
-                text += f"- Sala: {reserva.sala.identificacao_sala}\n"
-                text += f"  Horário: {DateTimeUtils.format_datetime(reserva.inicio, '%H:%M')} - {DateTimeUtils.format_datetime(reserva.fim, '%H:%M')}\n"
-                text += f"  Motivo: {reserva.motivo}\n\n"
-
-            text += "Atenciosamente,\nSistema de Reserva de Salas"
-
-            html = f"""
-            <html>
-                <body>
-                    <h2>Suas reservas para hoje</h2>
-                    <p>Olá {usuario.nome},</p>
-                    <p>Você tem as seguintes reservas para hoje:</p>
-                    <ul>
-            """
-
-            for reserva in reservas:
-                html += f"""
-                        <li>
-                            <strong>Sala:</strong> {reserva.sala.identificacao_sala}<br>
-                            <strong>Horário:</strong> {DateTimeUtils.format_datetime(reserva.inicio, '%H:%M')} - {DateTimeUtils.format_datetime(reserva.fim, '%H:%M')}<br>
-                            <strong>Motivo:</strong> {reserva.motivo}
-                        </li>
-                """
-
-            html += """
-                    </ul>
-                    <p>Atenciosamente,<br>Sistema de Reserva de Salas</p>
-                </body>
-            </html>
-            """
-
-            self.email_service.email_client.send_email(
-                to_email=usuario.email,
-                subject=subject,
-                text=text,
-                html=html,
+            metricas = self.email_service.email_client.metricas()
+            filas = ", ".join(
+                f"{nome}: {valores['em_espera']} em espera, "
+                f"{valores['liberados']} liberados, "
+                f"espera média {valores['espera_media_segundos']}s"
+                for nome, valores in metricas["prioridades"].items()
+            )
+            logger.info(
+                f"Fila de emails - tokens disponíveis: "
+                f"{metricas['tokens_disponiveis']}"
+                + (f"; {filas}" if filas else "")
             )
+        except Exception as e:
+            logger.error(f"Erro ao registrar métricas de email: {str(e)}")
+
+    def schedule_limpeza_tokens_revogados(self):
+        """Agenda a remoção das revogações de tokens já expirados"""
+        self._agendar(
+            "limpeza_tokens_revogados",
+            "Remover revogações de tokens expirados",
+            "_limpar_tokens_revogados",
+            IntervalTrigger(minutes=settings.AUTH_REVOGACAO_LIMPEZA_INTERVALO_MINUTOS),
+        )
+        logger.info("Limpeza de tokens revogados scheduled")
 
-            logger.info(f"Notificação enviada com sucesso para {usuario.email}")
+    def _limpar_tokens_revogados(self):
+        """Remove as revogações cujos tokens já expiraram"""
+        try:
+            with self.session_factory() as session:
+                removidas = TokenRevogadoRepository(session).remover_expiradas(
+                    DateTimeUtils.now()
+                )
+            if removidas:
+                logger.info(f"{removidas} revogações de tokens expiradas removidas")
+        except Exception as e:
+            logger.error(f"Erro ao remover revogações de tokens: {str(e)}")
+
+    def _send_daily_notifications(self):
+        """Envia notificações para as reservas do dia"""
+        try:
+            today = date.today()
+            logger.info(f"Enviando notificações para reservas do dia {today}")
+
+            with self.session_factory() as session:
+                # Uma única consulta, já ordenada por usuário, agrupada em uma passada
+                reservas = ReservaRepository(session).get_ativas_do_dia_com_detalhes(
+                    today
+                )
+                reservas_por_usuario = (
+                    (reservas_usuario[0].usuario, reservas_usuario)
+                    for reservas_usuario in (
+                        list(grupo)
+                        for _, grupo in groupby(reservas, key=attrgetter("usuario_id"))
+                    )
+                )
+                resultados = self.email_service.notificar_reservas_do_dia(
+                    reservas_por_usuario
+                )
+
+            if not resultados:
+                logger.info("Nenhuma reserva encontrada para hoje")
+                return
+
+            falhas = [r.email for r in resultados.values() if not r.enviado]
+            logger.info(
+                f"Notificações enviadas para {len(resultados) - len(falhas)} usuários"
+                f" ({len(falhas)} falhas)"
+            )
 
         except Exception as e:
-            logger.error(f"Erro ao enviar notificação para {usuario.email}: {str(e)}") 
\ No newline at end of file
+            logger.error(f"Erro ao enviar notificações diárias: {str(e)}")
@@ -3,13 +3,23 @@ from app.services.base_service import BaseService
 from app.repository.semestre_repository import SemestreRepository
 from app.model.semestre_model import Semestre
 from app.schema.semestre_schema import SemestreCreate
+from app.schema.referencia_schema import SemestreSnapshot
+from app.core.cache.invalidation_bus import SEMESTRES, InvalidationBus
+from app.core.cache.reference_cache import ReferenceDataCache
 from app.core.commons.exceptions import ValidationException
 from uuid import UUID
 
 class SemestreService(BaseService):
-    def __init__(self, semestre_repository: SemestreRepository):
+    def __init__(
+        self,
+        semestre_repository: SemestreRepository,
+        referencia_cache: ReferenceDataCache,
+        invalidation_bus: InvalidationBus,
+    ):
         super().__init__(semestre_repository)
         self.semestre_repository = semestre_repository
+        self.referencia_cache = referencia_cache
+        self.invalidation_bus = invalidation_bus
 
     def create(self, semestre: SemestreCreate) -> Semestre:
 
@@ -22,7 +32,27 @@ class SemestreService(BaseService):
             data_fim=semestre.data_fim,
             ativo=semestre.ativo,
         )
-        return self.semestre_repository.create(semestre)
+        self._publicar(semestre.identificador)
+        semestre = self.semestre_repository.create(semestre)
+        self.referencia_cache.invalidar(SEMESTRES)
+        return semestre
+
+    def update(self, id: UUID, semestre: SemestreCreate) -> Semestre:
+        existente = self.semestre_repository.get_by_identificador(semestre.identificador)
+        if existente and existente.id != id:
+            raise ValidationException("Já existe um semestre com o identificador informado")
+
+        self._publicar(self.semestre_repository.get_by_id(id).identificador)
+        semestre = self.semestre_repository.update(id, semestre.model_dump())
+        self.referencia_cache.invalidar(SEMESTRES)
+        return semestre
+
+    def delete(self, id: UUID) -> Semestre:
+        semestre = self.semestre_repository.get_by_id(id)
+        self._publicar(semestre.identificador)
+        self.semestre_repository.delete(id)
+        self.referencia_cache.invalidar(SEMESTRES)
+        return semestre
 
     def get_all(self) -> List[Semestre]:
         return self.semestre_repository.get_all()
@@ -30,5 +60,12 @@ class SemestreService(BaseService):
     def get_by_id(self, id: UUID) -> Optional[Semestre]:
         return self.semestre_repository.get_by_id(id)
     
-    def get_by_identificador(self, identificador: str) -> Optional[Semestre]:
-        return self.semestre_repository.get_by_identificador(identificador)
+    def get_by_identificador(self, identificador: str) -> Optional[SemestreSnapshot]:
+        return self.referencia_cache.get_semestre(identificador)
+
+    def _publicar(self, identificador: Optional[str]) -> None:
+        """Avisa os outros processos, na transação da escrita, que o semestre mudou"""
+        self.invalidation_bus.publicar(
+            self.semestre_repository.session, SEMESTRES, identificador
+        )
+        self.referencia_cache.registrar_alteracao(self.semestre_repository.session)
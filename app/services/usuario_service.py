@@ -1,5 +1,15 @@
-from uuid import UUID
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+from pydantic import ValidationError
+from app.core.cache.invalidation_bus import TOKENS, InvalidationBus
+from app.core.config.settings import settings
+from app.core.security.token_revocation import (
+    TokenRevocationList,
+    revogacao_do_usuario,
+)
+from app.core.security.password_hasher import PasswordHasher
 from app.repository.usuario_repository import UsuarioRepository
+from app.repository.token_revogado_repository import TokenRevogadoRepository
 from app.services.base_service import BaseService
 from app.core.commons.exceptions import NotFoundException, BusinessException
 from app.model.usuario_model import Usuario
@@ -8,13 +18,28 @@ from app.schema.usuario_schema import (
     UsuarioUpdate,
     UsuarioFiltros,
     UsuariosPaginados,
+    StatusImportacaoUsuario,
+    ResultadoImportacaoUsuario,
+    RelatorioImportacaoUsuarios,
 )
+from app.util.datetime_utils import DateTimeUtils
 
 
 class UsuarioService(BaseService):
-    def __init__(self, usuario_repository: UsuarioRepository):
+    def __init__(
+        self,
+        usuario_repository: UsuarioRepository,
+        token_revogado_repository: TokenRevogadoRepository,
+        token_revocation_list: TokenRevocationList,
+        password_hasher: PasswordHasher,
+        invalidation_bus: InvalidationBus,
+    ):
         super().__init__(usuario_repository)
         self.usuario_repository = usuario_repository
+        self.token_revogado_repository = token_revogado_repository
+        self.token_revocation_list = token_revocation_list
+        self.password_hasher = password_hasher
+        self.invalidation_bus = invalidation_bus
 
     def get_by_id(self, usuario_id: UUID) -> Usuario:
         usuario = self.usuario_repository.get_by_id(usuario_id)
@@ -30,31 +55,211 @@ class UsuarioService(BaseService):
             raise BusinessException("Matrícula já cadastrada")
 
         user_model = Usuario(**usuario_data.model_dump())
-        user_model.set_senha(usuario_data.senha)
+        user_model.set_hash_senha(self.password_hasher.gerar_hash(usuario_data.senha))
         return self.usuario_repository.save(user_model)
 
     def update(self, usuario_id: UUID, usuario_data: UsuarioUpdate) -> Usuario:
         usuario = self.get_by_id(usuario_id)
+        versao_anterior = usuario.token_version
         if usuario_data.nome:
             usuario.nome = usuario_data.nome
         if usuario_data.email:
             usuario.email = usuario_data.email
         if usuario_data.matricula:
             usuario.matricula = usuario_data.matricula
-        if usuario_data.curso:
+        if usuario_data.curso and usuario_data.curso != usuario.curso:
             usuario.curso = usuario_data.curso
-        if usuario_data.ativo:
-            usuario.ativo = usuario_data.ativo
+            # O curso faz parte dos claims de autorização dos tokens
+            usuario.revogar_tokens()
+        if usuario_data.ativo is not None and usuario_data.ativo != usuario.ativo:
+            if usuario_data.ativo:
+                usuario.ativar()
+            else:
+                usuario.desativar("Conta desativada pelo administrador")
         if usuario_data.senha:
-            usuario.set_senha(usuario_data.senha)
+            usuario.set_hash_senha(self.password_hasher.gerar_hash(usuario_data.senha))
+        if usuario.token_version != versao_anterior:
+            return self._salvar_revogando(usuario, "Dados do usuário alterados")
+        return self.usuario_repository.save(usuario)
+
+    def desativar(self, usuario_id: UUID, motivo: str) -> Usuario:
+        """Desativa a conta do usuário, revogando os tokens já emitidos"""
+        usuario = self.get_by_id(usuario_id)
+        usuario.desativar(motivo)
+        return self._salvar_revogando(usuario, motivo)
+
+    def ativar(self, usuario_id: UUID) -> Usuario:
+        """Reativa a conta do usuário, removendo o bloqueio"""
+        usuario = self.get_by_id(usuario_id)
+        usuario.ativar()
         return self.usuario_repository.save(usuario)
 
     def delete(self, usuario_id: UUID) -> Usuario:
         usuario = self.get_by_id(usuario_id)
         if usuario is None:
             raise NotFoundException(f"Usuário com ID {usuario_id} não encontrado")
+        usuario.revogar_tokens()
+        revogacao = self.token_revogado_repository.adicionar(
+            revogacao_do_usuario(usuario, "Usuário removido")
+        )
+        self._publicar_revogacao(usuario_id)
         self.usuario_repository.delete(usuario_id)
+        self.token_revocation_list.registrar([revogacao])
+        return usuario
+
+    def _salvar_revogando(self, usuario: Usuario, motivo: str) -> Usuario:
+        """
+        Salva o usuário cuja versão de token mudou, gravando na mesma transação
+        a revogação dos tokens anteriores, e a aplica na lista em memória.
+        """
+        revogacao = self.token_revogado_repository.adicionar(
+            revogacao_do_usuario(usuario, motivo)
+        )
+        self._publicar_revogacao(usuario.id)
+        usuario = self.usuario_repository.save(usuario)
+        self.token_revocation_list.registrar([revogacao])
         return usuario
 
+    def _publicar_revogacao(self, usuario_id: UUID) -> None:
+        """Avisa os outros processos, na mesma transação, para reler a lista"""
+        self.invalidation_bus.publicar(
+            self.token_revogado_repository.session, TOKENS, usuario_id
+        )
+
+    def importar(self, registros: List[Dict[str, Any]]) -> RelatorioImportacaoUsuarios:
+        """
+        Cadastra usuários em lote, retornando o resultado de cada linha.
+
+        As linhas inválidas ou repetidas no próprio arquivo são rejeitadas, e
+        matrículas e emails já cadastrados são verificados em uma única
+        consulta. As senhas das linhas restantes são processadas em paralelo,
+        em todos os núcleos, e os usuários são gravados com INSERT de várias
+        linhas; conflitos surgidos nesse meio-tempo são ignorados pelo banco.
+        """
+        if len(registros) > settings.IMPORTACAO_USUARIOS_MAX_LINHAS:
+            raise BusinessException(
+                f"A importação aceita no máximo "
+                f"{settings.IMPORTACAO_USUARIOS_MAX_LINHAS} usuários por vez"
+            )
+
+        resultados: Dict[int, ResultadoImportacaoUsuario] = {}
+        validos: Dict[int, UsuarioCreate] = {}
+        linha_por_matricula: Dict[str, int] = {}
+        linha_por_email: Dict[str, int] = {}
+
+        for linha, registro in enumerate(registros, start=1):
+            try:
+                dados = UsuarioCreate.model_validate(registro)
+            except ValidationError as e:
+                resultados[linha] = ResultadoImportacaoUsuario(
+                    linha=linha,
+                    matricula=self._texto(registro.get("matricula")),
+                    email=self._texto(registro.get("email")),
+                    status=StatusImportacaoUsuario.ERRO,
+                    mensagem="; ".join(
+                        f"{'.'.join(map(str, erro['loc']))}: {erro['msg']}"
+                        for erro in e.errors()
+                    ),
+                )
+                continue
+
+            repetida = linha_por_matricula.get(dados.matricula) or linha_por_email.get(
+                dados.email
+            )
+            if repetida:
+                resultados[linha] = self._resultado_importacao(
+                    linha,
+                    dados,
+                    StatusImportacaoUsuario.ERRO,
+                    f"Matrícula ou email repetido na linha {repetida}",
+                )
+                continue
+            linha_por_matricula[dados.matricula] = linha
+            linha_por_email[dados.email] = linha
+            validos[linha] = dados
+
+        matriculas, emails = self.usuario_repository.get_matriculas_emails_existentes(
+            linha_por_matricula, linha_por_email
+        )
+        for linha, dados in list(validos.items()):
+            if dados.matricula in matriculas or dados.email in emails:
+                mensagem = (
+                    "Matrícula já cadastrada"
+                    if dados.matricula in matriculas
+                    else "Email já cadastrado"
+                )
+                resultados[linha] = self._resultado_importacao(
+                    linha, dados, StatusImportacaoUsuario.IGNORADO, mensagem
+                )
+                del validos[linha]
+
+        hashes = self.password_hasher.gerar_hashes(
+            [dados.senha for dados in validos.values()],
+            processos=settings.SENHA_HASH_PROCESSOS,
+        )
+        agora = DateTimeUtils.now()
+        linhas = {
+            linha: {
+                **dados.model_dump(exclude={"senha"}),
+                "id": uuid4(),
+                "senha": hash_senha,
+                "bloqueado": False,
+                "tentativas_login": 0,
+                "token_version": 0,
+                "criado_em": agora,
+                "atualizado_em": agora,
+            }
+            for (linha, dados), hash_senha in zip(validos.items(), hashes)
+        }
+        inseridos = self.usuario_repository.inserir_em_lote(
+            list(linhas.values()), settings.IMPORTACAO_USUARIOS_LOTE_INSERT
+        )
+
+        for linha, dados in validos.items():
+            usuario_id = linhas[linha]["id"]
+            if usuario_id in inseridos:
+                resultado = self._resultado_importacao(
+                    linha, dados, StatusImportacaoUsuario.CRIADO
+                )
+                resultado.id = usuario_id
+            else:
+                resultado = self._resultado_importacao(
+                    linha,
+                    dados,
+                    StatusImportacaoUsuario.IGNORADO,
+                    "Matrícula ou email já cadastrado",
+                )
+            resultados[linha] = resultado
+
+        ordenados = [resultados[linha] for linha in sorted(resultados)]
+        return RelatorioImportacaoUsuarios(
+            total=len(ordenados),
+            criados=sum(r.status == StatusImportacaoUsuario.CRIADO for r in ordenados),
+            ignorados=sum(
+                r.status == StatusImportacaoUsuario.IGNORADO for r in ordenados
+            ),
+            erros=sum(r.status == StatusImportacaoUsuario.ERRO for r in ordenados),
+            resultados=ordenados,
+        )
+
+    @staticmethod
+    def _resultado_importacao(
+        linha: int,
+        dados: UsuarioCreate,
+        status: StatusImportacaoUsuario,
+        mensagem: Optional[str] = None,
+    ) -> ResultadoImportacaoUsuario:
+        return ResultadoImportacaoUsuario(
+            linha=linha,
+            matricula=dados.matricula,
+            email=dados.email,
+            status=status,
+            mensagem=mensagem,
+        )
+
+    @staticmethod
+    def _texto(valor: Any) -> Optional[str]:
+        return None if valor is None else str(valor)
+
     def get_by_query(self, filtros: UsuarioFiltros) -> UsuariosPaginados:
         return self.usuario_repository.get_by_query(filtros)
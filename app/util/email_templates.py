@@ -0,0 +1,105 @@
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple, Union
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+
+from app.schema.email_schema import ModeloEmail
+
+# Diretório padrão dos templates de email
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+# Sufixos dos arquivos de cada template: <nome>.assunto.txt, <nome>.txt, <nome>.html
+SUFIXO_ASSUNTO = ".assunto.txt"
+SUFIXO_TEXTO = ".txt"
+SUFIXO_HTML = ".html"
+
+
+def _formatar_data(valor: Union[date, datetime]) -> str:
+    return valor.strftime("%d/%m/%Y")
+
+
+def _formatar_hora(valor: Union[time, datetime]) -> str:
+    return valor.strftime("%H:%M")
+
+
+class EmailTemplates:
+    """
+    Templates Jinja2 dos emails de notificação.
+
+    Todos os templates do diretório são compilados uma única vez, na criação,
+    e mantidos por nome; as renderizações seguintes apenas executam o código
+    já compilado. O HTML é sempre renderizado com autoescape, então dados
+    informados pelo usuário (como o motivo da reserva) não viram marcação.
+    """
+
+    def __init__(self, diretorio: Path = TEMPLATES_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(str(diretorio)),
+            # Escape automático apenas no HTML; texto e assunto saem como estão
+            autoescape=lambda nome: bool(nome) and nome.endswith(SUFIXO_HTML),
+            auto_reload=False,
+            cache_size=-1,
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+        )
+        self.env.filters["data"] = _formatar_data
+        self.env.filters["hora"] = _formatar_hora
+
+        self._templates: Dict[str, Tuple[Template, Template, Template]] = {}
+        for arquivo in sorted(Path(diretorio).glob(f"*{SUFIXO_ASSUNTO}")):
+            nome = arquivo.name[: -len(SUFIXO_ASSUNTO)]
+            self._templates[nome] = (
+                self.env.get_template(nome + SUFIXO_ASSUNTO),
+                self.env.get_template(nome + SUFIXO_TEXTO),
+                self.env.get_template(nome + SUFIXO_HTML),
+            )
+
+    @property
+    def nomes(self) -> Tuple[str, ...]:
+        """Nomes dos templates disponíveis"""
+        return tuple(self._templates)
+
+    def renderizar(self, nome: str, contexto: Dict[str, Any]) -> ModeloEmail:
+        """
+        Renderiza assunto, texto e HTML de um template.
+
+        Raises:
+            KeyError: Se o template não existir
+        """
+        assunto, texto, html = self._get(nome)
+        return ModeloEmail(
+            assunto=" ".join(assunto.render(contexto).split()),
+            texto=texto.render(contexto),
+            html=html.render(contexto),
+        )
+
+    def renderizar_lote(
+        self, nome: str, contextos: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> Iterator[Tuple[str, ModeloEmail]]:
+        """
+        Renderiza o mesmo template para vários destinatários, sob demanda.
+        O template é resolvido uma única vez para todo o lote.
+
+        Args:
+            nome: Nome do template
+            contextos: Pares (email do destinatário, contexto)
+
+        Returns:
+            Pares (email do destinatário, email renderizado)
+        """
+        assunto, texto, html = self._get(nome)
+        for email, contexto in contextos:
+            yield email, ModeloEmail(
+                assunto=" ".join(assunto.render(contexto).split()),
+                texto=texto.render(contexto),
+                html=html.render(contexto),
+            )
+
+    def _get(self, nome: str) -> Tuple[Template, Template, Template]:
+        try:
+            return self._templates[nome]
+        except KeyError:
+            raise KeyError(f"Template de email '{nome}' não encontrado")
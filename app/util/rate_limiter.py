@@ -0,0 +1,128 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class PriorityTokenBucket:
+    """
+    Limitador de taxa por token bucket com fila de prioridade.
+
+    Os tokens são repostos continuamente até a capacidade (rajada máxima).
+    Quem não encontra tokens suficientes espera em uma fila ordenada por
+    prioridade (menor valor primeiro) e, dentro da mesma prioridade, por
+    ordem de chegada. Um pedido maior que a capacidade é liberado quando o
+    balde está cheio e deixa o saldo negativo, atrasando os seguintes.
+
+    Deve ser usado sempre a partir do mesmo event loop.
+    """
+
+    def __init__(
+        self,
+        taxa_por_segundo: float,
+        capacidade: float,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        if taxa_por_segundo <= 0 or capacidade <= 0:
+            raise ValueError("taxa_por_segundo e capacidade devem ser positivos")
+        self.taxa_por_segundo = taxa_por_segundo
+        self.capacidade = capacidade
+        self._relogio = relogio
+        self._tokens = capacidade
+        self._atualizado_em = relogio()
+        self._fila: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._sequencia = itertools.count()
+        self._temporizador: Optional[asyncio.TimerHandle] = None
+
+        # Métricas
+        self._em_espera: Dict[int, int] = {}
+        self._liberados: Dict[int, int] = {}
+        self._custo_liberado: Dict[int, float] = {}
+        self._espera_total: Dict[int, float] = {}
+
+    async def acquire(self, custo: float = 1, prioridade: int = 0) -> None:
+        """
+        Aguarda até haver tokens para `custo`, respeitando a prioridade.
+
+        Args:
+            custo: Quantidade de tokens consumidos
+            prioridade: Prioridade do pedido (menor valor é atendido antes)
+        """
+        inicio = self._relogio()
+        self._em_espera[prioridade] = self._em_espera.get(prioridade, 0) + 1
+        try:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(
+                self._fila, (prioridade, next(self._sequencia), custo, future)
+            )
+            self._despachar()
+            # Se o pedido for cancelado, o future cancelado é descartado da fila
+            await future
+        finally:
+            self._em_espera[prioridade] -= 1
+
+        self._liberados[prioridade] = self._liberados.get(prioridade, 0) + 1
+        self._custo_liberado[prioridade] = (
+            self._custo_liberado.get(prioridade, 0) + custo
+        )
+        self._espera_total[prioridade] = self._espera_total.get(prioridade, 0) + (
+            self._relogio() - inicio
+        )
+
+    def metricas(self) -> Dict[str, object]:
+        """
+        Retorna as métricas do limitador: tokens disponíveis e, por prioridade,
+        pedidos em espera, pedidos liberados, custo liberado e espera média.
+        """
+        prioridades = sorted(set(self._em_espera) | set(self._liberados))
+        return {
+            "tokens_disponiveis": round(self._tokens_em(self._relogio()), 2),
+            "prioridades": {
+                prioridade: {
+                    "em_espera": self._em_espera.get(prioridade, 0),
+                    "liberados": self._liberados.get(prioridade, 0),
+                    "custo_liberado": self._custo_liberado.get(prioridade, 0),
+                    "espera_media_segundos": round(
+                        self._espera_total.get(prioridade, 0)
+                        / max(self._liberados.get(prioridade, 0), 1),
+                        3,
+                    ),
+                }
+                for prioridade in prioridades
+            },
+        }
+
+    def _despachar(self) -> None:
+        """Libera os pedidos do início da fila enquanto houver tokens"""
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+
+        agora = self._relogio()
+        self._tokens = self._tokens_em(agora)
+        self._atualizado_em = agora
+
+        while self._fila:
+            _, _, custo, future = self._fila[0]
+            if future.done():
+                heapq.heappop(self._fila)
+                continue
+
+            necessario = min(custo, self.capacidade)
+            if self._tokens < necessario:
+                espera = (necessario - self._tokens) / self.taxa_por_segundo
+                self._temporizador = asyncio.get_running_loop().call_later(
+                    espera, self._despachar
+                )
+                return
+
+            heapq.heappop(self._fila)
+            self._tokens -= custo
+            future.set_result(None)
+
+    def _tokens_em(self, instante: float) -> float:
+        decorrido = max(instante - self._atualizado_em, 0)
+        return min(
+            self.capacidade, self._tokens + decorrido * self.taxa_por_segundo
+        )
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable
+
+from fastapi.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes idênticas em uma única execução.
+
+    Enquanto uma computação para uma chave está em andamento, novas chamadas
+    com a mesma chave aguardam o mesmo resultado em vez de executar de novo.
+    A função é executada no threadpool, sem bloquear o event loop.
+    Deve ser usado sempre a partir do event loop.
+    """
+
+    def __init__(self):
+        self._em_andamento: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def em_andamento(self) -> int:
+        """Quantidade de computações em andamento"""
+        return len(self._em_andamento)
+
+    async def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Executa `fn` uma única vez para chamadas concorrentes com a mesma chave.
+
+        Args:
+            key: Chave que identifica a computação
+            fn: Função síncrona a ser executada
+
+        Returns:
+            Resultado compartilhado da execução
+        """
+        future = self._em_andamento.get(key)
+        if future is None:
+            future = asyncio.ensure_future(run_in_threadpool(fn))
+            self._em_andamento[key] = future
+
+            def _remover(concluido: asyncio.Future) -> None:
+                if self._em_andamento.get(key) is concluido:
+                    del self._em_andamento[key]
+
+            future.add_done_callback(_remover)
+
+        # shield: o cancelamento de um cliente não cancela a computação dos demais
+        return await asyncio.shield(future)
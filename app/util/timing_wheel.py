@@ -0,0 +1,82 @@
+from typing import Dict, Hashable, List
+
+
+class HashedTimingWheel:
+    """
+    Roda de tempo com hash (hashed timing wheel).
+
+    Cada item fica no slot correspondente ao tick em que vence, junto com o
+    número de voltas que faltam. Avançar a roda visita apenas os slots dos
+    ticks percorridos, então o custo por tick depende dos itens naqueles
+    slots e não do total de itens agendados.
+    """
+
+    def __init__(self, tick_segundos: float, inicio: float, slots: int = 512):
+        if tick_segundos <= 0 or slots <= 0:
+            raise ValueError("tick_segundos e slots devem ser positivos")
+        self.tick_segundos = tick_segundos
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._posicoes: Dict[Hashable, int] = {}
+        # Último tick já processado
+        self._tick_atual = self._tick(inicio)
+
+    def __len__(self) -> int:
+        return len(self._posicoes)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._posicoes
+
+    def add(self, chave: Hashable, vencimento: float) -> None:
+        """
+        Agenda (ou reagenda) um item.
+        Itens com vencimento já passado vencem no próximo avanço.
+        """
+        self.remove(chave)
+        # Arredonda para cima: um item nunca vence antes do seu vencimento
+        tick = max(-int(-vencimento // self.tick_segundos), self._tick_atual + 1)
+        voltas = (tick - self._tick_atual - 1) // len(self._slots)
+        posicao = tick % len(self._slots)
+        self._slots[posicao][chave] = voltas
+        self._posicoes[chave] = posicao
+
+    def remove(self, chave: Hashable) -> bool:
+        """Remove um item agendado; retorna False se ele não existia"""
+        posicao = self._posicoes.pop(chave, None)
+        if posicao is None:
+            return False
+        del self._slots[posicao][chave]
+        return True
+
+    def advance(self, agora: float) -> List[Hashable]:
+        """
+        Avança a roda até o instante informado.
+
+        Returns:
+            Chaves dos itens que venceram, removidas da roda
+        """
+        alvo = self._tick(agora)
+        passos = alvo - self._tick_atual
+        if passos <= 0:
+            return []
+
+        total_slots = len(self._slots)
+        vencidos = []
+        # Em saltos maiores que uma volta, cada slot é visitado uma única vez,
+        # descontando de uma só vez todas as passagens por ele
+        for passo in range(1, min(passos, total_slots) + 1):
+            tick = self._tick_atual + passo
+            passagens = (alvo - tick) // total_slots + 1
+            slot = self._slots[tick % total_slots]
+            for chave, voltas in list(slot.items()):
+                if voltas < passagens:
+                    del slot[chave]
+                    del self._posicoes[chave]
+                    vencidos.append(chave)
+                else:
+                    slot[chave] = voltas - passagens
+
+        self._tick_atual = alvo
+        return vencidos
+
+    def _tick(self, instante: float) -> int:
+        return int(instante // self.tick_segundos)
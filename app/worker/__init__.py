@@ -0,0 +1 @@
+"""Processo de tarefas em segundo plano, separado da API"""
@@ -0,0 +1,56 @@
+"""
+Worker de tarefas em segundo plano.
+
+Uso:
+    python -m app.worker
+"""
+
+import logging
+import signal
+import threading
+
+from app.core.di.container import Container
+from app.core.config.logging import setup_logging
+from app.core.database.database import init_db
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Inicia o scheduler e disputa a liderança até receber SIGINT ou SIGTERM"""
+    setup_logging()
+    init_db()
+
+    container = Container()
+    scheduler_service = container.scheduler_service()
+
+    parar = threading.Event()
+
+    def _encerrar(signum, frame):
+        logger.info(f"Sinal {signum} recebido, encerrando worker")
+        parar.set()
+
+    signal.signal(signal.SIGINT, _encerrar)
+    signal.signal(signal.SIGTERM, _encerrar)
+
+    leader_election = container.leader_election()
+
+    scheduler_service.start()
+    logger.info("Worker started, waiting for leadership")
+
+    try:
+        # Só o worker líder executa as tarefas; os demais ficam de reserva
+        leader_election.executar(
+            parar,
+            ao_assumir=scheduler_service.assumir,
+            ao_perder=scheduler_service.liberar,
+        )
+    finally:
+        scheduler_service.stop()
+        container.query_fanout().shutdown()
+        container.email_client().close()
+        logger.info("Worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Adiciona reservas.proximo_lembrete
+
+Revision ID: 12178a0e0312
+Revises:
+Create Date: 2026-10-18 23:31:50
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config.settings import settings
+from app.util.datetime_utils import DateTimeUtils
+
+# revision identifiers, used by Alembic.
+revision = "12178a0e0312"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bancos criados depois da coluna (create_all) já a têm
+    colunas = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("reservas")}
+    if "proximo_lembrete" in colunas:
+        return
+
+    op.add_column(
+        "reservas",
+        sa.Column(
+            "proximo_lembrete",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Quando enviar o lembrete da reserva; nulo se não houver lembrete pendente",
+        ),
+    )
+    op.create_index("ix_reservas_proximo_lembrete", "reservas", ["proximo_lembrete"])
+
+    # Agenda o lembrete das reservas futuras, como Reserva.agendar_lembrete
+    if settings.LEMBRETE_MINUTOS_ANTES > 0:
+        op.get_bind().execute(
+            sa.text(
+                "UPDATE reservas SET proximo_lembrete = "
+                "GREATEST(inicio - make_interval(mins => :minutos), :agora) "
+                "WHERE excluido_em IS NULL AND inicio > :agora"
+            ),
+            {"minutos": settings.LEMBRETE_MINUTOS_ANTES, "agora": DateTimeUtils.now()},
+        )
+
+
+def downgrade():
+    op.drop_index("ix_reservas_proximo_lembrete", table_name="reservas")
+    op.drop_column("reservas", "proximo_lembrete")
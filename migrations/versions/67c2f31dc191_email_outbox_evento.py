@@ -0,0 +1,47 @@
+"""Adiciona email_outbox.evento e o índice por destinatário
+
+Revision ID: 67c2f31dc191
+Revises: 12178a0e0312
+Create Date: 2026-10-18 23:31:56
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "67c2f31dc191"
+down_revision = "12178a0e0312"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspetor = sa.inspect(op.get_bind())
+    # Sem a tabela, a subida a cria completa (create_all)
+    if not inspetor.has_table("email_outbox"):
+        return
+
+    colunas = {c["name"] for c in inspetor.get_columns("email_outbox")}
+    if "evento" not in colunas:
+        op.add_column(
+            "email_outbox",
+            sa.Column(
+                "evento",
+                sa.String(50),
+                nullable=True,
+                comment="Evento da notificação; se informado, pode ser agrupada em um resumo",
+            ),
+        )
+    indices = {i["name"] for i in inspetor.get_indexes("email_outbox")}
+    if "ix_email_outbox_destinatario_status" not in indices:
+        op.create_index(
+            "ix_email_outbox_destinatario_status",
+            "email_outbox",
+            ["destinatario", "status"],
+        )
+
+
+def downgrade():
+    op.drop_index("ix_email_outbox_destinatario_status", table_name="email_outbox")
+    op.drop_column("email_outbox", "evento")
@@ -0,0 +1,37 @@
+"""Adiciona usuarios.token_version
+
+Revision ID: abb497388f2f
+Revises: 67c2f31dc191
+Create Date: 2026-10-18 23:32:07
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "abb497388f2f"
+down_revision = "67c2f31dc191"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    colunas = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("usuarios")}
+    if "token_version" in colunas:
+        return
+
+    op.add_column(
+        "usuarios",
+        sa.Column(
+            "token_version",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="Versão dos tokens; incrementada para invalidar os tokens já emitidos",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("usuarios", "token_version")
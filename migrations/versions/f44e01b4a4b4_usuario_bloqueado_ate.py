@@ -0,0 +1,36 @@
+"""Adiciona usuarios.bloqueado_ate
+
+Revision ID: f44e01b4a4b4
+Revises: abb497388f2f
+Create Date: 2026-10-18 23:32:07
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f44e01b4a4b4"
+down_revision = "abb497388f2f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    colunas = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("usuarios")}
+    if "bloqueado_ate" in colunas:
+        return
+
+    op.add_column(
+        "usuarios",
+        sa.Column(
+            "bloqueado_ate",
+            sa.DateTime(),
+            nullable=True,
+            comment="Fim do bloqueio temporário do login por tentativas malsucedidas",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("usuarios", "bloqueado_ate")
@@ -0,0 +1,131 @@
+"""
+Benchmark do EmailClient contra um servidor Mailgun falso local.
+
+Compara o envio antigo (requests.post sem sessão, uma conexão por email)
+com o EmailClient (pool keep-alive do httpx), tanto pela interface síncrona
+usada por várias threads quanto pela interface assíncrona.
+
+Uso:
+    python scripts/benchmark_email_client.py --emails 500 --latencia-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MAILGUN_API_KEY", "benchmark")
+os.environ.setdefault("MAILGUN_DOMAIN", "benchmark.local")
+
+import requests  # noqa: E402
+
+import app.core.di.container  # noqa: E402,F401  (evita import circular de app.core)
+from app.clients.email_client import EmailClient  # noqa: E402
+from app.core.config.settings import settings  # noqa: E402
+
+
+def iniciar_servidor(latencia: float) -> ThreadingHTTPServer:
+    """Sobe um servidor HTTP/1.1 com keep-alive que imita o Mailgun"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latencia)
+            corpo = b'{"id": "<bench@mailgun>", "message": "Queued. Thank you."}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def medir(nome: str, emails: int, funcao) -> None:
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    print(f"{nome:<40} {duracao:8.2f}s {emails / duracao:10.1f} emails/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--latencia-ms", type=float, default=20)
+    parser.add_argument("--threads", type=int, default=settings.EMAIL_MAX_CONCORRENCIA)
+    args = parser.parse_args()
+
+    servidor = iniciar_servidor(args.latencia_ms / 1000)
+    settings.MAILGUN_BASE_URL = f"http://127.0.0.1:{servidor.server_address[1]}"
+    url = f"{settings.MAILGUN_BASE_URL}/{settings.MAILGUN_DOMAIN}/messages"
+    destinatarios = [f"usuario{i}@benchmark.local" for i in range(args.emails)]
+    # Mede o transporte, não a cota: o limitador de envio não deve interferir
+    settings.EMAIL_LIMITE_POR_MINUTO = 60 * 1_000_000
+    settings.EMAIL_LIMITE_RAJADA = args.emails
+    client = EmailClient()
+
+    def requests_sequencial():
+        for email in destinatarios:
+            requests.post(
+                url,
+                auth=("api", settings.MAILGUN_API_KEY),
+                data={"to": email, "subject": "Teste", "text": "Teste"},
+            )
+
+    def requests_threads():
+        def enviar(email):
+            requests.post(
+                url,
+                auth=("api", settings.MAILGUN_API_KEY),
+                data={"to": email, "subject": "Teste", "text": "Teste"},
+            )
+
+        with ThreadPoolExecutor(args.threads) as executor:
+            list(executor.map(enviar, destinatarios))
+
+    def email_client_sequencial():
+        for email in destinatarios:
+            client.send_email(email, "Teste", "Teste")
+
+    def email_client_threads():
+        with ThreadPoolExecutor(args.threads) as executor:
+            list(executor.map(lambda e: client.send_email(e, "Teste", "Teste"), destinatarios))
+
+    def email_client_async():
+        async def enviar_todos():
+            await asyncio.gather(
+                *(client.send_email_async(e, "Teste", "Teste") for e in destinatarios)
+            )
+
+        asyncio.run_coroutine_threadsafe(enviar_todos(), client._loop).result()
+
+    print(
+        f"{args.emails} emails, latência do servidor {args.latencia_ms:.0f} ms, "
+        f"concorrência {args.threads}\n"
+    )
+    medir("requests.post sequencial (antes)", args.emails, requests_sequencial)
+    medir("requests.post em threads", args.emails, requests_threads)
+    medir("EmailClient.send_email sequencial", args.emails, email_client_sequencial)
+    medir("EmailClient.send_email em threads", args.emails, email_client_threads)
+    medir("EmailClient.send_email_async", args.emails, email_client_async)
+
+    client.close()
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
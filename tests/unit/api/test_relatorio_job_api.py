@@ -0,0 +1,110 @@
+import gzip
+import uuid
+import pytest
+
+from app.core.security.auth_dependencies import AuthDependencies
+from app.model.relatorio_job_model import RelatorioJob, StatusRelatorioJob
+from app.model.usuario_model import Usuario
+from app.schema.auth_schema import UsuarioPrincipal
+
+URL = "/api/v1/relatorio/jobs"
+
+
+class TestRelatorioJobApi:
+    """Testes unitários para a API de relatórios em segundo plano"""
+
+    def criar_usuario(self, db_session, super_user=False):
+        sufixo = uuid.uuid4().hex[:8]
+        usuario = Usuario(
+            nome=f"Usuário {sufixo}",
+            email=f"{sufixo}@teste.com",
+            matricula=sufixo,
+            curso="Engenharia de Software",
+            senha="hash",
+            super_user=super_user,
+        )
+        db_session.add(usuario)
+        db_session.commit()
+        return UsuarioPrincipal.model_validate(usuario)
+
+    @pytest.fixture
+    def dono(self, db_session):
+        return self.criar_usuario(db_session)
+
+    @pytest.fixture
+    def outro(self, db_session):
+        return self.criar_usuario(db_session)
+
+    @pytest.fixture
+    def admin(self, db_session):
+        return self.criar_usuario(db_session, super_user=True)
+
+    def como(self, client, usuario):
+        client.app.dependency_overrides[AuthDependencies.get_current_user] = (
+            lambda: usuario
+        )
+        return client
+
+    def concluir(self, db_session, job_id, conteudo=b'{"total": 1}'):
+        job = db_session.get(RelatorioJob, uuid.UUID(job_id))
+        job.status = StatusRelatorioJob.CONCLUIDO
+        job.resultado = gzip.compress(conteudo)
+        db_session.commit()
+
+    def test_job_visivel_apenas_para_o_dono_e_super_usuarios(
+        self, client, db_session, dono, outro, admin
+    ):
+        """Testa que outro usuário recebe 404 no status e no download"""
+        job_id = (
+            self.como(client, dono).post(URL, json={"tipo": "dashboard"}).json()["id"]
+        )
+        self.concluir(db_session, job_id)
+
+        assert self.como(client, dono).get(f"{URL}/{job_id}").status_code == 200
+        download = client.get(f"{URL}/{job_id}/download")
+        assert (download.status_code, download.json()) == (200, {"total": 1})
+
+        self.como(client, outro)
+        assert client.get(f"{URL}/{job_id}").status_code == 404
+        assert client.get(f"{URL}/{job_id}/download").status_code == 404
+
+        self.como(client, admin)
+        assert client.get(f"{URL}/{job_id}").status_code == 200
+        assert client.get(f"{URL}/{job_id}/download").status_code == 200
+
+    def test_reaproveitamento_nao_entrega_job_de_outro_usuario(
+        self, client, dono, outro
+    ):
+        """Testa que solicitações idênticas de usuários diferentes geram jobs distintos"""
+        primeiro = self.como(client, dono).post(URL, json={"tipo": "dashboard"})
+        repetido = client.post(URL, json={"tipo": "dashboard"})
+        segundo = self.como(client, outro).post(URL, json={"tipo": "dashboard"})
+
+        assert primeiro.json()["id"] == repetido.json()["id"]
+        assert segundo.json()["id"] != primeiro.json()["id"]
+        assert client.get(f"{URL}/{segundo.json()['id']}").status_code == 200
+
+    def test_uso_salas_restrito_a_super_usuarios(self, client, db_session, dono, admin):
+        """Testa a restrição do relatório de uso das salas na criação e na leitura"""
+        dados = {
+            "tipo": "uso_salas",
+            "parametros": {"data_inicio": "2025-01-01", "data_fim": "2025-01-31"},
+        }
+        assert self.como(client, dono).post(URL, json=dados).status_code == 401
+
+        job_id = self.como(client, admin).post(URL, json=dados).json()["id"]
+        self.concluir(db_session, job_id)
+        # Mesmo que o job seja do usuário, deixar de ser super usuário corta o acesso
+        job = db_session.get(RelatorioJob, uuid.UUID(job_id))
+        job.solicitado_por_id = dono.id
+        db_session.commit()
+
+        assert self.como(client, dono).get(f"{URL}/{job_id}").status_code == 404
+        assert client.get(f"{URL}/{job_id}/download").status_code == 404
+        assert self.como(client, admin).get(f"{URL}/{job_id}").status_code == 200
+
+    def test_job_inexistente(self, client, admin):
+        """Testa que um ID desconhecido retorna 404"""
+        self.como(client, admin)
+
+        assert client.get(f"{URL}/{uuid.uuid4()}").status_code == 404
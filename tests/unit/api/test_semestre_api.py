@@ -0,0 +1,46 @@
+import uuid
+
+from app.core.security.auth_dependencies import AuthDependencies
+from app.model.semestre_model import Semestre
+from app.schema.auth_schema import UsuarioPrincipal
+
+URL = "/api/v1/semestre"
+
+
+class TestSemestreApi:
+    """Testes unitários para as rotas de semestre restritas a super usuários"""
+
+    def como(self, client, super_user):
+        usuario = UsuarioPrincipal(
+            id=uuid.uuid4(),
+            super_user=super_user,
+            curso="Engenharia de Software",
+            token_version=0,
+            ativo=True,
+            bloqueado=False,
+        )
+        client.app.dependency_overrides[AuthDependencies.get_current_user] = (
+            lambda: usuario
+        )
+        return client
+
+    def test_super_usuario_acessa_rota_restrita(self, client, db_session):
+        """Testa que um super usuário cria e consulta um semestre"""
+        dados = {
+            "identificador": "2025.1",
+            "data_inicio": "2025-02-01",
+            "data_fim": "2025-06-30",
+        }
+
+        criado = self.como(client, super_user=True).post(URL, json=dados)
+        assert criado.status_code == 200
+        semestre_id = (
+            db_session.query(Semestre.id).filter_by(identificador="2025.1").scalar()
+        )
+
+        obtido = client.get(f"{URL}/{semestre_id}")
+        assert obtido.status_code == 200
+        assert obtido.json()["dados"]["identificador"] == "2025.1"
+
+        negado = self.como(client, super_user=False).get(f"{URL}/{semestre_id}")
+        assert negado.status_code == 401
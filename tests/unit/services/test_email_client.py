@@ -0,0 +1,95 @@
+import httpx
+import pytest
+
+from app.clients.email_client import EmailClient, PrioridadeEmail
+from app.core.config.settings import settings
+
+
+def responder(*respostas):
+    """
+    Handler do MockTransport que devolve as respostas em ordem.
+    Exceções são levantadas como falhas de transporte.
+    """
+    chamadas = []
+
+    def handler(request):
+        resposta = respostas[len(chamadas)]
+        chamadas.append(request)
+        if isinstance(resposta, type) and issubclass(resposta, Exception):
+            raise resposta("falha simulada", request=request)
+        if isinstance(resposta, int):
+            return httpx.Response(resposta, text=f"status {resposta}")
+        return httpx.Response(200, json=resposta)
+
+    return handler, chamadas
+
+
+class TestPoliticaDeRepeticao:
+    """Testes unitários da repetição de envios ao Mailgun"""
+
+    @pytest.fixture
+    def email_client(self, monkeypatch):
+        monkeypatch.setattr(settings, "EMAIL_MAX_TENTATIVAS", 3)
+        monkeypatch.setattr(settings, "EMAIL_BACKOFF_SEGUNDOS", 0)
+        client = EmailClient()
+        yield client
+        client.close()
+
+    def post(self, email_client, handler):
+        email_client._executar(email_client._client.aclose())
+        email_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return email_client._executar(
+            email_client._post(
+                {"to": "a@teste.com"}, "Erro ao enviar", 1, PrioridadeEmail.LOTE
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "falha", [httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout]
+    )
+    def test_repete_erros_de_conexao(self, email_client, falha):
+        """Testa que falhas antes do envio são repetidas"""
+        handler, chamadas = responder(falha, falha, {"id": "<ok>"})
+
+        assert self.post(email_client, handler) == {"id": "<ok>"}
+        assert len(chamadas) == 3
+
+    @pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+    def test_repete_429_e_5xx(self, email_client, status):
+        """Testa que respostas temporárias do Mailgun são repetidas"""
+        handler, chamadas = responder(status, {"id": "<ok>"})
+
+        assert self.post(email_client, handler) == {"id": "<ok>"}
+        assert len(chamadas) == 2
+
+    def test_desiste_apos_ultima_tentativa(self, email_client):
+        """Testa que o erro é propagado ao esgotar as tentativas"""
+        handler, chamadas = responder(503, 503, 503)
+
+        with pytest.raises(Exception, match="status 503"):
+            self.post(email_client, handler)
+        assert len(chamadas) == 3
+
+    def test_nao_repete_erro_do_cliente(self, email_client):
+        """Testa que respostas 4xx (exceto 429) não são repetidas"""
+        handler, chamadas = responder(400)
+
+        with pytest.raises(Exception, match="status 400"):
+            self.post(email_client, handler)
+        assert len(chamadas) == 1
+
+    @pytest.mark.parametrize("falha", [httpx.ReadTimeout, httpx.RemoteProtocolError])
+    def test_nao_repete_falha_apos_envio(self, email_client, falha):
+        """Testa que falhas com a mensagem possivelmente aceita não são repetidas"""
+        handler, chamadas = responder(falha, {"id": "<duplicada>"})
+
+        with pytest.raises(Exception, match="falha simulada"):
+            self.post(email_client, handler)
+        assert len(chamadas) == 1
+
+    def test_rejeita_max_tentativas_invalido(self, monkeypatch):
+        """Testa que EMAIL_MAX_TENTATIVAS menor que 1 é rejeitado"""
+        monkeypatch.setattr(settings, "EMAIL_MAX_TENTATIVAS", 0)
+
+        with pytest.raises(ValueError, match="EMAIL_MAX_TENTATIVAS"):
+            EmailClient()
@@ -0,0 +1,130 @@
+import pytest
+
+from app.core.config.settings import settings
+from app.schema.email_schema import DestinatarioEmail, ModeloEmail
+from app.services import email_service as email_service_module
+from app.services.email_service import EmailService
+
+
+class StubEmailClient:
+    """Cliente de email que registra os lotes e falha nos lotes marcados"""
+
+    def __init__(self):
+        self.lotes = []
+        self.chamadas = []
+
+    def send_batch_emails(
+        self, recipients, subject_template, text_template, html_template=None
+    ):
+        numero = len(self.lotes) + 1
+        self.chamadas.append(
+            (recipients, subject_template, text_template, html_template)
+        )
+        self.lotes.append((subject_template, list(recipients)))
+        if any("falha" in email for email in recipients):
+            raise RuntimeError("Mailgun indisponível")
+        return {"id": f"<lote-{numero}@mailgun>"}
+
+
+def destinatarios(*emails):
+    return [
+        DestinatarioEmail(email=email, variaveis={"nome": email}) for email in emails
+    ]
+
+
+class TestEnvioEmLote:
+    """Testes unitários para o envio de emails em lote"""
+
+    @pytest.fixture
+    def client(self):
+        return StubEmailClient()
+
+    @pytest.fixture
+    def service(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "EMAIL_LIMITE_RAJADA", 50)
+        monkeypatch.setattr(email_service_module, "TAMANHO_LOTE_EMAIL", 3)
+        return EmailService(
+            email_client=client, email_outbox_repository=None, email_templates=None
+        )
+
+    @pytest.fixture
+    def modelo(self):
+        return ModeloEmail(assunto="Aviso", texto="Olá %recipient.nome%")
+
+    def test_divide_nos_limites_do_lote(self, service, client, modelo):
+        """Testa que os lotes têm no máximo TAMANHO_LOTE_EMAIL destinatários"""
+        emails = [f"u{i}@teste.com" for i in range(7)]
+
+        resultados = service.enviar_em_lote(modelo, destinatarios(*emails))
+
+        assert [len(lote) for _, lote in client.lotes] == [3, 3, 1]
+        assert [email for _, lote in client.lotes for email in lote] == emails
+        assert set(resultados) == set(emails)
+        assert resultados["u6@teste.com"].mensagem_id == "<lote-3@mailgun>"
+
+    def test_lote_exato_nao_gera_envio_vazio(self, service, client, modelo):
+        """Testa que um múltiplo exato do tamanho não envia lote vazio"""
+        service.enviar_em_lote(
+            modelo, destinatarios(*[f"u{i}@teste.com" for i in range(6)])
+        )
+
+        assert [len(lote) for _, lote in client.lotes] == [3, 3]
+
+    def test_rajada_limita_tamanho_do_lote(self, service, client, modelo, monkeypatch):
+        """Testa que o lote não passa da rajada do limitador de envio"""
+        monkeypatch.setattr(settings, "EMAIL_LIMITE_RAJADA", 2)
+
+        service.enviar_em_lote(
+            modelo, destinatarios(*[f"u{i}@teste.com" for i in range(5)])
+        )
+
+        assert [len(lote) for _, lote in client.lotes] == [2, 2, 1]
+
+    def test_falha_marca_apenas_o_lote(self, service, client, modelo):
+        """Testa que a falha de um lote não afeta os demais destinatários"""
+        emails = ["a@teste.com", "falha@teste.com", "b@teste.com", "c@teste.com"]
+
+        resultados = service.enviar_em_lote(modelo, destinatarios(*emails))
+
+        for email in emails[:3]:
+            assert resultados[email].enviado is False
+            assert resultados[email].erro == "Mailgun indisponível"
+        assert resultados["c@teste.com"].enviado is True
+        assert resultados["c@teste.com"].mensagem_id == "<lote-2@mailgun>"
+
+    def test_enviar_lote_repassa_modelo(self, service, client):
+        """Testa que o lote envia as variáveis e os textos do modelo"""
+        modelo = ModeloEmail(assunto="Assunto", texto="Texto", html="<p>Html</p>")
+
+        resultados = service._enviar_lote(modelo, destinatarios("a@teste.com"))
+
+        assert client.chamadas == [
+            (
+                {"a@teste.com": {"nome": "a@teste.com"}},
+                "Assunto",
+                "Texto",
+                "<p>Html</p>",
+            )
+        ]
+        assert resultados["a@teste.com"].enviado is True
+
+    def test_agrupa_por_modelo(self, service, client):
+        """Testa que mensagens com o mesmo modelo seguem no mesmo lote"""
+        aviso = ModeloEmail(assunto="Aviso", texto="Texto")
+        lembrete = ModeloEmail(assunto="Lembrete", texto="Texto")
+        a, b, c = destinatarios("a@teste.com", "b@teste.com", "c@teste.com")
+
+        resultados = service.enviar_agrupado(
+            [
+                (aviso, a),
+                (lembrete, b),
+                (ModeloEmail(assunto="Aviso", texto="Texto"), c),
+            ]
+        )
+
+        assert client.lotes == [
+            ("Aviso", ["a@teste.com", "c@teste.com"]),
+            ("Lembrete", ["b@teste.com"]),
+        ]
+        assert all(resultado.enviado for resultado in resultados.values())
+        assert set(resultados) == {"a@teste.com", "b@teste.com", "c@teste.com"}
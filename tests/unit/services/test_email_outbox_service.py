@@ -0,0 +1,182 @@
+import threading
+import pytest
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from sqlalchemy.orm import sessionmaker
+
+from app.clients.email_client import EmailClient
+from app.core.config.settings import settings
+from app.model.email_outbox_model import EmailOutbox, StatusEmailOutbox
+from app.services.email_outbox_service import EmailOutboxService
+from app.util.datetime_utils import DateTimeUtils
+from app.util.email_templates import EmailTemplates
+
+
+class FakeMailgunHandler(BaseHTTPRequestHandler):
+    """Servidor HTTP falso do Mailgun: falha para destinatários com 'falha'"""
+
+    recebidos = []
+    assuntos = []
+
+    def do_POST(self):
+        tamanho = int(self.headers.get("Content-Length", 0))
+        dados = parse_qs(self.rfile.read(tamanho).decode("utf-8"))
+        destinatario = dados["to"][0]
+        FakeMailgunHandler.recebidos.append(destinatario)
+        FakeMailgunHandler.assuntos.append(dados["subject"][0])
+
+        status = 500 if "falha" in destinatario else 200
+        corpo = b'{"id": "<fake@mailgun>", "message": "Queued. Thank you."}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestEmailOutboxService:
+    """Testes unitários para a entrega da caixa de saída de emails"""
+
+    @pytest.fixture
+    def fake_mailgun(self):
+        FakeMailgunHandler.recebidos = []
+        FakeMailgunHandler.assuntos = []
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), FakeMailgunHandler)
+        thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{servidor.server_address[1]}"
+        servidor.shutdown()
+        servidor.server_close()
+
+    @pytest.fixture
+    def session_factory(self, engine):
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        yield factory
+        with factory() as session:
+            session.query(EmailOutbox).delete()
+            session.commit()
+
+    @pytest.fixture
+    def service(self, session_factory, fake_mailgun, monkeypatch):
+        monkeypatch.setattr(settings, "MAILGUN_BASE_URL", fake_mailgun)
+        # As novas tentativas ficam a cargo da caixa de saída, não do cliente
+        monkeypatch.setattr(settings, "EMAIL_MAX_TENTATIVAS", 1)
+        client = EmailClient()
+        yield EmailOutboxService(session_factory, client, EmailTemplates())
+        client.close()
+
+    def _enfileirar(
+        self, session_factory, destinatario: str, evento: str = None, **campos
+    ) -> EmailOutbox:
+        with session_factory() as session:
+            mensagem = EmailOutbox(
+                destinatario=destinatario,
+                assunto=campos.pop("assunto", "Assunto"),
+                texto="Texto",
+                evento=evento,
+                **campos,
+            )
+            session.add(mensagem)
+            session.commit()
+            return mensagem
+
+    def _recarregar(self, session_factory, mensagem: EmailOutbox) -> EmailOutbox:
+        with session_factory() as session:
+            return session.get(EmailOutbox, mensagem.id)
+
+    def test_entrega_mensagem_pendente(self, service, session_factory):
+        """Testa a entrega bem-sucedida de uma mensagem pendente"""
+        mensagem = self._enfileirar(session_factory, "ok@teste.com")
+
+        assert service.entregar_pendentes() == 1
+
+        mensagem = self._recarregar(session_factory, mensagem)
+        assert mensagem.status == StatusEmailOutbox.ENVIADO
+        assert mensagem.tentativas == 1
+        assert mensagem.enviado_em is not None
+        assert FakeMailgunHandler.recebidos == ["ok@teste.com"]
+
+    def test_falha_agenda_nova_tentativa_com_backoff(self, service, session_factory):
+        """Testa que uma falha mantém a mensagem pendente com backoff exponencial"""
+        mensagem = self._enfileirar(session_factory, "falha@teste.com")
+
+        service.entregar_pendentes()
+
+        mensagem = self._recarregar(session_factory, mensagem)
+        assert mensagem.status == StatusEmailOutbox.PENDENTE
+        assert mensagem.tentativas == 1
+        assert mensagem.ultimo_erro
+        assert mensagem.proxima_tentativa > DateTimeUtils.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_BACKOFF_SEGUNDOS - 5
+        )
+
+        # Ainda não venceu a próxima tentativa
+        assert service.entregar_pendentes() == 0
+
+    def test_dead_letter_apos_max_tentativas(
+        self, service, session_factory, monkeypatch
+    ):
+        """Testa que a mensagem vai para FALHA ao esgotar as tentativas"""
+        monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_TENTATIVAS", 3)
+        monkeypatch.setattr(settings, "EMAIL_OUTBOX_BACKOFF_SEGUNDOS", 0)
+        mensagem = self._enfileirar(session_factory, "falha@teste.com")
+
+        for _ in range(5):
+            service.entregar_pendentes()
+
+        mensagem = self._recarregar(session_factory, mensagem)
+        assert mensagem.status == StatusEmailOutbox.FALHA
+        assert mensagem.tentativas == 3
+        assert len(FakeMailgunHandler.recebidos) == 3
+
+    def test_agrupa_notificacoes_do_mesmo_destinatario(self, service, session_factory):
+        """Testa que notificações agrupáveis pendentes viram um único resumo"""
+        variaveis = {
+            "nome": "Maria",
+            "sala": "A101",
+            "bloco": "Bloco A",
+            "data_inicio": "02/03/2026",
+            "data_fim": "30/06/2026",
+            "hora_inicio": "08:00",
+            "hora_fim": "10:00",
+            "frequencia": "SEMANAL",
+            "motivo": "Aula",
+        }
+        vencida = self._enfileirar(
+            session_factory,
+            "maria@teste.com",
+            evento="reserva_recorrente_atualizada",
+            assunto="Reserva recorrente atualizada - A101",
+            variaveis=variaveis,
+        )
+        # Ainda dentro da janela de agrupamento
+        na_janela = self._enfileirar(
+            session_factory,
+            "maria@teste.com",
+            evento="reservas_recriadas",
+            assunto="Reservas recriadas - A101",
+            variaveis=variaveis,
+            proxima_tentativa=DateTimeUtils.now() + timedelta(minutes=5),
+        )
+        outro_usuario = self._enfileirar(
+            session_factory,
+            "joao@teste.com",
+            evento="reservas_recriadas",
+            proxima_tentativa=DateTimeUtils.now() + timedelta(minutes=5),
+        )
+
+        assert service.entregar_pendentes() == 1
+
+        assert FakeMailgunHandler.recebidos == ["maria@teste.com"]
+        assert FakeMailgunHandler.assuntos == [
+            "Resumo das alterações nas suas reservas (2)"
+        ]
+        for mensagem in (vencida, na_janela):
+            mensagem = self._recarregar(session_factory, mensagem)
+            assert mensagem.status == StatusEmailOutbox.ENVIADO
+        outro_usuario = self._recarregar(session_factory, outro_usuario)
+        assert outro_usuario.status == StatusEmailOutbox.PENDENTE
@@ -0,0 +1,243 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.model.bloco_model import Bloco
+from app.model.ocupacao_cubo_model import (
+    OcupacaoCubo,
+    OcupacaoCuboFato,
+    OcupacaoCuboMarca,
+    OcupacaoCuboRemocao,
+)
+from app.model.reserva_model import Reserva
+from app.model.sala_model import Sala
+from app.model.usuario_model import Usuario
+from app.repository.ocupacao_cubo_repository import OcupacaoCuboRepository
+from app.services.ocupacao_cubo_service import MARCA_CUBO, OcupacaoCuboService
+
+# Segunda-feira, fora de qualquer semestre cadastrado
+INICIO = datetime(2030, 3, 4, 8, 0)
+
+
+class TestOcupacaoCuboService:
+    """Testes da atualização incremental do cubo de ocupação"""
+
+    @pytest.fixture
+    def session_factory(self, engine):
+        return sessionmaker(bind=engine, expire_on_commit=False)
+
+    @pytest.fixture
+    def service(self, session_factory):
+        return OcupacaoCuboService(
+            ocupacao_cubo_repository=OcupacaoCuboRepository(session_factory()),
+            session_factory=session_factory,
+        )
+
+    @pytest.fixture(autouse=True)
+    def limpar_cubo(self, session_factory):
+        def limpar():
+            with session_factory() as session:
+                for modelo in (
+                    OcupacaoCubo,
+                    OcupacaoCuboFato,
+                    OcupacaoCuboMarca,
+                    OcupacaoCuboRemocao,
+                ):
+                    session.query(modelo).delete()
+                session.commit()
+
+        limpar()
+        yield
+        limpar()
+
+    @pytest.fixture
+    def sala(self, session_factory):
+        sufixo = uuid.uuid4().hex[:6]
+        with session_factory() as session:
+            sala = Sala(
+                bloco=Bloco(nome=f"Bloco {sufixo}", identificacao=f"B{sufixo}"),
+                identificacao_sala=f"S{sufixo}",
+                capacidade_maxima=40,
+            )
+            session.add(sala)
+            session.commit()
+        yield sala
+        with session_factory() as session:
+            session.query(Sala).filter(Sala.id == sala.id).delete()
+            session.query(Bloco).filter(Bloco.id == sala.bloco_id).delete()
+            session.commit()
+
+    @pytest.fixture
+    def usuario(self, session_factory):
+        sufixo = uuid.uuid4().hex[:6]
+        with session_factory() as session:
+            usuario = Usuario(
+                nome="Coordenador Cubo",
+                email=f"cubo{sufixo}@teste.com",
+                matricula=f"C{sufixo}",
+                curso="Engenharia",
+                senha="hash",
+            )
+            session.add(usuario)
+            session.commit()
+        yield usuario
+        with session_factory() as session:
+            session.query(Reserva).filter(Reserva.usuario_id == usuario.id).delete()
+            session.query(Usuario).filter(Usuario.id == usuario.id).delete()
+            session.commit()
+
+    def criar_reserva(self, session_factory, sala, usuario, horas=2):
+        with session_factory() as session:
+            reserva = Reserva(
+                sala_id=sala.id,
+                usuario_id=usuario.id,
+                inicio=INICIO,
+                fim=INICIO + timedelta(hours=horas),
+            )
+            session.add(reserva)
+            session.commit()
+        return reserva
+
+    def alterar_reserva(self, session_factory, reserva_id, **valores):
+        with session_factory() as session:
+            reserva = session.get(Reserva, reserva_id)
+            for nome, valor in valores.items():
+                setattr(reserva, nome, valor)
+            session.commit()
+
+    def celulas(self, session_factory, sala):
+        """Retorna {hora: (quantidade, minutos)} das células da sala"""
+        with session_factory() as session:
+            linhas = session.query(
+                OcupacaoCubo.hora,
+                OcupacaoCubo.quantidade_reservas,
+                OcupacaoCubo.minutos_reservados,
+            ).filter(OcupacaoCubo.sala_id == sala.id)
+            return {hora: (quantidade, minutos) for hora, quantidade, minutos in linhas}
+
+    def contar(self, session_factory, modelo):
+        with session_factory() as session:
+            return session.query(modelo).count()
+
+    def test_primeira_execucao_monta_cubo_e_marca(
+        self, service, session_factory, sala, usuario
+    ):
+        """Testa que a primeira execução processa tudo e grava a marca d'água"""
+        reserva = self.criar_reserva(session_factory, sala, usuario, horas=2.5)
+
+        assert service.atualizar_incremental() >= 1
+
+        assert self.celulas(session_factory, sala) == {
+            8: (1, 60),
+            9: (1, 60),
+            10: (1, 30),
+        }
+        with session_factory() as session:
+            marca = OcupacaoCuboRepository(session).get_marca(MARCA_CUBO)
+            atualizado_em = session.get(Reserva, reserva.id).atualizado_em
+        assert marca >= atualizado_em
+
+    def test_marca_ignora_reservas_ja_processadas(
+        self, service, session_factory, sala, usuario
+    ):
+        """Testa que reservas anteriores à marca d'água não são reprocessadas"""
+        reserva = self.criar_reserva(session_factory, sala, usuario)
+        service.atualizar_incremental()
+
+        # Alteração que a marca d'água não enxerga: atualizado_em no passado
+        with session_factory() as session:
+            session.query(Reserva).filter(Reserva.id == reserva.id).update(
+                {
+                    Reserva.fim: INICIO + timedelta(hours=1),
+                    Reserva.atualizado_em: datetime(2000, 1, 1),
+                }
+            )
+            session.commit()
+        service.atualizar_incremental()
+        assert self.celulas(session_factory, sala) == {8: (1, 60), 9: (1, 60)}
+
+        # Dentro da margem, reprocessar não duplica a contribuição
+        self.alterar_reserva(session_factory, reserva.id, motivo="Aula")
+        service.atualizar_incremental()
+        service.atualizar_incremental()
+        assert self.celulas(session_factory, sala) == {8: (1, 60)}
+
+    def test_alteracao_subtrai_contribuicao_antiga(
+        self, service, session_factory, sala, usuario
+    ):
+        """Testa que alterar uma reserva substitui a contribuição anterior"""
+        reserva = self.criar_reserva(session_factory, sala, usuario)
+        self.criar_reserva(session_factory, sala, usuario, horas=1)
+        service.atualizar_incremental()
+        assert self.celulas(session_factory, sala) == {8: (2, 120), 9: (1, 60)}
+
+        self.alterar_reserva(
+            session_factory,
+            reserva.id,
+            inicio=INICIO + timedelta(hours=1),
+            fim=INICIO + timedelta(hours=1, minutes=45),
+        )
+        service.atualizar_incremental()
+
+        assert self.celulas(session_factory, sala) == {8: (1, 60), 9: (1, 45)}
+
+    def test_cancelamento_remove_contribuicao(
+        self, service, session_factory, sala, usuario
+    ):
+        """Testa que a exclusão lógica retira a reserva do cubo"""
+        reserva = self.criar_reserva(session_factory, sala, usuario)
+        self.criar_reserva(session_factory, sala, usuario, horas=1)
+        service.atualizar_incremental()
+
+        self.alterar_reserva(session_factory, reserva.id, excluido_em=datetime.now())
+        service.atualizar_incremental()
+
+        assert self.celulas(session_factory, sala) == {8: (1, 60)}
+        with session_factory() as session:
+            fatos = OcupacaoCuboRepository(session).get_fatos_por_reservas([reserva.id])
+        assert fatos == []
+
+    def test_remocao_fisica_limpa_fatos(self, service, session_factory, sala, usuario):
+        """Testa que a reserva apagada entra na fila e sai do cubo"""
+        reserva = self.criar_reserva(session_factory, sala, usuario)
+        self.criar_reserva(session_factory, sala, usuario, horas=1)
+        service.atualizar_incremental()
+
+        with session_factory() as session:
+            session.query(Reserva).filter(Reserva.id == reserva.id).delete()
+            session.commit()
+            assert OcupacaoCuboRepository(session).get_reservas_removidas() == [
+                reserva.id
+            ]
+
+        service.atualizar_incremental()
+
+        assert self.celulas(session_factory, sala) == {8: (1, 60)}
+        assert self.contar(session_factory, OcupacaoCuboRemocao) == 0
+        with session_factory() as session:
+            assert (
+                session.query(OcupacaoCuboFato)
+                .filter(OcupacaoCuboFato.reserva_id == reserva.id)
+                .count()
+                == 0
+            )
+
+    def test_remocao_em_cascata_limpa_fatos(
+        self, service, session_factory, sala, usuario
+    ):
+        """Testa que reservas apagadas em cascata pela sala também saem do cubo"""
+        self.criar_reserva(session_factory, sala, usuario)
+        self.criar_reserva(session_factory, sala, usuario, horas=1)
+        service.atualizar_incremental()
+
+        with session_factory() as session:
+            session.query(Sala).filter(Sala.id == sala.id).delete()
+            session.commit()
+        assert self.contar(session_factory, OcupacaoCuboRemocao) == 2
+
+        service.atualizar_incremental()
+
+        assert self.celulas(session_factory, sala) == {}
+        assert self.contar(session_factory, OcupacaoCuboFato) == 0
+        assert self.contar(session_factory, OcupacaoCuboRemocao) == 0
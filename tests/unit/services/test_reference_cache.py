@@ -0,0 +1,80 @@
+import uuid
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.reference_cache import BLOCOS, SALAS, ReferenceDataCache
+from app.model.bloco_model import Bloco
+from app.model.sala_model import Sala
+
+
+class TestReferenceDataCache:
+    """Testes unitários para o cache dos dados de referência"""
+
+    @pytest.fixture
+    def session_factory(self, engine):
+        return sessionmaker(bind=engine, expire_on_commit=False)
+
+    @pytest.fixture
+    def backend(self):
+        return MemoryCacheBackend(max_entries=16)
+
+    @pytest.fixture
+    def sala(self, session_factory):
+        sufixo = uuid.uuid4().hex[:6]
+        with session_factory() as session:
+            bloco = Bloco(nome=f"Bloco {sufixo}", identificacao=f"B{sufixo}")
+            sala = Sala(
+                bloco=bloco,
+                identificacao_sala=f"S{sufixo}",
+                capacidade_maxima=40,
+                recursos=["projetor"],
+            )
+            session.add(sala)
+            session.commit()
+        yield sala
+        with session_factory() as session:
+            session.query(Sala).filter(Sala.id == sala.id).delete()
+            session.query(Bloco).filter(Bloco.id == sala.bloco_id).delete()
+            session.commit()
+
+    def renomear_bloco(self, session_factory, bloco_id, nome):
+        with session_factory() as session:
+            session.get(Bloco, bloco_id).nome = nome
+            session.commit()
+
+    def test_snapshot_imutavel_e_reaproveitado(self, session_factory, backend, sala):
+        """Testa que a sala é lida uma vez e devolvida como cópia imutável"""
+        cache = ReferenceDataCache(session_factory, backend, ttl_seconds=60)
+
+        snapshot = cache.get_sala(sala.id)
+
+        assert snapshot.identificacao_sala == sala.identificacao_sala
+        assert snapshot.recursos == ("projetor",)
+        assert snapshot.bloco.id == sala.bloco_id
+        assert cache.get_sala(sala.id) is snapshot
+        with pytest.raises(ValidationError):
+            snapshot.capacidade_maxima = 10
+
+    def test_invalidar_bloco_descarta_salas(self, session_factory, backend, sala):
+        """Testa que alterar um bloco invalida as salas que o incluem"""
+        cache = ReferenceDataCache(session_factory, backend, ttl_seconds=60)
+        antes = cache.get_sala(sala.id)
+
+        self.renomear_bloco(session_factory, sala.bloco_id, "Bloco Renomeado")
+        assert cache.get_sala(sala.id) is antes
+
+        cache.invalidar(BLOCOS)
+
+        assert cache.versao(SALAS) == 1
+        assert cache.get_sala(sala.id).bloco.nome == "Bloco Renomeado"
+
+    def test_ausencia_nao_e_guardada(self, session_factory, backend):
+        """Testa que registros inexistentes não ficam em cache"""
+        cache = ReferenceDataCache(session_factory, backend, ttl_seconds=60)
+
+        assert cache.get_sala(uuid.uuid4()) is None
+        assert cache.get_bloco(uuid.uuid4()) is None
+        assert cache.get_semestre("2099.9") is None
+        assert len(backend) == 0
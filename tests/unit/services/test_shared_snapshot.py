@@ -0,0 +1,121 @@
+import os
+import time
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache.backend import AUSENTE
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.reference_cache import BLOCOS, SALAS, ReferenceDataCache
+from app.core.cache.shared_snapshot import SharedReferenceSnapshot
+from app.model.bloco_model import Bloco
+from app.model.sala_model import Sala
+
+
+class TestSharedReferenceSnapshot:
+    """Testes unitários para o snapshot de referência compartilhado"""
+
+    @pytest.fixture
+    def session_factory(self, engine):
+        return sessionmaker(bind=engine, expire_on_commit=False)
+
+    @pytest.fixture
+    def caminho(self, tmp_path):
+        return str(tmp_path / "referencia.snap")
+
+    @pytest.fixture
+    def sala(self, session_factory):
+        sufixo = uuid.uuid4().hex[:6]
+        with session_factory() as session:
+            bloco = Bloco(nome=f"Bloco {sufixo}", identificacao=f"B{sufixo}")
+            sala = Sala(
+                bloco=bloco,
+                identificacao_sala=f"S{sufixo}",
+                capacidade_maxima=40,
+                recursos=["projetor"],
+            )
+            session.add(sala)
+            session.commit()
+        yield sala
+        with session_factory() as session:
+            session.query(Sala).filter(Sala.id == sala.id).delete()
+            session.query(Bloco).filter(Bloco.id == sala.bloco_id).delete()
+            session.commit()
+
+    def alterar(self, session_factory, cache, bloco_id, nome):
+        with session_factory() as session:
+            session.get(Bloco, bloco_id).nome = nome
+            cache.registrar_alteracao(session)
+            session.commit()
+        cache.invalidar(BLOCOS)
+
+    def aguardar(self, condicao, timeout=5):
+        limite = time.monotonic() + timeout
+        while not condicao():
+            assert time.monotonic() < limite
+            time.sleep(0.01)
+
+    def test_workers_compartilham_o_arquivo(self, session_factory, caminho, sala):
+        """Testa que o snapshot construído pelo dono é lido pelos outros"""
+        primeiro = SharedReferenceSnapshot(caminho, session_factory)
+        segundo = SharedReferenceSnapshot(caminho, session_factory)
+
+        assert primeiro.carregar()
+        publicado = os.stat(caminho).st_ino
+        assert segundo.carregar()
+
+        snapshot = primeiro.get(SALAS, sala.id)
+        assert snapshot.recursos == ("projetor",)
+        assert segundo.get(SALAS, sala.id) == snapshot
+        assert segundo.get(BLOCOS, sala.bloco_id).id == sala.bloco_id
+        assert segundo.get(SALAS, uuid.uuid4()) is AUSENTE
+        assert date(date.today().year, 12, 25) in segundo.feriados()
+        # Só o primeiro reconstrói; o segundo apenas mapeou o arquivo
+        assert (primeiro._trava is not None, segundo._trava) == (True, None)
+        assert os.stat(caminho).st_ino == publicado
+
+    def test_invalidar_republica_o_snapshot(self, session_factory, caminho, sala):
+        """Testa que o dono reconstrói o arquivo e os outros passam a lê-lo"""
+        snapshot = SharedReferenceSnapshot(caminho, session_factory)
+        outro = SharedReferenceSnapshot(caminho, session_factory)
+        cache = ReferenceDataCache(
+            session_factory, MemoryCacheBackend(), ttl_seconds=60, snapshot=snapshot
+        )
+        assert snapshot.carregar() and outro.carregar()
+        assert outro.get(SALAS, sala.id).bloco.nome == sala.bloco.nome
+
+        self.alterar(session_factory, cache, sala.bloco_id, "Bloco Renomeado")
+        # Notificação recebida pelo outro processo
+        outro.invalidar()
+
+        assert cache.get_sala(sala.id).bloco.nome == "Bloco Renomeado"
+        self.aguardar(lambda: outro.get(SALAS, sala.id) is not AUSENTE)
+        assert outro.get(SALAS, sala.id).bloco.nome == "Bloco Renomeado"
+        assert outro._trava is None
+
+    def test_snapshot_da_geracao_atual_e_reaproveitado(
+        self, session_factory, caminho, sala
+    ):
+        """Testa que um arquivo de outra execução vale enquanto nada mudou"""
+        SharedReferenceSnapshot(caminho, session_factory).publicar()
+        publicado = os.stat(caminho).st_ino
+
+        novo = SharedReferenceSnapshot(caminho, session_factory)
+
+        assert novo.get(SALAS, sala.id).id == sala.id
+        assert os.stat(caminho).st_ino == publicado
+
+    def test_snapshot_de_geracao_anterior_e_ignorado(
+        self, session_factory, caminho, sala
+    ):
+        """Testa que um arquivo anterior à última alteração não é usado"""
+        SharedReferenceSnapshot(caminho, session_factory).publicar()
+        cache = ReferenceDataCache(session_factory, MemoryCacheBackend(), 60)
+        self.alterar(session_factory, cache, sala.bloco_id, "Bloco Renomeado")
+
+        novo = SharedReferenceSnapshot(caminho, session_factory)
+        assert novo.carregar()
+
+        assert novo.get(SALAS, sala.id).bloco.nome == "Bloco Renomeado"
@@ -0,0 +1,99 @@
+import time
+import uuid
+import pytest
+from datetime import timedelta
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security.token_revocation import TokenRevocationList
+from app.model.token_revogado_model import TokenRevogado
+from app.util.datetime_utils import DateTimeUtils
+
+
+def payload_acesso(usuario_id, token_version=0, jti=None):
+    return {
+        "sub": str(usuario_id),
+        "jti": jti or uuid.uuid4().hex,
+        "exp": time.time() + 60,
+        "type": "access",
+        "authz": {"v": 1, "token_version": token_version},
+    }
+
+
+class TestTokenRevocationList:
+    """Testes unitários para a lista de revogação de tokens em memória"""
+
+    @pytest.fixture
+    def session_factory(self, engine):
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        yield factory
+        with factory() as session:
+            session.query(TokenRevogado).delete()
+            session.commit()
+
+    @pytest.fixture
+    def revocation_list(self, session_factory):
+        lista = TokenRevocationList(session_factory, intervalo_segundos=3600)
+        yield lista
+        lista.parar()
+
+    def gravar(self, session_factory, **dados):
+        dados.setdefault("expira_em", DateTimeUtils.now() + timedelta(hours=1))
+        with session_factory() as session:
+            revogacao = TokenRevogado(**dados)
+            session.add(revogacao)
+            session.commit()
+            return revogacao
+
+    def test_revogacoes_gravadas_por_outro_processo(
+        self, session_factory, revocation_list
+    ):
+        """Testa que a releitura da tabela aplica revogações por jti e por versão"""
+        usuario_id = uuid.uuid4()
+        token = payload_acesso(usuario_id)
+        outro_usuario = payload_acesso(uuid.uuid4())
+
+        assert not revocation_list.esta_revogado(token)
+
+        self.gravar(session_factory, usuario_id=usuario_id, token_version=1)
+        self.gravar(session_factory, jti=outro_usuario["jti"])
+        revocation_list.atualizar()
+
+        assert revocation_list.esta_revogado(token)
+        assert not revocation_list.esta_revogado(payload_acesso(usuario_id, 1))
+        assert revocation_list.esta_revogado(outro_usuario)
+        assert not revocation_list.esta_revogado(payload_acesso(uuid.uuid4()))
+
+    def test_registrar_aplica_sem_esperar_releitura(
+        self, session_factory, revocation_list
+    ):
+        """Testa que a revogação local vale na hora e sobrevive à releitura"""
+        token = payload_acesso(uuid.uuid4())
+        revocation_list.iniciar()
+
+        revocation_list.registrar(
+            [
+                TokenRevogado(
+                    jti=token["jti"],
+                    expira_em=DateTimeUtils.now() + timedelta(hours=1),
+                )
+            ]
+        )
+        assert revocation_list.esta_revogado(token)
+
+        revocation_list.atualizar()
+        assert revocation_list.esta_revogado(token)
+
+    def test_revogacoes_expiradas_sao_descartadas(
+        self, session_factory, revocation_list
+    ):
+        """Testa que revogações cujos tokens já expiraram não são mantidas"""
+        token = payload_acesso(uuid.uuid4())
+        self.gravar(
+            session_factory,
+            jti=token["jti"],
+            expira_em=DateTimeUtils.now() - timedelta(minutes=1),
+        )
+
+        revocation_list.atualizar()
+
+        assert not revocation_list.esta_revogado(token)
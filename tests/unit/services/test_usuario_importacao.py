@@ -0,0 +1,81 @@
+import pytest
+from app.core.security.password_hasher import PasswordHasher
+from app.model.usuario_model import Usuario, pwd_context
+from app.schema.usuario_schema import StatusImportacaoUsuario
+from app.services.usuario_service import UsuarioService
+
+
+class TestUsuarioImportacao:
+    """Testes unitários para a importação de usuários em lote"""
+
+    @pytest.fixture
+    def service(self, usuario_repository):
+        return UsuarioService(
+            usuario_repository=usuario_repository,
+            token_revogado_repository=None,
+            token_revocation_list=None,
+            password_hasher=PasswordHasher(
+                max_workers=1, max_fila=1, timeout_segundos=5
+            ),
+            invalidation_bus=None,
+        )
+
+    @pytest.fixture
+    def limpar_importados(self, db_session):
+        yield
+        db_session.query(Usuario).filter(Usuario.matricula.like("IMP%")).delete(
+            synchronize_session=False
+        )
+        db_session.commit()
+
+    def registro(self, indice, **dados):
+        return {
+            "nome": f"Professor {indice}",
+            "email": f"professor{indice}@teste.com",
+            "matricula": f"IMP{indice}",
+            "curso": "Engenharia de Software",
+            "senha": f"Senha@{indice}",
+            **dados,
+        }
+
+    def test_importar_relatorio_por_linha(
+        self, service, usuario, db_session, limpar_importados
+    ):
+        """Testa a criação em lote e o resultado de cada linha"""
+        registros = [
+            self.registro(1),
+            self.registro(2),
+            self.registro(3, email="invalido"),
+            self.registro(4, email="professor1@teste.com"),
+            self.registro(5, matricula=usuario.matricula),
+        ]
+
+        relatorio = service.importar(registros)
+
+        assert (relatorio.total, relatorio.criados) == (5, 2)
+        assert (relatorio.ignorados, relatorio.erros) == (1, 2)
+        status = [resultado.status for resultado in relatorio.resultados]
+        assert status == [
+            StatusImportacaoUsuario.CRIADO,
+            StatusImportacaoUsuario.CRIADO,
+            StatusImportacaoUsuario.ERRO,
+            StatusImportacaoUsuario.ERRO,
+            StatusImportacaoUsuario.IGNORADO,
+        ]
+        assert relatorio.resultados[3].mensagem == (
+            "Matrícula ou email repetido na linha 1"
+        )
+
+        criado = db_session.get(Usuario, relatorio.resultados[0].id)
+        assert criado.matricula == "IMP1"
+        assert pwd_context.verify("Senha@1", criado.senha)
+
+    def test_importar_novamente_ignora_existentes(self, service, limpar_importados):
+        """Testa que reimportar o mesmo arquivo não duplica usuários"""
+        registros = [self.registro(1), self.registro(2)]
+        service.importar(registros)
+
+        relatorio = service.importar(registros)
+
+        assert relatorio.criados == 0
+        assert relatorio.ignorados == 2
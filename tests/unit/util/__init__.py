@@ -0,0 +1,3 @@
+"""
+Módulo de testes unitários dos utilitários
+""" 
\ No newline at end of file
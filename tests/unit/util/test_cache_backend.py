@@ -0,0 +1,177 @@
+import fnmatch
+import socketserver
+import threading
+import time
+
+import pytest
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.redis_backend import RedisCacheBackend, RespClient
+
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    """Servidor local que fala o subconjunto do RESP usado pelo backend"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.dados = {}
+        self.conjuntos = {}
+        self.lock = threading.Lock()
+
+    def executar(self, comando, *args):
+        with self.lock:
+            agora = time.monotonic()
+            self.dados = {
+                k: v for k, v in self.dados.items() if v[1] is None or v[1] > agora
+            }
+            if comando == b"GET":
+                entrada = self.dados.get(args[0])
+                return entrada[0] if entrada else None
+            if comando == b"SET":
+                expira = None
+                if len(args) > 2 and args[2].upper() == b"PX":
+                    expira = agora + int(args[3]) / 1000
+                self.dados[args[0]] = (args[1], expira)
+                return "OK"
+            if comando == b"DEL":
+                removidas = 0
+                for chave in args:
+                    removidas += bool(self.dados.pop(chave, None))
+                    removidas += bool(self.conjuntos.pop(chave, None))
+                return removidas
+            if comando == b"SADD":
+                self.conjuntos.setdefault(args[0], set()).update(args[1:])
+                return len(args) - 1
+            if comando == b"SMEMBERS":
+                return sorted(self.conjuntos.get(args[0], ()))
+            if comando == b"PEXPIRE":
+                return 1
+            if comando == b"SCAN":
+                padrao = args[2].decode()
+                chaves = [
+                    k
+                    for k in [*self.dados, *self.conjuntos]
+                    if fnmatch.fnmatch(k.decode(), padrao)
+                ]
+                return [b"0", chaves]
+            return ValueError(f"ERR comando desconhecido {comando!r}")
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                return
+            args = []
+            for _ in range(int(linha[1:-2])):
+                tamanho = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(tamanho + 2)[:-2])
+            self.wfile.write(self.codificar(self.server.executar(*args)))
+
+    def codificar(self, valor):
+        if valor is None:
+            return b"$-1\r\n"
+        if isinstance(valor, ValueError):
+            return b"-%s\r\n" % str(valor).encode()
+        if isinstance(valor, str):
+            return b"+%s\r\n" % valor.encode()
+        if isinstance(valor, int):
+            return b":%d\r\n" % valor
+        if isinstance(valor, bytes):
+            return b"$%d\r\n%s\r\n" % (len(valor), valor)
+        return b"*%d\r\n" % len(valor) + b"".join(self.codificar(v) for v in valor)
+
+
+class TestMemoryCacheBackend:
+    """Testes unitários para o cache LRU em memória"""
+
+    def test_lru_remove_a_entrada_menos_usada(self):
+        """Testa o limite de entradas e os contadores"""
+        cache = MemoryCacheBackend(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        estatisticas = cache.estatisticas()
+        assert (estatisticas.hits, estatisticas.misses) == (3, 1)
+        assert estatisticas.evictions == 1
+
+    def test_ttl_tags_e_get_or_compute(self):
+        """Testa a expiração, a invalidação por tag e o cálculo na falta"""
+        cache = MemoryCacheBackend(max_entries=10)
+        cache.set("expira", 1, ttl=0.01)
+        cache.set(("sala", 1), "A101", tags=("salas",))
+        cache.set(("bloco", 1), "Bloco A", tags=("blocos",))
+        calculos = []
+
+        time.sleep(0.02)
+        cache.invalidate_tag("salas")
+
+        assert cache.get("expira") is None
+        assert cache.get(("sala", 1)) is None
+        assert cache.get(("bloco", 1)) == "Bloco A"
+        for _ in range(2):
+            valor = cache.get_or_compute("nada", lambda: calculos.append(1))
+        assert valor is None
+        assert calculos == [1]
+
+
+class TestRedisCacheBackend:
+    """Testes unitários para o backend Redis, contra um servidor local falso"""
+
+    @pytest.fixture
+    def servidor(self):
+        servidor = FakeRedis()
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        yield servidor
+        servidor.shutdown()
+        servidor.server_close()
+
+    @pytest.fixture
+    def cache(self, servidor):
+        host, porta = servidor.server_address
+        cliente = RespClient.from_url(f"redis://{host}:{porta}/0")
+        yield RedisCacheBackend(cliente, prefixo="teste", default_ttl=60)
+        cliente.fechar()
+
+    def test_get_set_delete_e_tags(self, cache):
+        """Testa as operações básicas, com valores serializados"""
+        cache.set(("sala", 1), {"identificacao": "A101"}, tags=("salas",))
+        cache.set(("sala", 2), "A102", tags=("salas",))
+        cache.set("outro", [1, 2])
+
+        assert cache.get(("sala", 1)) == {"identificacao": "A101"}
+        cache.delete("outro")
+        assert cache.get("outro") is None
+
+        cache.invalidate_tag("salas")
+        assert cache.get(("sala", 2)) is None
+
+        estatisticas = cache.estatisticas()
+        assert (estatisticas.hits, estatisticas.misses) == (1, 2)
+
+    def test_clear_remove_apenas_o_prefixo(self, servidor, cache):
+        """Testa que a limpeza não afeta chaves de outros prefixos"""
+        cache.set("a", 1)
+        servidor.executar(b"SET", b"outro:chave", b"x")
+
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert list(servidor.dados) == [b"outro:chave"]
+
+    def test_servidor_fora_do_ar_vira_falta(self, servidor, cache):
+        """Testa que falhas de comunicação não propagam para quem usa o cache"""
+        servidor.shutdown()
+        servidor.server_close()
+        cache.cliente.fechar()
+
+        cache.set("a", 1)
+        assert cache.get_or_compute("a", lambda: 2) == 2
+        assert cache.estatisticas().misses == 1
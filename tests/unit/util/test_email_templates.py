@@ -0,0 +1,72 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from app.util.email_templates import EmailTemplates
+
+
+class TestEmailTemplates:
+    """Testes unitários para os templates de email"""
+
+    @pytest.fixture
+    def templates(self):
+        return EmailTemplates()
+
+    @pytest.fixture
+    def usuario(self):
+        return SimpleNamespace(nome="Maria <b>", email="maria@teste.com")
+
+    @pytest.fixture
+    def reserva(self):
+        return SimpleNamespace(
+            sala=SimpleNamespace(
+                identificacao_sala="A101", bloco=SimpleNamespace(nome="Bloco A")
+            ),
+            inicio=datetime(2026, 3, 2, 8, 0),
+            fim=datetime(2026, 3, 2, 10, 0),
+            motivo='<script>alert("x")</script> & aula',
+        )
+
+    def test_templates_compilados_na_criacao(self, templates):
+        """Testa que todos os templates do diretório são carregados"""
+        assert set(templates.nomes) >= {
+            "reserva_criada",
+            "reserva_recorrente_criada",
+            "lembrete_reserva",
+            "reservas_do_dia",
+        }
+
+    def test_html_escapa_dados_do_usuario(self, templates, usuario, reserva):
+        """Testa que o HTML escapa o motivo e o nome, e o texto os mantém"""
+        email = templates.renderizar(
+            "reserva_criada",
+            {"reserva": reserva, "usuario": usuario, "sala": reserva.sala},
+        )
+
+        assert email.assunto == "Nova reserva de sala - A101"
+        assert "<script>" not in email.html
+        assert "&lt;script&gt;" in email.html
+        assert "Maria &lt;b&gt;" in email.html
+        assert '<script>alert("x")</script> & aula' in email.texto
+        assert "Horário: 08:00 - 10:00" in email.texto
+
+    def test_renderizar_lote(self, templates, usuario, reserva):
+        """Testa a renderização de vários destinatários com o mesmo template"""
+        outro = SimpleNamespace(nome="João", email="joao@teste.com")
+        contextos = [
+            (u.email, {"usuario": u, "reservas": [reserva], "hoje": date(2026, 3, 2)})
+            for u in (usuario, outro)
+        ]
+
+        renderizados = dict(templates.renderizar_lote("reservas_do_dia", contextos))
+
+        assert list(renderizados) == ["maria@teste.com", "joao@teste.com"]
+        assert renderizados["joao@teste.com"].assunto == (
+            "Suas reservas para hoje (02/03/2026)"
+        )
+        assert "Olá João," in renderizados["joao@teste.com"].texto
+
+    def test_template_inexistente(self, templates):
+        """Testa o erro para um template que não existe"""
+        with pytest.raises(KeyError):
+            templates.renderizar("nao_existe", {})
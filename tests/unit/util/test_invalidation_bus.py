@@ -0,0 +1,65 @@
+import json
+
+from app.core.cache.invalidation_bus import RESERVAS, SALAS, InvalidationBus
+
+
+class SessaoGravada:
+    """Sessão que só guarda os comandos executados"""
+
+    def __init__(self):
+        self.comandos = []
+
+    def execute(self, comando, parametros):
+        self.comandos.append((str(comando), parametros))
+
+
+class TestInvalidationBus:
+    """Testes unitários para o barramento de invalidação de caches"""
+
+    def test_publicar_notifica_na_sessao(self):
+        """Testa que a notificação é emitida na sessão, com entidade, chave e versão"""
+        bus = InvalidationBus(engine=None, canal="cache_invalidacao")
+        sessao = SessaoGravada()
+
+        bus.publicar(sessao, SALAS, 42)
+        bus.publicar(sessao, SALAS)
+
+        comando, parametros = sessao.comandos[0]
+        assert "pg_notify" in comando
+        assert parametros["canal"] == "cache_invalidacao"
+        mensagens = [json.loads(p["payload"]) for _, p in sessao.comandos]
+        assert [(m["entidade"], m["chave"], m["versao"]) for m in mensagens] == [
+            (SALAS, "42", 1),
+            (SALAS, None, 2),
+        ]
+
+    def test_receber_repassa_apenas_de_outros_processos(self):
+        """Testa o despacho aos assinantes e que as próprias mensagens são ignoradas"""
+        bus = InvalidationBus(engine=None, canal="cache_invalidacao")
+        outro = InvalidationBus(engine=None, canal="cache_invalidacao")
+        recebidas = []
+        bus.assinar(SALAS, recebidas.append)
+
+        for origem in (outro, bus):
+            sessao = SessaoGravada()
+            origem.publicar(sessao, SALAS, "a101")
+            origem.publicar(sessao, RESERVAS, "r1")
+            for _, parametros in sessao.comandos:
+                bus._receber(parametros["payload"])
+
+        assert recebidas == ["a101"]
+
+    def test_falha_de_um_assinante_nao_afeta_os_demais(self):
+        """Testa que todos os assinantes são chamados na reconexão, mesmo com erro"""
+        bus = InvalidationBus(engine=None, canal="cache_invalidacao")
+        recebidas = []
+
+        def falhar(chave):
+            raise RuntimeError("falha")
+
+        bus.assinar(SALAS, falhar)
+        bus.assinar(SALAS, recebidas.append)
+        bus.assinar(RESERVAS, recebidas.append)
+        bus._despachar_todos()
+
+        assert recebidas == [None, None]
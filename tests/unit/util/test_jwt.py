@@ -0,0 +1,240 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.api.v1.auth_api import router as auth_router
+from app.core.commons.exceptions import (
+    TooManyRequestsException,
+    UnauthorizedException,
+)
+from app.core.config.settings import settings
+from app.core.security import jwt_keys
+from app.core.security.jwt import JWTManager
+from app.core.security.jwt_keys import JWTKeySet, _gerar_pem_rsa
+from app.core.security.token_revocation import TokenRevocationList
+from app.model.token_revogado_model import TokenRevogado
+from app.model.usuario_model import Usuario
+from app.schema.auth_schema import AtualizarTokenRequisicao, RedefinirSenhaRequisicao
+from app.services.auth_service import AuthService
+
+
+def gravar_chave(diretorio, kid):
+    (diretorio / f"{kid}.pem").write_bytes(_gerar_pem_rsa())
+
+
+def criar_usuario(token_version=0):
+    return Usuario(
+        id=uuid.uuid4(),
+        nome="Teste",
+        email="teste@teste.com",
+        matricula="123456",
+        curso="Engenharia de Software",
+        ativo=True,
+        super_user=False,
+        token_version=token_version,
+        criado_em=datetime.utcnow(),
+        atualizado_em=datetime.utcnow(),
+    )
+
+
+class TestJWTKeySet:
+    """Testes unitários para o conjunto de chaves de assinatura"""
+
+    def test_gera_chave_em_diretorio_vazio(self, tmp_path):
+        """Testa que a primeira chave é gerada e passa a assinar os tokens"""
+        chaves = JWTKeySet(str(tmp_path / "jwt"))
+
+        kid, _ = chaves.chave_assinatura
+        assert [arquivo.stem for arquivo in (tmp_path / "jwt").glob("*.pem")] == [kid]
+        assert chaves.chave_publica(kid)["kid"] == kid
+
+    def test_escolha_da_chave_ativa(self, tmp_path):
+        """Testa que a chave ativa é a de maior kid, ou a configurada"""
+        gravar_chave(tmp_path, "2024")
+        gravar_chave(tmp_path, "2025")
+
+        assert JWTKeySet(str(tmp_path)).chave_assinatura[0] == "2025"
+        assert JWTKeySet(str(tmp_path), "2024").chave_assinatura[0] == "2024"
+        with pytest.raises(ValueError):
+            JWTKeySet(str(tmp_path), "2026")
+
+    def test_kid_desconhecido_relê_o_diretorio_com_limite(self, tmp_path):
+        """Testa a releitura ao encontrar um kid novo, no máximo uma por intervalo"""
+        gravar_chave(tmp_path, "2024")
+        chaves = JWTKeySet(str(tmp_path))
+        gravar_chave(tmp_path, "2025")
+
+        # Logo após uma leitura, o diretório não é relido
+        assert chaves.chave_publica("2025") is None
+
+        chaves._recarregado_em -= jwt_keys.INTERVALO_RECARGA_SEGUNDOS + 1
+        assert chaves.chave_publica("2025")["kid"] == "2025"
+
+        gravar_chave(tmp_path, "2026")
+        assert chaves.chave_publica("2026") is None
+        assert chaves.chave_publica("inexistente") is None
+
+
+class TestJWTManager:
+    """Testes unitários para a emissão e validação dos tokens"""
+
+    @pytest.fixture(autouse=True)
+    def chaves(self, tmp_path, monkeypatch):
+        gravar_chave(tmp_path, "2024")
+        monkeypatch.setattr(settings, "JWT_KEYS_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "JWT_ACTIVE_KID", None)
+        monkeypatch.setattr(jwt_keys, "_key_set", None)
+        return tmp_path
+
+    def assinar(self, claims, kid="2024"):
+        _, chave = jwt_keys.get_key_set().chave_assinatura
+        return jwt.encode(claims, chave, algorithm="RS256", headers={"kid": kid})
+
+    def claims_acesso(self, **extras):
+        return {
+            "sub": str(uuid.uuid4()),
+            "exp": datetime.utcnow() + timedelta(minutes=5),
+            "type": "access",
+            "iss": settings.JWT_ISSUER,
+            "authz": {
+                "v": 1,
+                "super_user": True,
+                "curso": "Engenharia de Software",
+                "token_version": 0,
+            },
+            **extras,
+        }
+
+    def test_token_de_acesso_e_principal(self):
+        """Testa que o token traz o kid e os claims de autorização"""
+        usuario = criar_usuario(token_version=3)
+        token = JWTManager.create_access_token(usuario)
+
+        payload = JWTManager.verify_token(token)
+        principal = JWTManager.get_principal(payload)
+
+        assert jwt.get_unverified_header(token)["kid"] == "2024"
+        assert payload["iss"] == settings.JWT_ISSUER
+        assert principal.id == usuario.id
+        assert (principal.super_user, principal.token_version) == (False, 3)
+
+    def test_token_assinado_com_chave_antiga_continua_valido(self, chaves):
+        """Testa a rotação: a nova chave assina, a antiga ainda valida"""
+        antigo = JWTManager.create_access_token(criar_usuario())
+        gravar_chave(chaves, "2025")
+        jwt_keys.get_key_set().carregar()
+
+        novo = JWTManager.create_access_token(criar_usuario())
+
+        assert jwt.get_unverified_header(novo)["kid"] == "2025"
+        assert JWTManager.verify_token(antigo)["type"] == "access"
+        assert JWTManager.verify_token(novo)["type"] == "access"
+
+    @pytest.mark.parametrize(
+        "extras",
+        [
+            {"iss": "outro-servico"},
+            {"authz": {"v": 99, "super_user": True, "curso": "x", "token_version": 0}},
+            {"authz": None},
+            {"type": "refresh"},
+        ],
+    )
+    def test_token_de_acesso_recusado(self, extras):
+        """Testa a recusa de emissor, versão de claims e tipo inválidos"""
+        with pytest.raises(UnauthorizedException):
+            JWTManager.verify_token(self.assinar(self.claims_acesso(**extras)))
+
+    def test_kid_desconhecido_recusado(self):
+        """Testa a recusa de tokens assinados com um kid que não está no diretório"""
+        token = self.assinar(self.claims_acesso(), kid="inexistente")
+
+        with pytest.raises(UnauthorizedException):
+            JWTManager.verify_token(token)
+
+    def test_jwks_publica_apenas_chaves_publicas(self, chaves):
+        """Testa a saída de GET /auth/jwks"""
+        gravar_chave(chaves, "2025")
+        app = FastAPI()
+        app.include_router(auth_router)
+
+        response = TestClient(app).get("/auth/jwks")
+
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=300"
+        chaves_publicas = response.json()["keys"]
+        assert sorted(chave["kid"] for chave in chaves_publicas) == ["2024", "2025"]
+        for chave in chaves_publicas:
+            assert (chave["kty"], chave["alg"], chave["use"]) == ("RSA", "RS256", "sig")
+            assert {"n", "e"} <= set(chave)
+            assert "d" not in chave and "p" not in chave
+
+    def test_refresh_recusado_apos_troca_de_token_version(self):
+        """Testa que um refresh emitido antes da revogação dos tokens é recusado"""
+        usuario = criar_usuario(token_version=0)
+        refresh = JWTManager.create_refresh_token(usuario)
+        payload = JWTManager.verify_refresh_token(refresh)
+
+        revocation_list = TokenRevocationList(None, intervalo_segundos=3600)
+        # Sem banco: a releitura periódica da lista não é iniciada
+        revocation_list._thread = SimpleNamespace()
+        service = AuthService(
+            user_repository=SimpleNamespace(get_by_id=lambda _: usuario),
+            token_revogado_repository=None,
+            token_revocation_list=revocation_list,
+            password_hasher=None,
+            invalidation_bus=None,
+        )
+        requisicao = AtualizarTokenRequisicao(refresh_token=refresh)
+        assert service.refresh_token(requisicao).access_token
+
+        # Nova versão gravada no usuário, antes de chegar à lista de revogação
+        usuario.token_version = 1
+        with pytest.raises(UnauthorizedException):
+            service.refresh_token(requisicao)
+
+        usuario.token_version = 0
+        revocation_list.registrar(
+            [
+                TokenRevogado(
+                    usuario_id=usuario.id,
+                    token_version=1,
+                    expira_em=datetime.utcnow() + timedelta(hours=1),
+                )
+            ]
+        )
+        assert revocation_list.esta_revogado(payload)
+        with pytest.raises(UnauthorizedException):
+            service.refresh_token(requisicao)
+
+    def test_redefinicao_de_senha_propaga_429_do_pool(self):
+        """Testa que a recusa do pool de senhas não vira 401 na redefinição"""
+        usuario = criar_usuario()
+
+        def pool_cheio(_):
+            raise TooManyRequestsException("Servidor ocupado", retry_after=5)
+
+        service = AuthService(
+            user_repository=SimpleNamespace(get_by_id=lambda _: usuario),
+            token_revogado_repository=None,
+            token_revocation_list=None,
+            password_hasher=SimpleNamespace(gerar_hash=pool_cheio),
+            invalidation_bus=None,
+        )
+        requisicao = RedefinirSenhaRequisicao(
+            token=JWTManager.create_password_reset_token(usuario.id),
+            nova_senha="NovaSenha@123",
+            confirmar_senha="NovaSenha@123",
+        )
+
+        with pytest.raises(TooManyRequestsException) as erro:
+            service.reset_password(requisicao)
+        assert erro.value.headers["Retry-After"] == "5"
+
+        requisicao.token = "invalido"
+        with pytest.raises(UnauthorizedException):
+            service.reset_password(requisicao)
@@ -0,0 +1,147 @@
+import threading
+from types import SimpleNamespace
+
+from app.core.database.leader_election import LeaderElection
+
+
+class FakeServidor:
+    """Advisory locks do Postgres: cada lock pertence a uma conexão"""
+
+    def __init__(self):
+        self.locks = {}
+        self.conexoes = []
+        self.indisponivel = False
+
+    def connect(self):
+        conexao = FakeConexao(self)
+        self.conexoes.append(conexao)
+        return conexao
+
+
+class FakeConexao:
+    def __init__(self, servidor):
+        self.servidor = servidor
+        self.caiu = False
+        self.fechada = False
+
+    def execute(self, sql, parametros=None):
+        if self.caiu or self.servidor.indisponivel:
+            raise ConnectionError("conexão encerrada")
+        comando = str(sql)
+        chave = (parametros or {}).get("chave")
+        if "pg_try_advisory_lock" in comando:
+            obtido = self.servidor.locks.setdefault(chave, self) is self
+            return SimpleNamespace(scalar=lambda: obtido)
+        if "pg_advisory_unlock" in comando:
+            self._soltar()
+        return SimpleNamespace(scalar=lambda: 1)
+
+    def commit(self):
+        pass
+
+    def invalidate(self):
+        # O servidor encerra a sessão e libera os locks dela
+        self._soltar()
+
+    def close(self):
+        self.fechada = True
+        self._soltar()
+
+    def _soltar(self):
+        for chave, dono in list(self.servidor.locks.items()):
+            if dono is self:
+                del self.servidor.locks[chave]
+
+
+class Callbacks:
+    def __init__(self):
+        self.eventos = []
+        self.assumiu = threading.Event()
+        self.perdeu = threading.Event()
+
+    def ao_assumir(self):
+        self.eventos.append("assumiu")
+        self.assumiu.set()
+
+    def ao_perder(self):
+        self.eventos.append("perdeu")
+        self.perdeu.set()
+
+
+class TestLeaderElection:
+    """Testes unitários para a eleição de líder por advisory lock"""
+
+    def test_apenas_um_processo_obtem_o_lock(self):
+        """Testa que o lock é exclusivo e pode ser obtido após a liberação"""
+        servidor = FakeServidor()
+        primeiro = LeaderElection(servidor, chave=42)
+        segundo = LeaderElection(servidor, chave=42)
+
+        assert primeiro.tentar_assumir()
+        assert not segundo.tentar_assumir()
+        assert primeiro.tentar_assumir() and primeiro.confirmar()
+        assert (primeiro.is_leader, segundo.is_leader) == (True, False)
+
+        primeiro.liberar()
+
+        assert not primeiro.is_leader
+        assert segundo.tentar_assumir()
+
+    def test_erro_ao_obter_o_lock(self):
+        """Testa que uma falha do banco não torna o processo líder"""
+        servidor = FakeServidor()
+        servidor.indisponivel = True
+        eleicao = LeaderElection(servidor, chave=42)
+
+        assert not eleicao.tentar_assumir()
+        assert not eleicao.is_leader
+        assert servidor.conexoes[0].fechada
+
+    def test_perda_da_conexao_chama_ao_perder(self):
+        """Testa que a queda da conexão do lock encerra a liderança"""
+        servidor = FakeServidor()
+        eleicao = LeaderElection(servidor, chave=42, intervalo_segundos=0.01)
+        callbacks = Callbacks()
+        parar = threading.Event()
+        thread = threading.Thread(
+            target=eleicao.executar,
+            args=(parar, callbacks.ao_assumir, callbacks.ao_perder),
+        )
+        thread.start()
+        try:
+            assert callbacks.assumiu.wait(timeout=2)
+            # A conexão cai, o servidor libera o lock e outro processo o obtém
+            # antes da próxima verificação deste
+            outro = LeaderElection(servidor, chave=42)
+            with eleicao._lock:
+                servidor.conexoes[0].caiu = True
+                servidor.conexoes[0].invalidate()
+                assert outro.tentar_assumir()
+            assert callbacks.perdeu.wait(timeout=2)
+        finally:
+            parar.set()
+            thread.join(timeout=2)
+
+        assert callbacks.eventos == ["assumiu", "perdeu"]
+        assert not eleicao.is_leader
+
+    def test_parar_libera_a_lideranca(self):
+        """Testa que ao parar o líder chama ao_perder e libera o lock"""
+        servidor = FakeServidor()
+        eleicao = LeaderElection(servidor, chave=42, intervalo_segundos=0.01)
+        callbacks = Callbacks()
+        parar = threading.Event()
+        thread = threading.Thread(
+            target=eleicao.executar,
+            args=(parar, callbacks.ao_assumir, callbacks.ao_perder),
+        )
+        thread.start()
+        assert callbacks.assumiu.wait(timeout=2)
+
+        parar.set()
+        thread.join(timeout=2)
+
+        assert not thread.is_alive()
+        assert callbacks.eventos == ["assumiu", "perdeu"]
+        assert not eleicao.is_leader
+        assert servidor.locks == {}
@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from app.core.commons.exceptions import TooManyRequestsException
+from app.core.security.password_hasher import PasswordHasher
+
+
+class ContextoLento:
+    """Contexto de senhas que segura cada verificação até ser liberado"""
+
+    def __init__(self):
+        self.liberar = threading.Event()
+        self.em_execucao = 0
+        self.max_em_execucao = 0
+        self._lock = threading.Lock()
+
+    def verify(self, senha, hash_senha):
+        with self._lock:
+            self.em_execucao += 1
+            self.max_em_execucao = max(self.max_em_execucao, self.em_execucao)
+        self.liberar.wait(timeout=2)
+        with self._lock:
+            self.em_execucao -= 1
+        return senha == hash_senha
+
+    def hash(self, senha):
+        return senha
+
+
+class TestPasswordHasher:
+    """Testes unitários para o pool limitado de hash de senhas"""
+
+    def test_verificar_e_gerar_hash(self):
+        """Testa que as operações são delegadas ao contexto de senhas"""
+        contexto = SimpleNamespace(
+            verify=lambda senha, hash_senha: hash_senha == f"h:{senha}",
+            hash=lambda senha: f"h:{senha}",
+        )
+        hasher = PasswordHasher(
+            max_workers=1, max_fila=1, timeout_segundos=1, contexto=contexto
+        )
+
+        assert hasher.gerar_hash("abc") == "h:abc"
+        assert hasher.verificar("abc", "h:abc")
+        assert not hasher.verificar("abc", "h:xyz")
+
+    def test_recusa_quando_a_fila_esta_cheia(self):
+        """Testa o limite de concorrência e a recusa com 429 acima da fila"""
+        contexto = ContextoLento()
+        hasher = PasswordHasher(
+            max_workers=2, max_fila=1, timeout_segundos=2, contexto=contexto
+        )
+
+        with ThreadPoolExecutor(max_workers=3) as requisicoes:
+            admitidos = [
+                requisicoes.submit(hasher.verificar, "a", "a") for _ in range(3)
+            ]
+            # Dois pedidos no bcrypt e um na fila ocupam todas as vagas
+            while contexto.em_execucao < 2 or hasher._vagas._value > 0:
+                threading.Event().wait(0.01)
+
+            with pytest.raises(TooManyRequestsException) as erro:
+                hasher.verificar("a", "a")
+
+            contexto.liberar.set()
+            assert all(futuro.result() for futuro in admitidos)
+
+        assert erro.value.status_code == 429
+        assert "Retry-After" in erro.value.headers
+        assert contexto.max_em_execucao == 2
+        assert hasher.recusados == 1
+
+    def test_recusa_por_tempo_de_espera(self):
+        """Testa que um pedido que espera demais na fila é recusado"""
+        contexto = ContextoLento()
+        hasher = PasswordHasher(
+            max_workers=1, max_fila=1, timeout_segundos=0.05, contexto=contexto
+        )
+
+        with ThreadPoolExecutor(max_workers=1) as requisicoes:
+            admitido = requisicoes.submit(hasher.verificar, "a", "a")
+            while contexto.em_execucao < 1:
+                threading.Event().wait(0.01)
+
+            with pytest.raises(TooManyRequestsException):
+                hasher.verificar("a", "a")
+
+            contexto.liberar.set()
+            assert admitido.result()
+
+        # O pedido cancelado devolve a vaga
+        assert hasher._vagas._value == 2
+
+    def test_bcrypt_lento_nao_conta_para_o_limite(self):
+        """Testa que um pedido que já começou termina mesmo após o tempo limite"""
+        contexto = ContextoLento()
+        hasher = PasswordHasher(
+            max_workers=1, max_fila=1, timeout_segundos=0.05, contexto=contexto
+        )
+        threading.Timer(0.2, contexto.liberar.set).start()
+
+        assert hasher.verificar("a", "a")
+        assert hasher.recusados == 0
@@ -0,0 +1,81 @@
+import threading
+import pytest
+
+from app.core.database.query_fanout import QueryFanOut
+
+
+class FakeSession:
+    """Sessão falsa que registra a thread de uso e o encerramento"""
+
+    def __init__(self):
+        self.thread = None
+        self.rollback_chamado = False
+        self.fechada = False
+
+    def rollback(self):
+        self.rollback_chamado = True
+
+    def close(self):
+        self.fechada = True
+
+
+class TestQueryFanOut:
+    """Testes unitários para a execução paralela de consultas"""
+
+    @pytest.fixture
+    def sessoes(self):
+        return []
+
+    @pytest.fixture
+    def fanout(self, sessoes):
+        def session_factory():
+            session = FakeSession()
+            sessoes.append(session)
+            return session
+
+        fanout = QueryFanOut(session_factory, max_workers=4)
+        yield fanout
+        fanout.shutdown()
+
+    def test_tarefas_usam_sessoes_independentes(self, fanout, sessoes):
+        """Testa que cada tarefa recebe e fecha a sua própria sessão"""
+        # As tarefas só terminam quando todas estiverem rodando ao mesmo tempo
+        barreira = threading.Barrier(3, timeout=5)
+
+        def tarefa(valor):
+            def executar(session):
+                session.thread = threading.current_thread().name
+                barreira.wait()
+                return valor, session
+
+            return executar
+
+        resultados = fanout.run({nome: tarefa(nome) for nome in ("a", "b", "c")})
+
+        assert {nome: valor for nome, (valor, _) in resultados.items()} == {
+            "a": "a",
+            "b": "b",
+            "c": "c",
+        }
+        usadas = [session for _, session in resultados.values()]
+        assert len({id(session) for session in usadas}) == 3
+        assert len(sessoes) == 3
+        assert all(session.thread.startswith("query-fanout") for session in usadas)
+        assert all(session.rollback_chamado and session.fechada for session in sessoes)
+
+    def test_erro_de_uma_tarefa_chega_ao_run(self, fanout, sessoes):
+        """Testa que a exceção de uma tarefa é propagada após as demais terminarem"""
+        concluidas = []
+
+        def falhar(session):
+            raise ValueError("consulta inválida")
+
+        def concluir(session):
+            concluidas.append(session)
+            return 1
+
+        with pytest.raises(ValueError, match="consulta inválida"):
+            fanout.run({"falha": falhar, "ok": concluir})
+
+        assert len(concluidas) == 1
+        assert all(session.fechada for session in sessoes)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+from app.util.rate_limiter import PriorityTokenBucket
+
+
+class TestPriorityTokenBucket:
+    """Testes unitários para o limitador de taxa com prioridade"""
+
+    def test_rajada_e_reposicao(self):
+        """Testa que a rajada é imediata e os pedidos seguintes aguardam a reposição"""
+
+        async def cenario():
+            limitador = PriorityTokenBucket(taxa_por_segundo=20, capacidade=3)
+            inicio = time.monotonic()
+            for _ in range(3):
+                await limitador.acquire()
+            rajada = time.monotonic() - inicio
+            await limitador.acquire()
+            return rajada, time.monotonic() - inicio
+
+        rajada, total = asyncio.run(cenario())
+
+        assert rajada < 0.02
+        assert total >= 0.04
+
+    def test_prioridade_menor_e_atendida_antes(self):
+        """Testa que, sem tokens, a fila libera primeiro a menor prioridade"""
+
+        async def cenario():
+            limitador = PriorityTokenBucket(taxa_por_segundo=50, capacidade=1)
+            await limitador.acquire()
+            ordem = []
+
+            async def pedir(nome, prioridade):
+                await limitador.acquire(prioridade=prioridade)
+                ordem.append(nome)
+
+            lote = [asyncio.create_task(pedir(f"lote-{i}", 1)) for i in range(2)]
+            await asyncio.sleep(0)
+            transacional = asyncio.create_task(pedir("transacional", 0))
+            await asyncio.sleep(0)
+
+            metricas = limitador.metricas()
+            await asyncio.gather(*lote, transacional)
+            return ordem, metricas
+
+        ordem, metricas = asyncio.run(cenario())
+
+        assert ordem == ["transacional", "lote-0", "lote-1"]
+        assert metricas["prioridades"][1]["em_espera"] == 2
+        assert metricas["prioridades"][0]["em_espera"] == 1
+
+    def test_pedido_maior_que_a_capacidade(self):
+        """Testa que um pedido maior que a rajada é liberado com o balde cheio"""
+
+        async def cenario():
+            limitador = PriorityTokenBucket(taxa_por_segundo=100, capacidade=2)
+            await asyncio.wait_for(limitador.acquire(custo=5), timeout=1)
+            return limitador.metricas()
+
+        metricas = asyncio.run(cenario())
+
+        assert metricas["tokens_disponiveis"] < 0
+        assert metricas["prioridades"][0]["custo_liberado"] == 5
+
+    def test_parametros_invalidos(self):
+        """Testa a validação de taxa e capacidade"""
+        with pytest.raises(ValueError):
+            PriorityTokenBucket(taxa_por_segundo=0, capacidade=1)
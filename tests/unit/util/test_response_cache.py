@@ -0,0 +1,90 @@
+from app.core.cache.memory_backend import MemoryCacheBackend
+from app.core.cache.response_cache import ResponseCache, cached_response
+from app.core.cache.version_counter import VersionCounter
+
+
+class Relatorios:
+    """Serviço mínimo com o atributo `cache` esperado pelo decorador"""
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.chamadas = []
+        self.durante_calculo = None
+
+    @cached_response
+    def total(self, sala, dias=7):
+        self.chamadas.append((sala, dias))
+        if self.durante_calculo:
+            self.durante_calculo()
+        return f"{sala}:{dias}:{len(self.chamadas)}"
+
+
+class TestCachedResponse:
+    """Testes unitários do cache de respostas por versão"""
+
+    def criar(self):
+        versao = VersionCounter("reservas")
+        cache = ResponseCache(versao, MemoryCacheBackend(max_entries=16), 60)
+        return versao, cache, Relatorios(cache)
+
+    def test_miss_calcula_e_hit_reaproveita(self):
+        """Testa que a primeira chamada calcula e as seguintes usam o cache"""
+        _, _, servico = self.criar()
+
+        primeira = servico.total("A101")
+
+        assert servico.total("A101") == primeira
+        assert servico.chamadas == [("A101", 7)]
+
+    def test_parametros_diferentes_geram_chaves_diferentes(self):
+        """Testa que argumentos distintos não compartilham a resposta"""
+        _, _, servico = self.criar()
+
+        servico.total("A101")
+        servico.total("A102")
+        servico.total("A101", dias=30)
+
+        assert servico.chamadas == [("A101", 7), ("A102", 7), ("A101", 30)]
+
+    def test_incremento_de_versao_invalida(self):
+        """Testa que um bump na versão descarta as respostas guardadas"""
+        versao, _, servico = self.criar()
+        antes = servico.total("A101")
+
+        versao.bump()
+        depois = servico.total("A101")
+
+        assert depois != antes
+        assert servico.total("A101") == depois
+        assert len(servico.chamadas) == 2
+
+    def test_resposta_calculada_durante_bump_nao_e_guardada(self):
+        """Testa que uma resposta possivelmente desatualizada não fica em cache"""
+        versao, _, servico = self.criar()
+        servico.durante_calculo = versao.bump
+
+        servico.total("A101")
+        servico.durante_calculo = None
+        servico.total("A101")
+        servico.total("A101")
+
+        assert len(servico.chamadas) == 2
+
+    def test_clear_remove_respostas(self):
+        """Testa que clear força um novo cálculo"""
+        _, cache, servico = self.criar()
+        servico.total("A101")
+
+        cache.clear()
+        servico.total("A101")
+
+        assert len(servico.chamadas) == 2
+
+    def test_sem_cache_executa_direto(self):
+        """Testa que o método roda normalmente quando não há cache"""
+        servico = Relatorios()
+
+        servico.total("A101")
+        servico.total("A101")
+
+        assert len(servico.chamadas) == 2
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.util.single_flight import SingleFlight
+
+
+class Computacao:
+    """Função síncrona que conta as execuções e espera ser liberada"""
+
+    def __init__(self, resultado="ok", erro=None):
+        self.resultado = resultado
+        self.erro = erro
+        self.chamadas = 0
+        self.liberar = threading.Event()
+
+    def __call__(self):
+        self.chamadas += 1
+        self.liberar.wait(timeout=2)
+        if self.erro is not None:
+            raise self.erro
+        return self.resultado
+
+
+async def aguardar_em_andamento(single_flight, quantidade):
+    while single_flight.em_andamento < quantidade:
+        await asyncio.sleep(0.01)
+
+
+class TestSingleFlight:
+    """Testes unitários para o agrupamento de chamadas concorrentes"""
+
+    def test_chamadas_concorrentes_executam_uma_vez(self):
+        """Testa que a mesma chave compartilha uma execução e chaves diferentes não"""
+        single_flight = SingleFlight()
+        computacao = Computacao()
+        outra = Computacao(resultado="outro")
+
+        async def cenario():
+            chamadas = [
+                asyncio.ensure_future(single_flight.do("a", computacao))
+                for _ in range(3)
+            ]
+            chamadas.append(asyncio.ensure_future(single_flight.do("b", outra)))
+            await aguardar_em_andamento(single_flight, 2)
+            computacao.liberar.set()
+            outra.liberar.set()
+            return await asyncio.gather(*chamadas)
+
+        assert asyncio.run(cenario()) == ["ok", "ok", "ok", "outro"]
+        assert (computacao.chamadas, outra.chamadas) == (1, 1)
+
+    def test_excecao_chega_a_todas_as_chamadas(self):
+        """Testa que o erro da execução é repassado a quem aguardava"""
+        single_flight = SingleFlight()
+        computacao = Computacao(erro=ValueError("falhou"))
+
+        async def cenario():
+            chamadas = [
+                asyncio.ensure_future(single_flight.do("a", computacao))
+                for _ in range(2)
+            ]
+            await aguardar_em_andamento(single_flight, 1)
+            computacao.liberar.set()
+            return await asyncio.gather(*chamadas, return_exceptions=True)
+
+        resultados = asyncio.run(cenario())
+
+        assert all(isinstance(r, ValueError) for r in resultados)
+        assert computacao.chamadas == 1
+        assert single_flight.em_andamento == 0
+
+    def test_chave_removida_ao_concluir(self):
+        """Testa que uma chamada depois da conclusão executa de novo"""
+        single_flight = SingleFlight()
+        computacao = Computacao()
+        computacao.liberar.set()
+
+        async def cenario():
+            primeiro = await single_flight.do("a", computacao)
+            assert single_flight.em_andamento == 0
+            segundo = await single_flight.do("a", computacao)
+            return primeiro, segundo
+
+        assert asyncio.run(cenario()) == ("ok", "ok")
+        assert computacao.chamadas == 2
+
+    def test_cancelamento_de_uma_chamada_nao_afeta_as_demais(self):
+        """Testa que um cliente que desiste não cancela a execução compartilhada"""
+        single_flight = SingleFlight()
+        computacao = Computacao()
+
+        async def cenario():
+            desistente = asyncio.ensure_future(single_flight.do("a", computacao))
+            restante = asyncio.ensure_future(single_flight.do("a", computacao))
+            await aguardar_em_andamento(single_flight, 1)
+
+            desistente.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await desistente
+            computacao.liberar.set()
+            return await restante
+
+        assert asyncio.run(cenario()) == "ok"
+        assert computacao.chamadas == 1
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from app.core.cache.warmup import StartupWarmup
+
+
+class FakeEngine:
+    """Engine com um pool de tamanho fixo, que conta as conexões abertas"""
+
+    def __init__(self, tamanho):
+        self.pool = SimpleNamespace(size=lambda: tamanho)
+        self.abertas = 0
+        self.maximo = 0
+
+    def connect(self):
+        self.abertas += 1
+        self.maximo = max(self.maximo, self.abertas)
+        return SimpleNamespace(close=self.fechar)
+
+    def fechar(self):
+        self.abertas -= 1
+
+
+class TestStartupWarmup:
+    """Testes unitários para o aquecimento na subida"""
+
+    def test_executa_as_etapas_e_fica_pronto(self):
+        """Testa que o pool é aberto por inteiro e cada etapa roda uma vez"""
+        engine = FakeEngine(tamanho=3)
+        chamadas = []
+        aquecimento = StartupWarmup(
+            engine,
+            SimpleNamespace(aquecer=lambda: chamadas.append("referencia")),
+            SimpleNamespace(iniciar=lambda: chamadas.append("revogacoes")),
+        )
+        aquecimento.adicionar_etapa("openapi", lambda: chamadas.append("openapi"))
+
+        assert aquecimento.estado()["pronto"] is False
+        aquecimento.executar()
+
+        assert aquecimento.pronto
+        assert (engine.maximo, engine.abertas) == (3, 0)
+        assert chamadas == ["referencia", "revogacoes", "openapi"]
+        assert list(aquecimento.estado()["etapas"]) == [
+            "conexoes",
+            "referencia",
+            "revogacoes",
+            "openapi",
+        ]
+
+    def test_etapa_com_falha_e_repetida(self):
+        """Testa que uma falha interrompe as etapas seguintes até a retentativa"""
+        falhas = [RuntimeError("banco indisponível")]
+        chamadas = []
+
+        def aquecer():
+            if falhas:
+                raise falhas.pop()
+            chamadas.append("referencia")
+
+        aquecimento = StartupWarmup(
+            FakeEngine(tamanho=1),
+            SimpleNamespace(aquecer=aquecer),
+            SimpleNamespace(iniciar=lambda: chamadas.append("revogacoes")),
+            intervalo_retentativa_segundos=0,
+        )
+
+        aquecimento.executar()
+
+        assert aquecimento.pronto
+        assert chamadas == ["referencia", "revogacoes"]
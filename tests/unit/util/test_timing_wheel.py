@@ -0,0 +1,63 @@
+import pytest
+from app.util.timing_wheel import HashedTimingWheel
+
+
+class TestHashedTimingWheel:
+    """Testes unitários para a roda de tempo dos lembretes"""
+
+    @pytest.fixture
+    def wheel(self):
+        return HashedTimingWheel(tick_segundos=1, inicio=0, slots=8)
+
+    def test_item_vence_no_tick_correto(self, wheel):
+        """Testa que o item só é retornado quando o tick de vencimento é alcançado"""
+        wheel.add("a", 5)
+
+        assert wheel.advance(4) == []
+        assert wheel.advance(5) == ["a"]
+        assert "a" not in wheel
+
+    def test_vencimento_entre_dois_ticks(self, wheel):
+        """Testa que o item não vence no tick anterior ao vencimento"""
+        wheel.add("a", 10.7)
+
+        assert wheel.advance(10.2) == []
+        assert wheel.advance(10.9) == []
+        assert wheel.advance(11) == ["a"]
+
+    def test_item_com_varias_voltas(self, wheel):
+        """Testa itens que vencem depois de mais de uma volta da roda"""
+        wheel.add("a", 20)
+
+        for instante in range(1, 20):
+            assert wheel.advance(instante) == []
+        assert wheel.advance(20) == ["a"]
+
+    def test_salto_maior_que_uma_volta(self, wheel):
+        """Testa o avanço de vários ticks de uma só vez"""
+        wheel.add("a", 3)
+        wheel.add("b", 18)
+        wheel.add("c", 40)
+
+        assert sorted(wheel.advance(25)) == ["a", "b"]
+        assert len(wheel) == 1
+        assert wheel.advance(40) == ["c"]
+
+    def test_reagendar_e_remover(self, wheel):
+        """Testa que reagendar substitui o vencimento e remover cancela o item"""
+        wheel.add("a", 2)
+        wheel.add("a", 10)
+        wheel.add("b", 3)
+        assert wheel.remove("b") is True
+        assert wheel.remove("b") is False
+
+        assert wheel.advance(9) == []
+        assert wheel.advance(10) == ["a"]
+
+    def test_vencimento_passado_vence_no_proximo_avanco(self, wheel):
+        """Testa que itens atrasados vencem no próximo avanço"""
+        wheel.advance(10)
+        wheel.add("a", 2)
+
+        assert wheel.advance(10) == []
+        assert wheel.advance(11) == ["a"]